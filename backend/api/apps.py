@@ -1,7 +1,15 @@
-from django.apps import AppConfig
+from django.apps import AppConfig, apps
+from django.db.models.signals import post_delete, post_save
 
 
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
     verbose_name = 'Данные рецептов'
+
+    def ready(self) -> None:
+        from api.catalog import ingredient_changed
+
+        ingredient = apps.get_model('recipes', 'Ingredient')
+        post_save.connect(ingredient_changed, sender=ingredient)
+        post_delete.connect(ingredient_changed, sender=ingredient)
@@ -0,0 +1,134 @@
+from typing import Callable, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from rest_framework.request import Request
+
+from core.constants import (
+    AUTHOR_RECIPES_CACHE_KEY,
+    MAX_LENGTH_SHORT_LINK,
+    SHORT_LINK_ALPHABET
+)
+from core.utils import unsign_short_link
+from recipes.models import Recipe
+
+RECIPE_CACHE_KEY = 'recipe:{pk}:{version}:{base_url}'
+SHORT_LINK_CACHE_KEY = 'short_link:{short_link}'
+# Значение в кеше для кода, которого нет в БД
+MISSING_RECIPE = 0
+
+
+def get_recipe_cache_key(
+        pk: int, version: int, request: Optional[Request]
+) -> str:
+    """Ключ кеша карточки рецепта.
+
+    Ссылки на картинки абсолютные, поэтому в ключ входит адрес сайта.
+    """
+    base_url = request.build_absolute_uri('/') if request else ''
+    return RECIPE_CACHE_KEY.format(
+        pk=pk, version=version, base_url=base_url
+    )
+
+
+def get_cached_recipe(
+        recipe: Recipe,
+        request: Optional[Request],
+        build: Callable[[Recipe], dict]
+) -> dict:
+    """Возвращает общую для всех зрителей часть карточки рецепта.
+
+    При промахе карточка строится функцией build и кладется в кеш.
+    Устаревшие версии не удаляются, а вытесняются по таймауту.
+    """
+    key = get_recipe_cache_key(recipe.pk, recipe.version, request)
+    data = cache.get(key)
+    if data is None:
+        data = build(recipe)
+        cache.set(key, data, settings.RECIPE_CACHE_TIMEOUT)
+    return data
+
+
+def get_cached_recipes(
+        rows: Iterable[dict],
+        request: Optional[Request],
+        build: Callable[[List[dict]], Dict[int, dict]]
+) -> Dict[int, dict]:
+    """Общие части карточек для строк рецептов с полями id и version.
+
+    Все карточки читаются из кеша одним запросом, недостающие строятся
+    одним вызовом build и записываются в кеш тоже одним запросом.
+    """
+    rows = {
+        get_recipe_cache_key(row['id'], row['version'], request): row
+        for row in rows
+    }
+    cached = cache.get_many(rows)
+    missing = [row for key, row in rows.items() if key not in cached]
+    if missing:
+        cards = build(missing)
+        built = {
+            key: cards[row['id']] for key, row in rows.items()
+            if key not in cached
+        }
+        cache.set_many(built, settings.RECIPE_CACHE_TIMEOUT)
+        cached.update(built)
+    return {row['id']: cached[key] for key, row in rows.items()}
+
+
+def get_cached_author_recipes(
+        author_ids: Iterable[int],
+        build: Callable[[List[int]], Dict[int, List[dict]]]
+) -> Dict[int, List[dict]]:
+    """Последние рецепты авторов, общие для всех подписчиков.
+
+    Списки читаются из кеша одним запросом, недостающие строятся одним
+    вызовом build. Рецепт сбрасывает список автора при сохранении и
+    удалении, а гонку с заполнением кеша ограничивает таймаут.
+    """
+    keys = {
+        AUTHOR_RECIPES_CACHE_KEY.format(author_id=author_id): author_id
+        for author_id in author_ids
+    }
+    cached = cache.get_many(keys)
+    missing = [
+        author_id for key, author_id in keys.items() if key not in cached
+    ]
+    if missing:
+        recipes = build(missing)
+        built = {
+            key: recipes[author_id] for key, author_id in keys.items()
+            if key not in cached
+        }
+        cache.set_many(built, settings.AUTHOR_RECIPES_CACHE_TIMEOUT)
+        cached.update(built)
+    return {author_id: cached[key] for key, author_id in keys.items()}
+
+
+def resolve_short_link(short_link: str) -> Optional[int]:
+    """Id рецепта по короткой ссылке или None, если ссылки нет.
+
+    Id из подписанной ссылки читается без БД и кеша. Старые случайные
+    коды ищутся в БД и кешируются в памяти процесса, в том числе
+    неизвестные, поэтому популярные и перебираемые ссылки не доходят до
+    БД. Удаленный рецепт может находиться по старой ссылке до
+    SHORT_LINK_CACHE_TIMEOUT секунд.
+    """
+    if len(short_link) > MAX_LENGTH_SHORT_LINK:
+        return unsign_short_link(short_link)
+    if not set(short_link) <= set(SHORT_LINK_ALPHABET):
+        return None
+
+    short_links = caches['short_links']
+    key = SHORT_LINK_CACHE_KEY.format(short_link=short_link)
+    pk = short_links.get(key)
+    if pk is None:
+        pk = Recipe.objects.filter(short_link=short_link).values_list(
+            'pk', flat=True
+        ).first() or MISSING_RECIPE
+        short_links.set(
+            key, pk,
+            settings.SHORT_LINK_CACHE_TIMEOUT if pk
+            else settings.SHORT_LINK_MISSING_TIMEOUT
+        )
+    return pk or None
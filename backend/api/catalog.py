@@ -0,0 +1,242 @@
+import gzip
+from bisect import bisect_left
+from datetime import datetime
+from functools import cached_property
+from hashlib import md5
+from threading import Lock
+from time import monotonic
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils.http import quote_etag
+from rest_framework.settings import api_settings
+
+from api.serializers import IngredientSerializer
+from recipes.models import Ingredient
+from recipes.search import TrigramIndex, rank_positions
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Кодировки сжатия в порядке предпочтения при равных весах q
+ACCEPT_ENCODINGS = ('br', 'gzip')
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Веса q кодировок из заголовка Accept-Encoding.
+
+    Кодировка без q имеет вес 1, с некорректным q - вес 0.
+    """
+    weights = {}
+    for item in header.split(','):
+        coding, *params = item.split(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding] = weight
+    return weights
+
+
+class PrecompressedContent:
+    """Готовое тело ответа и его сжатые варианты.
+
+    Варианты сжимаются один раз с наибольшей степенью сжатия. Для
+    каждого варианта заводится свой сильный ETag. Вариант br есть,
+    только если установлен brotli.
+    """
+
+    def __init__(self, content: bytes):
+        self.variants: Dict[str, bytes] = {
+            '': content,
+            'gzip': gzip.compress(content, compresslevel=9, mtime=0)
+        }
+        if brotli is not None:
+            self.variants['br'] = brotli.compress(content)
+        digest = md5(content, usedforsecurity=False).hexdigest()
+        self.etags: Dict[str, str] = {
+            encoding: quote_etag(
+                f'{digest}-{encoding}' if encoding else digest
+            )
+            for encoding in self.variants
+        }
+
+    def select(self, accept_encoding: str) -> Tuple[str, bytes]:
+        """Кодировка и тело для заголовка Accept-Encoding клиента.
+
+        Выбирается сжатие с наибольшим весом q, а при равных весах - по
+        порядку ACCEPT_ENCODINGS. Кодировки с q=0 не отдаются.
+        """
+        weights = parse_accept_encoding(accept_encoding)
+        default = weights.get('*', 0.0)
+        # Ответ без сжатия допустим всегда, но предпочтительнее сжатого,
+        # только если клиент явно дал identity больший вес
+        identity = weights.get('identity', 0.0)
+        weight, encoding = max(
+            (
+                (weights.get(encoding, default), encoding)
+                for encoding in ACCEPT_ENCODINGS
+                if encoding in self.variants
+            ),
+            key=lambda item: item[0]
+        )
+        if weight > 0 and weight >= identity:
+            return encoding, self.variants[encoding]
+        return '', self.variants['']
+
+
+class IngredientCatalog:
+    """Неизменяемый снимок каталога ингредиентов в памяти процесса.
+
+    Названия приведены к casefold и отсортированы, поэтому ингредиенты
+    с началом названия находятся двоичным поиском. Результаты
+    отдаются в порядке каталога в БД, как у фильтра name__istartswith.
+    """
+
+    def __init__(
+            self,
+            version: str,
+            ingredients: List[dict],
+            updated_at: Optional[datetime]
+    ):
+        self.version = version
+        self.ingredients = ingredients
+        self.updated_at = updated_at
+        keys = sorted(
+            (ingredient['name'].casefold(), position)
+            for position, ingredient in enumerate(ingredients)
+        )
+        self.names = [name for name, _ in keys]
+        self.positions = [position for _, position in keys]
+
+    @classmethod
+    def load(cls, version: str) -> 'IngredientCatalog':
+        """Читает каталог из БД."""
+        queryset = Ingredient.objects.all()
+        return cls(
+            version,
+            list(IngredientSerializer(queryset, many=True).data),
+            queryset.aggregate(updated_at=Max('updated_at'))['updated_at']
+        )
+
+    @cached_property
+    def full_list(self) -> PrecompressedContent:
+        """Весь каталог в JSON, готовый к отдаче без сериализации."""
+        renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+        return PrecompressedContent(renderer.render(self.ingredients))
+
+    @cached_property
+    def trigrams(self) -> TrigramIndex:
+        """Индекс триграмм названий для нечеткого поиска."""
+        return TrigramIndex(
+            [ingredient['name'] for ingredient in self.ingredients]
+        )
+
+    def get_prefix_positions(self, name: str) -> List[int]:
+        """Позиции ингредиентов с названием, начинающимся с name."""
+        name = name.casefold()
+        start = end = bisect_left(self.names, name)
+        while end < len(self.names) and self.names[end].startswith(name):
+            end += 1
+        return sorted(self.positions[start:end])
+
+    def search(self, name: str) -> List[dict]:
+        """Ингредиенты с названием, начинающимся с name без учета регистра.
+
+        Пустое name дает весь каталог.
+        """
+        if not name:
+            return self.ingredients
+        return [
+            self.ingredients[position]
+            for position in self.get_prefix_positions(name)
+        ]
+
+    def fuzzy_search(self, query: str) -> List[dict]:
+        """Не более INGREDIENT_SEARCH_LIMIT ингредиентов, похожих на query.
+
+        Порядок тот же, что у поиска в БД: сначала совпадения по началу
+        названия, затем похожие по триграммам.
+        """
+        return [
+            self.ingredients[position]
+            for position in rank_positions(
+                self.get_prefix_positions(query),
+                self.trigrams.get_similar(query)
+            )
+        ]
+
+
+_catalog: Optional[IngredientCatalog] = None
+# Время последней сверки версии каталога с БД по monotonic()
+_checked_at: Optional[float] = None
+_catalog_lock = Lock()
+
+
+def get_catalog_version() -> str:
+    """Версия каталога по данным БД: число ингредиентов и время изменения.
+
+    Ингредиенты меняются через модель, поэтому добавление и изменение
+    сдвигают наибольшее updated_at, а удаление уменьшает число.
+    """
+    state = Ingredient.objects.aggregate(
+        count=Count('id'), updated_at=Max('updated_at')
+    )
+    updated_at = state['updated_at']
+    return '{}-{}'.format(
+        state['count'], updated_at.timestamp() if updated_at else 0
+    )
+
+
+def is_catalog_checked() -> bool:
+    """Сверялась ли версия каталога за INGREDIENT_CATALOG_CHECK_INTERVAL."""
+    return _catalog is not None and _checked_at is not None and (
+        monotonic() - _checked_at < settings.INGREDIENT_CATALOG_CHECK_INTERVAL
+    )
+
+
+def get_ingredient_catalog() -> IngredientCatalog:
+    """Каталог ингредиентов текущей версии.
+
+    Версия сверяется с БД одним агрегатным запросом не чаще раза в
+    INGREDIENT_CATALOG_CHECK_INTERVAL секунд, и каталог перечитывается,
+    только если она изменилась. Поэтому изменения из других процессов,
+    в том числе из data_loader, видны не позже чем через этот интервал.
+    """
+    global _catalog, _checked_at
+    if is_catalog_checked():
+        return _catalog
+    with _catalog_lock:
+        if not is_catalog_checked():
+            version = get_catalog_version()
+            if _catalog is None or _catalog.version != version:
+                _catalog = IngredientCatalog.load(version)
+            _checked_at = monotonic()
+        return _catalog
+
+
+def forget_catalog_check() -> None:
+    """Сверяет версию каталога с БД при следующем запросе."""
+    global _checked_at
+    _checked_at = None
+
+
+def ingredient_changed(**kwargs) -> None:
+    """Сигнал изменения ингредиента: каталог сверяется после коммита.
+
+    Подключен к post_save и post_delete, поэтому срабатывает и при
+    удалении ингредиентов QuerySet. Прочие процессы увидят изменение
+    по версии в БД.
+    """
+    transaction.on_commit(forget_catalog_check)
@@ -0,0 +1,163 @@
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from functools import lru_cache
+from threading import Lock
+from typing import Dict, Iterable, Iterator, List, Mapping, Set
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from api.pdf import ShoppingListRow, can_render_pdf, render_pdf
+from api.renderers import ORJSONRenderer
+from api.utils import iter_csv
+from core.constants import SHOPPING_LIST_PDF_TIMEOUT_ERROR, SHOPPING_LIST_TITLE
+
+
+class ExportUnavailable(APIException):
+    """Выгрузка не успела подготовиться за отведенное время."""
+
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = SHOPPING_LIST_PDF_TIMEOUT_ERROR
+    default_code = 'export_unavailable'
+
+
+class ShoppingListExporter(ABC):
+    """Базовый формат выгрузки списка покупок.
+
+    Получает строки списка покупок пользователя и отдает файл частями,
+    которые передаются клиенту по мере готовности.
+    """
+
+    format: str
+    media_type: str
+    charset = 'utf-8'
+
+    @property
+    def content_type(self) -> str:
+        return f'{self.media_type}; charset={self.charset}'
+
+    def get_filename(self, user_id: int, timestamp: str) -> str:
+        """Имя файла в формате shopping_cart.{format}_{user_id}_{timestamp}."""
+        return f'shopping_cart.{self.format}_{user_id}_{timestamp}'
+
+    @abstractmethod
+    def render(self, items: Iterable[Mapping]) -> Iterable:
+        """Части файла: строки в кодировке charset или байты."""
+
+
+class CSVExporter(ShoppingListExporter):
+    """CSV в cp1251, который без настройки открывается в Excel."""
+
+    format = 'csv'
+    media_type = 'text/csv'
+    charset = 'cp1251'
+
+    def render(self, items: Iterable[Mapping]) -> Iterator[str]:
+        return iter_csv(get_rows(items, with_header=True))
+
+
+class TextExporter(ShoppingListExporter):
+    """Текстовый список: по ингредиенту на строку."""
+
+    format = 'txt'
+    media_type = 'text/plain'
+
+    def render(self, items: Iterable[Mapping]) -> Iterator[str]:
+        yield f'{SHOPPING_LIST_TITLE}\n\n'
+        for name, measurement_unit, total_amount in get_rows(items):
+            yield f'{name} ({measurement_unit}) — {total_amount}\n'
+
+
+class JSONExporter(ShoppingListExporter):
+    """JSON-массив ингредиентов, который пишется по одному элементу."""
+
+    format = 'json'
+    media_type = 'application/json'
+
+    def render(self, items: Iterable[Mapping]) -> Iterator[bytes]:
+        renderer = ORJSONRenderer()
+        separator = b'['
+        for item in items:
+            yield separator + renderer.render(item)
+            separator = b','
+        yield b'[]' if separator == b'[' else b']'
+
+
+class PDFExporter(ShoppingListExporter):
+    """PDF, который верстается в отдельном процессе.
+
+    Верстка нагружает процессор, поэтому она вынесена в пул процессов,
+    а обработчик запроса ждет ее не дольше SHOPPING_LIST_PDF_TIMEOUT
+    секунд. Если все процессы пула заняты, в том числе версткой, которую
+    уже перестали ждать, запрос сразу получает отказ, а не встает в
+    очередь пула. Доступен, только если установлен reportlab и загружается
+    шрифт с кириллицей SHOPPING_LIST_PDF_FONT.
+    """
+
+    format = 'pdf'
+    media_type = 'application/pdf'
+    charset = None
+
+    @property
+    def content_type(self) -> str:
+        return self.media_type
+
+    def render(self, items: Iterable[Mapping]) -> List[bytes]:
+        future = submit_pdf_render(list(get_rows(items)))
+        try:
+            return [future.result(timeout=settings.SHOPPING_LIST_PDF_TIMEOUT)]
+        except FutureTimeoutError:
+            raise ExportUnavailable
+
+
+def get_rows(
+        items: Iterable[Mapping], with_header: bool = False
+) -> Iterator[ShoppingListRow]:
+    """Строки списка покупок, при необходимости с заголовками столбцов."""
+    if with_header:
+        yield 'Ингредиент', 'Единица измерения', 'Количество'
+    for item in items:
+        yield item['name'], item['measurement_unit'], item['total_amount']
+
+
+# Верстки PDF, которые еще выполняются в пуле процессов
+pdf_renders: Set[Future] = set()
+pdf_renders_lock = Lock()
+
+
+@lru_cache(maxsize=None)
+def get_pdf_executor() -> ProcessPoolExecutor:
+    """Пул процессов верстки PDF, общий для всех запросов процесса."""
+    return ProcessPoolExecutor(max_workers=settings.SHOPPING_LIST_PDF_WORKERS)
+
+
+def submit_pdf_render(rows: List[ShoppingListRow]) -> Future:
+    """Отправляет верстку PDF в пул, если в нем есть свободный процесс.
+
+    Начатую верстку нельзя отменить, поэтому верстки учитываются до
+    завершения, а не до таймаута ожидания.
+
+    Raises:
+        ExportUnavailable: Если все процессы пула заняты
+    """
+    with pdf_renders_lock:
+        if len(pdf_renders) >= settings.SHOPPING_LIST_PDF_WORKERS:
+            raise ExportUnavailable
+        future = get_pdf_executor().submit(
+            render_pdf, rows, settings.SHOPPING_LIST_PDF_FONT
+        )
+        pdf_renders.add(future)
+    future.add_done_callback(pdf_renders.discard)
+    return future
+
+
+# Доступные форматы выгрузки, первый используется по умолчанию. Форматы
+# создаются при импорте, поэтому формат без render не дает запустить проект
+EXPORTERS: Dict[str, ShoppingListExporter] = {
+    exporter.format: exporter()
+    for exporter in (CSVExporter, TextExporter, JSONExporter, PDFExporter)
+    if exporter is not PDFExporter
+    or can_render_pdf(settings.SHOPPING_LIST_PDF_FONT)
+}
@@ -1,12 +1,24 @@
+from typing import List
+
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import F
 from django.db.models.query import QuerySet
 from django_filters import rest_framework as filters
 
-from recipes.models import Ingredient, Recipe
+from recipes.models import Ingredient, Recipe, RecipeIngredients
+from recipes.search import (
+    get_ingredient_search_backend,
+    get_search_backend
+)
 
 User = get_user_model()
 
 
+class NumberInFilter(filters.BaseInFilter, filters.NumberFilter):
+    """Фильтр по списку чисел через запятую."""
+
+
 class IngredientFilter(filters.FilterSet):
     """Фильтр для поиска ингредиентов по названию."""
 
@@ -14,10 +26,26 @@ class IngredientFilter(filters.FilterSet):
         lookup_expr='istartswith',
         help_text="Фильтр по началу названия ингредиента"
     )
+    q = filters.CharFilter(
+        method='filter_q',
+        help_text="Нечеткий поиск: сначала совпадения по началу названия, "
+                  "затем похожие по триграммам"
+    )
 
     class Meta:
         model = Ingredient
-        fields = ['name']
+        fields = ['name', 'q']
+
+    def filter_q(
+            self,
+            queryset: QuerySet,
+            name: str,
+            value: str
+    ) -> QuerySet:
+        """Ингредиенты, похожие на запрос, по убыванию ранга."""
+        return get_ingredient_search_backend(connection).search(
+            queryset, value
+        )
 
 
 class RecipeFilter(filters.FilterSet):
@@ -35,6 +63,23 @@ class RecipeFilter(filters.FilterSet):
         queryset=User.objects.all(),
         help_text="Фильтр по ID автора рецепта"
     )
+    ingredients = NumberInFilter(
+        method='filter_ingredients',
+        help_text="Рецепты со всеми ингредиентами из списка ID через запятую"
+    )
+    exclude_ingredients = NumberInFilter(
+        method='filter_exclude_ingredients',
+        help_text="Рецепты без ингредиентов из списка ID через запятую"
+    )
+    search = filters.CharFilter(
+        method='filter_search',
+        help_text="Полнотекстовый поиск по названию и описанию"
+    )
+    ordering = filters.ChoiceFilter(
+        choices=(('popular', 'По популярности'),),
+        method='filter_ordering',
+        help_text="Сортировка: popular - по популярности"
+    )
 
     class Meta:
         model = Recipe
@@ -79,4 +124,48 @@ class RecipeFilter(filters.FilterSet):
             queryset,
             value,
             'shopping_cart__author'
-        )
\ No newline at end of file
+        )
+
+    def filter_ingredients(
+            self,
+            queryset: QuerySet,
+            name: str,
+            value: List[int]
+    ) -> QuerySet:
+        """Фильтрация рецептов, содержащих все указанные ингредиенты."""
+        return queryset.filter(
+            id__in=RecipeIngredients.objects.get_recipes_with_all(value)
+        )
+
+    def filter_exclude_ingredients(
+            self,
+            queryset: QuerySet,
+            name: str,
+            value: List[int]
+    ) -> QuerySet:
+        """Исключение рецептов с любым из указанных ингредиентов."""
+        return queryset.exclude(
+            id__in=RecipeIngredients.objects.get_recipes_with_any(value)
+        )
+
+    def filter_search(
+            self,
+            queryset: QuerySet,
+            name: str,
+            value: str
+    ) -> QuerySet:
+        """Поиск рецептов с сортировкой по релевантности."""
+        return get_search_backend(connection).search(
+            queryset, value
+        ).order_by('-search_rank', '-id')
+
+    def filter_ordering(
+            self,
+            queryset: QuerySet,
+            name: str,
+            value: str
+    ) -> QuerySet:
+        """Сортировка по популярности, рецепты без оценки в конце."""
+        return queryset.order_by(
+            F('popularity__score').desc(nulls_last=True), '-id'
+        )
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from recipes.models import RecipeSimilarityBucket
+
+
+class Command(BaseCommand):
+    """Команда построения индекса похожих рецептов.
+
+    Рецепты, сохраненные через API, индексируются сразу. Команда
+    дополняет индекс рецептами, созданными в обход API, например
+    загрузкой данных, а с --full перестраивает его целиком.
+    """
+
+    help = 'Построение индекса похожих рецептов'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Перестроить индекс для всех рецептов'
+        )
+
+    def handle(self, *args, **kwargs):
+        indexed = RecipeSimilarityBucket.objects.build(full=kwargs['full'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Проиндексировано рецептов: {indexed}'
+        ))
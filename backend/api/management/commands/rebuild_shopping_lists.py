@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from recipes.models import ShoppingListItem
+
+
+class Command(BaseCommand):
+    """Команда пересборки списков покупок пользователей.
+
+    Списки поддерживаются при изменении корзин и рецептов, в том числе
+    в админке; пересборка нужна после изменений в обход моделей, например
+    загрузки данных SQL, и убирает строки с нулевой суммой.
+    """
+
+    help = 'Пересборка списков покупок по корзинам'
+
+    def handle(self, *args, **kwargs):
+        rebuilt = ShoppingListItem.objects.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f'Собрано строк списков покупок: {rebuilt}'
+        ))
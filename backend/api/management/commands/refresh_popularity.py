@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from recipes.models import RecipePopularity
+
+
+class Command(BaseCommand):
+    """Команда пересчета таблицы популярности рецептов.
+
+    Запускается по расписанию, например из cron. По умолчанию
+    пересчитывает только новые рецепты и рецепты, у которых изменились
+    счетчики избранного и корзин с прошлого запуска.
+    """
+
+    help = 'Пересчет популярности рецептов'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Пересчитать все рецепты, например после смены весов'
+        )
+
+    def handle(self, *args, **kwargs):
+        refreshed = RecipePopularity.objects.refresh(full=kwargs['full'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Пересчитано рецептов: {refreshed}'
+        ))
@@ -0,0 +1,79 @@
+from typing import Tuple, Type
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models, transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from recipes.models import Recipe, RecipeFavorite, ShoppingCart
+from users.models import Subscription, User
+
+
+class Command(BaseCommand):
+    """Команда проверки и исправления денормализованных счетчиков.
+
+    Счетчики поддерживаются моделями при записи, но массовые удаления
+    через QuerySet их обходят. Команда сверяет счетчики с реальным
+    числом связей и исправляет расхождения.
+    """
+    # Модель со счетчиком, поле счетчика, модель связи и ее поле
+    COUNTERS: Tuple[
+        Tuple[Type[models.Model], str, Type[models.Model], str], ...
+    ] = (
+        (Recipe, 'favorites_count', RecipeFavorite, 'recipe'),
+        (Recipe, 'in_carts_count', ShoppingCart, 'recipe'),
+        (User, 'recipes_count', Recipe, 'author'),
+        (User, 'followers_count', Subscription, 'author_recipe'),
+    )
+
+    help = 'Проверка и исправление счетчиков рецептов и пользователей'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help=(
+                'Только проверить счетчики и завершиться ошибкой '
+                'при расхождениях'
+            )
+        )
+
+    def handle(self, *args, **kwargs):
+        check_only: bool = kwargs['check']
+        total = 0
+        for model, field, relation, relation_field in self.COUNTERS:
+            actual = self._get_actual_count(relation, relation_field)
+            drifted = list(
+                model.objects.annotate(actual=actual).exclude(
+                    **{field: F('actual')}
+                ).values_list('pk', field, 'actual')
+            )
+            total += len(drifted)
+            for pk, stored, counted in drifted:
+                self.stdout.write(self.style.WARNING(
+                    f'{model.__name__} #{pk}: {field}={stored}, '
+                    f'фактически {counted}'
+                ))
+            if drifted and not check_only:
+                with transaction.atomic():
+                    model.objects.filter(
+                        pk__in=[pk for pk, _, _ in drifted]
+                    ).update(**{field: actual})
+
+        if total and check_only:
+            raise CommandError(f'Расхождений в счетчиках: {total}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Исправлено счетчиков: {total}' if total
+            else 'Счетчики в порядке'
+        ))
+
+    def _get_actual_count(
+            self, relation: Type[models.Model], relation_field: str
+    ) -> Coalesce:
+        """Подзапрос с реальным числом связей объекта."""
+        count = relation.objects.filter(
+            **{relation_field: OuterRef('pk')}
+        ).order_by().values(relation_field).annotate(
+            count=Count('pk')
+        ).values('count')
+        return Coalesce(Subquery(count), 0)
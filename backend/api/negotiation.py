@@ -0,0 +1,14 @@
+from rest_framework.negotiation import DefaultContentNegotiation
+
+
+class ExportContentNegotiation(DefaultContentNegotiation):
+    """Согласование для выгрузок файлов.
+
+    Параметр format в таких запросах задает формат файла, а не рендерер
+    DRF, поэтому он не участвует в выборе. Рендерер нужен только для
+    ответов с ошибками, и для них всегда берется первый из настроенных.
+    """
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        renderer = renderers[0]
+        return renderer, renderer.media_type
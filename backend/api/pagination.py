@@ -0,0 +1,73 @@
+from typing import Optional
+
+from django.db.models.query import QuerySet
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.constants import CURSOR_ORDERING_ERROR
+
+
+class LimitPageNumberPagination(PageNumberPagination):
+    """Постраничная пагинация с размером страницы из параметра limit."""
+
+    page_size_query_param = 'limit'
+
+
+class LimitCursorPagination(CursorPagination):
+    """Курсорная пагинация с размером страницы из параметра limit."""
+
+    page_size_query_param = 'limit'
+    ordering = '-id'
+
+
+class PageOrCursorPagination(LimitPageNumberPagination):
+    """Постраничная пагинация с опциональным курсорным режимом.
+
+    Если в запросе передан параметр cursor (в том числе пустой), выдача
+    строится по курсору: без OFFSET и COUNT(*), поэтому время ответа не
+    зависит от глубины листания. Поле курсора берется из атрибута
+    cursor_ordering вьюсета и должно быть проиндексировано. Выдачу с
+    другим порядком, например поиск или сортировку по популярности,
+    курсор бы пересортировал, поэтому для нее он отклоняется.
+    """
+
+    cursor_query_param = 'cursor'
+    cursor_ordering = '-id'
+
+    def __init__(self) -> None:
+        """Инициализация без активного курсорного режима."""
+        self.cursor_paginator: Optional[LimitCursorPagination] = None
+
+    def paginate_queryset(
+            self,
+            queryset: QuerySet,
+            request: Request,
+            view: Optional[APIView] = None
+    ):
+        """Выбирает режим пагинации по параметрам запроса."""
+        if self.cursor_query_param not in request.query_params:
+            return super().paginate_queryset(queryset, request, view)
+
+        ordering = getattr(view, 'cursor_ordering', self.cursor_ordering)
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        if queryset.query.order_by and (
+            tuple(queryset.query.order_by) != tuple(ordering)
+        ):
+            raise ValidationError(
+                {self.cursor_query_param: [CURSOR_ORDERING_ERROR]}
+            )
+        self.cursor_paginator = LimitCursorPagination()
+        self.cursor_paginator.ordering = ordering
+        return self.cursor_paginator.paginate_queryset(
+            queryset, request, view
+        )
+
+    def get_paginated_response(self, data) -> Response:
+        """Формирует ответ в формате выбранного режима."""
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -0,0 +1,64 @@
+from io import BytesIO
+from typing import List, Tuple
+
+from core.constants import SHOPPING_LIST_PDF_FONT_SIZE, SHOPPING_LIST_TITLE
+
+try:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFError, TTFont
+    from reportlab.pdfgen.canvas import Canvas
+except ImportError:
+    Canvas = None
+
+# Строка списка покупок: название, единица измерения, количество
+ShoppingListRow = Tuple[str, str, int]
+# Имя, под которым регистрируется шрифт с кириллицей
+FONT_NAME = 'ShoppingList'
+
+
+def can_render_pdf(font_path: str) -> bool:
+    """Доступна ли верстка: установлен reportlab и шрифт загружается.
+
+    Встроенные шрифты PDF не содержат кириллицы, поэтому без шрифта из
+    font_path список покупок выгружать в PDF нельзя.
+    """
+    if Canvas is None:
+        return False
+    try:
+        TTFont(FONT_NAME, font_path)
+    except (OSError, TTFError):
+        return False
+    return True
+
+
+def render_pdf(rows: List[ShoppingListRow], font_path: str) -> bytes:
+    """Верстает список покупок в PDF.
+
+    Выполняется в процессе пула, поэтому модуль не импортирует Django.
+    Шрифт с кириллицей берется из font_path, его наличие проверяет
+    can_render_pdf.
+    """
+    font = FONT_NAME
+    pdfmetrics.registerFont(TTFont(font, font_path))
+
+    buffer = BytesIO()
+    canvas = Canvas(buffer, pagesize=A4)
+    width, height = A4
+    margin = 2 * SHOPPING_LIST_PDF_FONT_SIZE
+    line_height = SHOPPING_LIST_PDF_FONT_SIZE * 1.5
+
+    canvas.setFont(font, SHOPPING_LIST_PDF_FONT_SIZE * 1.5)
+    canvas.drawString(margin, height - margin, SHOPPING_LIST_TITLE)
+    y = height - margin - 2 * line_height
+    canvas.setFont(font, SHOPPING_LIST_PDF_FONT_SIZE)
+    for name, measurement_unit, total_amount in rows:
+        if y < margin:
+            canvas.showPage()
+            canvas.setFont(font, SHOPPING_LIST_PDF_FONT_SIZE)
+            y = height - margin
+        canvas.drawString(margin, y, f'{name} ({measurement_unit})')
+        canvas.drawRightString(width - margin, y, str(total_amount))
+        y -= line_height
+    canvas.save()
+    return buffer.getvalue()
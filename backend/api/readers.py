@@ -0,0 +1,157 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+from django.core.files.storage import Storage
+from django.db.models.query import QuerySet
+from rest_framework.request import Request
+
+from api.cache import get_cached_recipes
+from api.serializers import RecipeGetSerializer, UserSerializer
+from api.viewer import ViewerContext
+from recipes.models import Recipe, RecipeIngredients
+from users.models import User
+
+# Колонки строки рецепта для полей автора, в порядке UserSerializer
+AUTHOR_COLUMNS: Dict[str, str] = {
+    field: f'author__{field}' for field in UserSerializer.Meta.fields
+    if field != 'is_subscribed'
+}
+# Колонки строки ингредиента, в порядке RecipeIngredientsGetSerializer
+INGREDIENT_COLUMNS: Dict[str, str] = {
+    'id': 'ingredient_id',
+    'name': 'ingredient__name',
+    'measurement_unit': 'ingredient__measurement_unit',
+    'amount': 'amount',
+}
+# Поля рецепта, которые читаются из строки как есть
+RECIPE_COLUMNS = ('id', 'name', 'cooking_time', 'text')
+VIEWER_FLAGS = ('is_favorited', 'is_in_shopping_cart')
+
+RECIPE_IMAGE_STORAGE: Storage = Recipe._meta.get_field('image').storage
+USER_AVATAR_STORAGE: Storage = User._meta.get_field('avatar').storage
+
+
+class RecipeReader:
+    """Чтение карточек рецептов из строк values() без сериализаторов.
+
+    Собирает тот же JSON, что и RecipeGetSerializer, но без создания
+    моделей и обхода полей: рецепты с авторами читаются одним запросом,
+    ингредиенты страницы - вторым и раскладываются по рецептам за один
+    проход. Учитывает выбор полей fields/omit и общий кеш карточек.
+    """
+
+    def __init__(self, request: Request) -> None:
+        """Инициализация с полями, запрошенными клиентом."""
+        self.request = request
+        self.fields = RecipeGetSerializer.get_sparse_fields(request)
+        self.is_sparse = (
+            len(self.fields) < len(RecipeGetSerializer.Meta.fields)
+        )
+        self.viewer = ViewerContext(request.user)
+
+    def get_queryset(self, queryset: QuerySet) -> QuerySet:
+        """Строки рецептов только с колонками запрошенных полей."""
+        columns = ['id', 'version', 'author_id']
+        columns += [
+            field for field in ('name', 'image', 'cooking_time', 'text')
+            if field in self.fields
+        ]
+        if 'author' in self.fields:
+            columns += AUTHOR_COLUMNS.values()
+        return queryset.prefetch_related(None).values(*columns)
+
+    def read(self, rows: Iterable[dict]) -> List[dict]:
+        """Карточки рецептов для строк в их порядке."""
+        rows = list(rows)
+        if self.is_sparse:
+            cards = self.build_cards(rows)
+        else:
+            cards = get_cached_recipes(rows, self.request, self.build_cards)
+
+        self.load_viewer(rows)
+        return [self.add_viewer_flags(cards[row['id']], row) for row in rows]
+
+    def build_cards(self, rows: List[dict]) -> Dict[int, dict]:
+        """Общие для всех зрителей части карточек по id рецепта."""
+        ingredients = (
+            self.get_ingredients(row['id'] for row in rows)
+            if 'ingredients' in self.fields else {}
+        )
+        return {
+            row['id']: self.build_card(row, ingredients.get(row['id'], []))
+            for row in rows
+        }
+
+    def build_card(self, row: dict, ingredients: List[dict]) -> dict:
+        """Карточка рецепта с флагами зрителя по умолчанию."""
+        card = {}
+        for field in self.fields:
+            if field in RECIPE_COLUMNS:
+                card[field] = row[field]
+            elif field == 'image':
+                card[field] = self.get_file_url(
+                    row['image'], RECIPE_IMAGE_STORAGE
+                )
+            elif field == 'ingredients':
+                card[field] = ingredients
+            elif field == 'author':
+                card[field] = self.build_author(row)
+            elif field in VIEWER_FLAGS:
+                card[field] = False
+        return card
+
+    def build_author(self, row: dict) -> dict:
+        """Блок автора рецепта."""
+        author = {
+            field: row[column] for field, column in AUTHOR_COLUMNS.items()
+        }
+        author['avatar'] = self.get_file_url(
+            author['avatar'], USER_AVATAR_STORAGE
+        )
+        author['is_subscribed'] = False
+        return author
+
+    def get_ingredients(self, recipe_ids: Iterable[int]) -> Dict[int, list]:
+        """Ингредиенты рецептов одним запросом, сгруппированные по рецепту."""
+        ingredients = defaultdict(list)
+        for recipe_id, *values in RecipeIngredients.objects.filter(
+            recipe_id__in=list(recipe_ids)
+        ).order_by('id').values_list(
+            'recipe_id', *INGREDIENT_COLUMNS.values()
+        ):
+            ingredients[recipe_id].append(
+                dict(zip(INGREDIENT_COLUMNS, values))
+            )
+        return ingredients
+
+    def get_file_url(self, name: str, storage: Storage) -> Optional[str]:
+        """Абсолютная ссылка на файл, как у ImageField сериализатора."""
+        if not name:
+            return None
+        return self.request.build_absolute_uri(storage.url(name))
+
+    def load_viewer(self, rows: List[dict]) -> None:
+        """Загружает связи зрителя только для флагов из ответа."""
+        recipe_ids = [row['id'] for row in rows]
+        if 'is_favorited' in self.fields:
+            self.viewer.load('favorites', recipe_ids)
+        if 'is_in_shopping_cart' in self.fields:
+            self.viewer.load('shopping_cart', recipe_ids)
+        if 'author' in self.fields:
+            self.viewer.load_authors(row['author_id'] for row in rows)
+
+    def add_viewer_flags(self, card: dict, row: dict) -> dict:
+        """Дополняет общую карточку флагами текущего зрителя."""
+        flags = {}
+        if 'author' in card:
+            flags['author'] = {
+                **card['author'],
+                'is_subscribed': self.viewer.is_subscribed(row['author_id'])
+            }
+        if 'is_favorited' in card:
+            flags['is_favorited'] = self.viewer.is_favorited(row['id'])
+        if 'is_in_shopping_cart' in card:
+            flags['is_in_shopping_cart'] = (
+                self.viewer.is_in_shopping_cart(row['id'])
+            )
+        return {**card, **flags}
@@ -0,0 +1,62 @@
+from typing import Any, Mapping, Optional
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Символы, которые стандартный рендерер всегда экранирует
+LINE_SEPARATOR = '\u2028'.encode()
+PARAGRAPH_SEPARATOR = '\u2029'.encode()
+
+
+class ORJSONRenderer(JSONRenderer):
+    """Рендерер JSON на orjson с откатом на стандартный.
+
+    Типы, которые orjson не знает (Decimal, ленивые строки, datetime),
+    передаются в кодировщик DRF, поэтому их представление совпадает со
+    стандартным рендерером. Стандартный рендерер используется, если
+    orjson не установлен, запрошен отступ, отключены UNICODE_JSON или
+    COMPACT_JSON, либо orjson не смог закодировать данные (например,
+    целое больше 64 бит). NaN и бесконечности orjson записывает как null.
+    """
+
+    options = (
+        orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if orjson else 0
+    )
+
+    def render(
+            self,
+            data: Any,
+            accepted_media_type: Optional[str] = None,
+            renderer_context: Optional[Mapping[str, Any]] = None
+    ) -> bytes:
+        """Кодирует данные в JSON, возвращая байты."""
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        if (
+            orjson is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context)
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=self.options
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Как и стандартный рендерер, экранируем U+2028 и U+2029
+        return ret.replace(LINE_SEPARATOR, b'\\u2028').replace(
+            PARAGRAPH_SEPARATOR, b'\\u2029'
+        )
@@ -1,38 +1,30 @@
-from api.serializers.base_serializers import AvatarSerializer
+from api.serializers.base_serializers import (
+    AvatarSerializer,
+    BulkRecipeActionSerializer
+)
 from api.serializers.ingredient import IngredientSerializer
 from api.serializers.recipe import (
     BaseRecipeSerializer,
     RecipeChangeSerializer,
     RecipeGetSerializer
 )
-from api.serializers.recipe_favorite import RecipeFavoriteSerializer
 from api.serializers.recipe_ingredients import (
     RecipeIngredientsGetSerializer,
     RecipeIngredientsSetSerializer
 )
-from api.serializers.shopping_cart import (
-    DownloadShoppingCartSerializer,
-    ShoppingCartSerializer
-)
-from api.serializers.subscription import (
-    SubscriptionChangedSerializer,
-    SubscriptionGetSerializer
-)
+from api.serializers.subscription import SubscriptionGetSerializer
 from api.serializers.user import CurrentUserSerializer, UserSerializer
 #Все основные сериализаторы
 __all__ = [
     'AvatarSerializer',
     'BaseRecipeSerializer',
+    'BulkRecipeActionSerializer',
     'CurrentUserSerializer',
-    'DownloadShoppingCartSerializer',
     'IngredientSerializer',
     'RecipeChangeSerializer',
     'RecipeGetSerializer',
     'RecipeIngredientsGetSerializer',
     'RecipeIngredientsSetSerializer',
-    'RecipeFavoriteSerializer',
-    'ShoppingCartSerializer',
-    'SubscriptionChangedSerializer',
     'SubscriptionGetSerializer',
     'UserSerializer'
 ]
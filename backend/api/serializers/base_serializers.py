@@ -2,10 +2,8 @@ import base64
 
 from django.core.files.base import ContentFile
 from rest_framework import serializers
-from rest_framework.validators import UniqueTogetherValidator
 
-from api.serializers.user import UserSerializer
-from recipes.models.abstract_models import BaseActionRecipeModel
+from core.constants import BULK_RECIPES_LIMIT
 from recipes.models.recipe import Recipe
 
 
@@ -45,38 +43,15 @@ class BaseRecipeSerializer(serializers.ModelSerializer):
         fields = ('id', 'name', 'image', 'cooking_time')
 
 
-class BaseRecipeActionSerializer(serializers.ModelSerializer):
-    """Абстрактный сериализатор для действий с рецептами.
+class BulkRecipeActionSerializer(serializers.Serializer):
+    """Сериализатор списка id рецептов для пакетных действий."""
 
-    Используется для добавления рецептов в избранное, корзину и т.д.
-    """
-
-    author = UserSerializer
-    recipe = serializers.PrimaryKeyRelatedField(
-        queryset=Recipe.objects.all()
+    recipes = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=BULK_RECIPES_LIMIT
     )
 
-    class Meta:
-        model = None  # Назначаем у дочерних классов
-        fields = ('author', 'recipe')
-        error_message = 'Этот рецепт уже добавлен.'
-
-    @classmethod
-    def get_validators(cls):
-        """Генерирует валидаторы для проверки уникальности связки автор-рецепт."""
-        return [
-            UniqueTogetherValidator(
-                queryset=cls.Meta.model.objects.all(),
-                fields=('author', 'recipe'),
-                message=cls.Meta.error_message
-            )
-        ]
-
-    def __init__(self, *args, **kwargs):
-        """Инициализация с добавлением валидаторов."""
-        super().__init__(*args, **kwargs)
-        self.Meta.validators = self.get_validators()
-
-    def to_representation(self, instance: BaseActionRecipeModel):
-        """Преобразует экземпляр в сериализованное представление."""
-        return BaseRecipeSerializer(instance.recipe).data
+    def validate_recipes(self, value: list) -> list:
+        """Убирает повторы, сохраняя порядок id."""
+        return list(dict.fromkeys(value))
@@ -0,0 +1,64 @@
+from typing import Tuple
+
+from django.db import models
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.request import Request
+
+from api.utils import select_fields
+from api.viewer import get_viewer
+
+
+class SparseFieldsetsMixin:
+    """Выбор полей ответа параметрами запроса fields и omit.
+
+    Действует только на корневой сериализатор ответа на чтение: пропущенные
+    поля не сериализуются, а вложенные сериализаторы отдают все свои поля.
+    """
+
+    @classmethod
+    def get_sparse_fields(cls, request: Request) -> Tuple[str, ...]:
+        """Поля, запрошенные клиентом."""
+        return select_fields(request.query_params, cls.Meta.fields)
+
+    @property
+    def is_sparse(self) -> bool:
+        """Отдается ли неполный набор полей."""
+        return len(self.fields) < len(self.Meta.fields)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request: Request = self.context.get('request')
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        if (
+            request is None
+            or parent is not None
+            or request.method not in SAFE_METHODS
+        ):
+            return fields
+
+        selected = self.get_sparse_fields(request)
+        return {
+            name: field for name, field in fields.items()
+            if name in selected
+        }
+
+
+class ViewerListSerializer(serializers.ListSerializer):
+    """Списочный сериализатор с предзагрузкой связей зрителя.
+
+    Перед сериализацией передает всю страницу дочернему сериализатору,
+    чтобы связи текущего пользователя загружались фиксированным числом
+    запросов, независимо от размера страницы.
+    """
+
+    def to_representation(self, data):
+        iterable = (
+            data.all() if isinstance(data, models.manager.BaseManager)
+            else data
+        )
+        instances = list(iterable)
+        self.child.load_viewer(get_viewer(self.context), instances)
+        return super().to_representation(instances)
@@ -1,23 +1,28 @@
 from collections import OrderedDict
-from typing import Optional
+from typing import List
 
-from django.db.models import Model
+from django.db import transaction
 from rest_framework import serializers
-from rest_framework.request import Request
 
+from api.cache import get_cached_recipe
 from api.serializers.base_serializers import BaseRecipeSerializer
+from api.serializers.mixins import (
+    SparseFieldsetsMixin,
+    ViewerListSerializer
+)
 from api.serializers.recipe_ingredients import (
     RecipeIngredientsGetSerializer,
     RecipeIngredientsSetSerializer
 )
 from api.serializers.user import UserSerializer
 from api.utils import many_unique_with_minimum_one_validate
+from api.viewer import ViewerContext, get_viewer
 from core.constants import MAX_INTEGER_VALUE, MIN_INTEGER_VALUE
 from recipes.models import (
     Recipe,
-    RecipeFavorite,
     RecipeIngredients,
-    ShoppingCart
+    RecipeSimilarityBucket,
+    ShoppingListItem
 )
 
 
@@ -45,7 +50,7 @@ class RecipeSerializer(BaseRecipeSerializer):
         )
 
 
-class RecipeGetSerializer(RecipeSerializer):
+class RecipeGetSerializer(SparseFieldsetsMixin, RecipeSerializer):
     """Сериализатор для получения данных о рецепте.
 
     Добавляет флаги:
@@ -62,22 +67,48 @@ class RecipeGetSerializer(RecipeSerializer):
             'is_in_shopping_cart'
         )
         read_only_fields = fields
+        list_serializer_class = ViewerListSerializer
+
+    def load_viewer(
+            self, viewer: ViewerContext, recipes: List[Recipe]
+    ) -> None:
+        """Загружает связи зрителя для всех рецептов страницы."""
+        viewer.load_recipes(
+            recipes,
+            favorites='is_favorited' in self.fields,
+            shopping_cart='is_in_shopping_cart' in self.fields,
+            authors='author' in self.fields
+        )
+
+    def to_representation(self, instance: Recipe):
+        """Дополняет закешированную карточку рецепта флагами зрителя.
 
-    def get_is_exists(self, obj: Recipe, model: Model):
-        request: Optional[Request] = self.context.get('request')
-        if not request or request.user.is_anonymous:
-            return False
-        return model.objects.filter(
-            author=request.user, recipe=obj
-        ).exists()
+        Неполный набор полей собирается без кеша, только из нужных полей.
+        """
+        if self.is_sparse:
+            return super().to_representation(instance)
+
+        viewer = get_viewer(self.context)
+        shared = get_cached_recipe(
+            instance, self.context.get('request'), super().to_representation
+        )
+        return {
+            **shared,
+            'author': {
+                **shared['author'],
+                'is_subscribed': viewer.is_subscribed(instance.author_id)
+            },
+            'is_favorited': viewer.is_favorited(instance.id),
+            'is_in_shopping_cart': viewer.is_in_shopping_cart(instance.id)
+        }
 
     def get_is_favorited(self, obj: Recipe):
         """Проверяет наличие рецепта в избранном."""
-        return self.get_is_exists(obj, RecipeFavorite)
+        return get_viewer(self.context).is_favorited(obj.id)
 
     def get_is_in_shopping_cart(self, obj: Recipe):
         """Проверяет наличие рецепта в корзине покупок."""
-        return self.get_is_exists(obj, ShoppingCart)
+        return get_viewer(self.context).is_in_shopping_cart(obj.id)
 
 
     class RecipeSerializer(BaseRecipeSerializer):
@@ -134,12 +165,16 @@ class RecipeChangeSerializer(RecipeSerializer):
             ) for ingredient in ingredients
         ]
         RecipeIngredients.objects.bulk_create(ingredient_recipe)
+        RecipeSimilarityBucket.objects.index_recipe(recipe)
         return recipe
 
+    @transaction.atomic
     def update(self, instance: Recipe, validated_data: dict):
         ingredients = validated_data.pop('recipe_ingredients')
         super().update(instance, validated_data)
 
+        # Прежние количества нужны, чтобы сдвинуть списки покупок
+        old_amounts = ShoppingListItem.objects.get_recipe_amounts(instance.id)
         instance.recipe_ingredients.all().delete()
         ingredient_recipe = [
             RecipeIngredients(
@@ -149,6 +184,9 @@ class RecipeChangeSerializer(RecipeSerializer):
             ) for ingredient in ingredients
         ]
         RecipeIngredients.objects.bulk_create(ingredient_recipe)
+        ShoppingListItem.objects.update_recipe(instance.id, old_amounts)
+        RecipeSimilarityBucket.objects.index_recipe(instance)
+        instance.touch()
         return instance
 
     def to_representation(self, instance):
@@ -1,21 +1,28 @@
+from typing import Dict, List, Optional
+
 from django.conf import settings
-from django.db.models.query import QuerySet
 from rest_framework import serializers
 from rest_framework.request import Request
-from rest_framework.validators import UniqueTogetherValidator
 
+from api.cache import get_cached_author_recipes
 from api.serializers.base_serializers import BaseRecipeSerializer
-from api.serializers.user import UserSerializer
-from api.validators import SubscribeUniqueValidator
-from users.models import Subscription, User
+from api.serializers.mixins import (
+    SparseFieldsetsMixin,
+    ViewerListSerializer
+)
+from api.viewer import ViewerContext, get_viewer
+from recipes.models import Recipe
+from users.models import User
 
 
-class SubscriptionGetSerializer(serializers.ModelSerializer):
+class SubscriptionGetSerializer(
+        SparseFieldsetsMixin, serializers.ModelSerializer
+):
     """Сериализатор для получения информации о подписках."""
 
     is_subscribed = serializers.SerializerMethodField(method_name='get_is_subscribed')
     recipes = serializers.SerializerMethodField(method_name='get_recipes')
-    recipes_count = serializers.IntegerField(source='recipes.count')
+    recipes_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = User
@@ -31,52 +38,62 @@ class SubscriptionGetSerializer(serializers.ModelSerializer):
             'avatar'
         )
         read_only_fields = fields
+        list_serializer_class = ViewerListSerializer
+
+    def load_viewer(self, viewer: ViewerContext, authors: List[User]) -> None:
+        """Загружает подписки зрителя и рецепты всех авторов страницы."""
+        if 'is_subscribed' in self.fields:
+            viewer.load_authors(author.id for author in authors)
+        if 'recipes' in self.fields:
+            self.load_recipes(authors)
 
     def get_is_subscribed(self, obj: User):
         """Проверяет, подписан ли текущий пользователь на автора."""
-        request: Request = self.context['request']
-        if request.user.is_anonymous:
-            return False
-        return obj.authors.filter(user=request.user).exists()
-
-    def get_recipes(self, obj: User):
-        """Возвращает список рецептов автора с учетом лимита."""
-        request: Request = self.context.get('request')
-        recipes_limit: int = (
-            request.GET.get('recipes_limit') if request
-            else settings.RECIPES_LIMIT_MAX
-        )
-        queryset: QuerySet = obj.recipes.all()
+        return get_viewer(self.context).is_subscribed(obj.id)
 
-        if recipes_limit:
-            queryset = queryset[:int(recipes_limit)]
-        serializer = BaseRecipeSerializer
-        return serializer(queryset, many=True).data
+    @classmethod
+    def get_recipes_limit(cls, request: Optional[Request]) -> int:
+        """Число рецептов автора из параметра recipes_limit.
 
-        return SerializerBaseRecipe(queryset, many=True).data
+        Не превышает RECIPES_LIMIT_MAX: столько рецептов хранится в кеше.
+        """
+        return serializers.IntegerField(
+            min_value=1, max_value=settings.RECIPES_LIMIT_MAX
+        ).run_validation(
+            request.query_params.get(
+                'recipes_limit', settings.RECIPES_LIMIT_MAX
+            ) if request else settings.RECIPES_LIMIT_MAX
+        )
 
-class SubscriptionChangedSerializer(serializers.ModelSerializer):
-    """Сериализатор для создания/удаления подписок."""
+    @staticmethod
+    def build_recipes(author_ids: List[int]) -> Dict[int, List[dict]]:
+        """Последние рецепты авторов одним запросом.
 
-    author_recipe = UserSerializer
-    user = UserSerializer
+        Из рецептов читаются только поля BaseRecipeSerializer.
+        """
+        recipes = {author_id: [] for author_id in author_ids}
+        for recipe in Recipe.objects.filter(
+            author_id__in=author_ids
+        ).only(
+            'author_id', *BaseRecipeSerializer.Meta.fields
+        ).latest_per_author(settings.RECIPES_LIMIT_MAX):
+            recipes[recipe.author_id].append(recipe)
+        return {
+            author_id: BaseRecipeSerializer(author_recipes, many=True).data
+            for author_id, author_recipes in recipes.items()
+        }
 
-    class Meta:
-        model = Subscription
-        fields = ('author_recipe', 'user')
-        validators = [
-            UniqueTogetherValidator(
-                queryset=Subscription.objects.all(),
-                fields=('author_recipe', 'user'),
-                message='Нельзя повторно подписаться на пользователя'
-            ),
-            SubscribeUniqueValidator(
-                fields=('author_recipe', 'user')
-            )
-        ]
+    def load_recipes(self, authors: List[User]) -> None:
+        """Раздает авторам их последние рецепты из кеша."""
+        limit = self.get_recipes_limit(self.context.get('request'))
+        recipes = get_cached_author_recipes(
+            (author.id for author in authors), self.build_recipes
+        )
+        for author in authors:
+            author.preview_recipes = recipes[author.id][:limit]
 
-    def to_representation(self, instance):
-        return SubscriptionGetSerializer(
-            instance.author_recipe,
-            context={'request': self.context.get('request')}
-        ).data
\ No newline at end of file
+    def get_recipes(self, obj: User):
+        """Возвращает последние рецепты автора с учетом лимита."""
+        if not hasattr(obj, 'preview_recipes'):
+            self.load_recipes([obj])
+        return obj.preview_recipes
@@ -1,10 +1,17 @@
+from typing import List
+
 from djoser.serializers import UserSerializer as DjoserUserSerializer
 from rest_framework import serializers
 
+from api.serializers.mixins import (
+    SparseFieldsetsMixin,
+    ViewerListSerializer
+)
+from api.viewer import ViewerContext, get_viewer
 from users.models import User
 
 
-class CurrentUserSerializer(DjoserUserSerializer):
+class CurrentUserSerializer(SparseFieldsetsMixin, DjoserUserSerializer):
     """Сериализатор для получения данных текущего пользователя."""
 
     is_subscribed = serializers.BooleanField(default=False, read_only=True)
@@ -27,10 +34,14 @@ class UserSerializer(CurrentUserSerializer):
 
     is_subscribed = serializers.SerializerMethodField()
 
+    class Meta(CurrentUserSerializer.Meta):
+        list_serializer_class = ViewerListSerializer
+
+    def load_viewer(self, viewer: ViewerContext, users: List[User]) -> None:
+        """Загружает подписки зрителя для всех пользователей страницы."""
+        if 'is_subscribed' in self.fields:
+            viewer.load_authors(user.id for user in users)
+
     def get_is_subscribed(self, obj):
         """Определяет, подписан ли текущий пользователь на данного пользователя."""
-        request = self.context['request']
-        user = request.user
-        if user.is_anonymous:
-            return False
-        return obj.authors.filter(user=user).exists()
+        return get_viewer(self.context).is_subscribed(obj.id)
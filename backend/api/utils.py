@@ -1,39 +1,110 @@
+import csv
 from collections import OrderedDict
-from typing import Dict, List, Union
+from typing import (
+    Dict, Iterable, Iterator, List, Mapping, Tuple, Type, Union
+)
 
-from django.db.models import Model
+from django.db.models import Model, QuerySet
+from django.shortcuts import get_object_or_404
 from rest_framework import status
+from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.serializers import Serializer, ValidationError
+from rest_framework.settings import api_settings
 
 from core.constants import (
+    BULK_ADDED,
+    BULK_ALREADY_ADDED,
+    BULK_NOT_ADDED,
+    BULK_NOT_FOUND,
+    BULK_REMOVED,
     TEMPLATE_MESSAGE_MINIMUM_ONE_ERROR,
-    TEMPLATE_MESSAGE_UNIQUE_ERROR
+    TEMPLATE_MESSAGE_UNIQUE_ERROR,
+    UNKNOWN_FIELDS_ERROR
 )
+from recipes.models import Recipe
+from recipes.models.abstract_models import BaseActionRecipeModel
 
 
-def object_update(*, serializer: Serializer) -> Response:
-    """Выполняет обновление объекта через сериализатор."""
-    serializer.is_valid(raise_exception=True)
-    serializer.save()
+def object_create(
+        *,
+        model: Type[Model],
+        data: Dict[str, object],
+        error_message: str,
+        serializer: Serializer
+) -> Response:
+    """Создает запись-переключатель одним INSERT ... ON CONFLICT.
+
+    Если запись уже есть, возвращает ошибку валидации с error_message,
+    иначе - данные serializer со статусом 201.
+    """
+    if not model.objects.add_one(**data):
+        raise ValidationError({
+            api_settings.NON_FIELD_ERRORS_KEY: [error_message]
+        })
     return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
 def object_delete(
         *,
+        model: Type[Model],
         data: Dict[str, object],
         error_message: str,
-        model: Model
+        target: QuerySet
 ) -> Response:
-    """Удаляет объект из базы данных."""
-    instance = model.objects.filter(**data)
-    if not instance.exists():
-        return Response(
-            {'errors': error_message},
-            status=status.HTTP_400_BAD_REQUEST
-        )
-    instance.delete()
-    return Response(status=status.HTTP_204_NO_CONTENT)
+    """Удаляет запись-переключатель одним DELETE.
+
+    Цель записи (рецепт, автор) проверяется в target только тогда,
+    когда удалять было нечего: ее отсутствие дает 404, а отсутствие
+    записи - ошибку error_message.
+    """
+    if model.objects.remove_one(**data):
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    get_object_or_404(target)
+    return Response(
+        {'errors': error_message},
+        status=status.HTTP_400_BAD_REQUEST
+    )
+
+
+def objects_bulk_change(
+        *,
+        serializer: Serializer,
+        request: Request,
+        model: Type[BaseActionRecipeModel],
+        add: bool
+) -> Response:
+    """Добавляет или удаляет пачку рецептов пользователя.
+
+    Существование рецептов проверяется одним запросом, изменение идет
+    одной транзакцией через QuerySet модели. Возвращает результат по
+    каждому id в порядке запроса.
+    """
+    serializer.is_valid(raise_exception=True)
+    recipe_ids = serializer.validated_data['recipes']
+
+    found = set(Recipe.objects.filter(
+        id__in=recipe_ids
+    ).values_list('id', flat=True))
+    if add:
+        changed = model.objects.add(request.user.id, found)
+        statuses = (BULK_ADDED, BULK_ALREADY_ADDED)
+    else:
+        changed = model.objects.remove(request.user.id, found)
+        statuses = (BULK_REMOVED, BULK_NOT_ADDED)
+
+    return Response({
+        'recipes': [
+            {
+                'id': recipe_id,
+                'status': (
+                    BULK_NOT_FOUND if recipe_id not in found
+                    else statuses[recipe_id not in changed]
+                )
+            }
+            for recipe_id in recipe_ids
+        ]
+    })
 
 
 def many_unique_with_minimum_one_validate(
@@ -62,4 +133,49 @@ def many_unique_with_minimum_one_validate(
             field_name: TEMPLATE_MESSAGE_UNIQUE_ERROR.format(
                 field_name=plural.capitalize()
             )
-        })
\ No newline at end of file
+        })
+
+
+def select_fields(
+        query_params: Mapping[str, str],
+        fields: Iterable[str]
+) -> Tuple[str, ...]:
+    """Отбирает поля ответа по параметрам fields и omit.
+
+    Оба параметра принимают имена полей через запятую, пустые значения
+    игнорируются. Порядок полей сохраняется.
+    """
+    selected = tuple(fields)
+    for param, keep in (('fields', True), ('omit', False)):
+        names = {
+            name.strip() for name in query_params.get(param, '').split(',')
+            if name.strip()
+        }
+        if not names:
+            continue
+
+        unknown = names.difference(selected)
+        if unknown:
+            raise ValidationError({
+                param: UNKNOWN_FIELDS_ERROR.format(
+                    fields=', '.join(sorted(unknown))
+                )
+            })
+        selected = tuple(
+            name for name in selected if (name in names) == keep
+        )
+    return selected
+
+
+class EchoBuffer:
+    """Буфер для csv.writer, который возвращает строку вместо записи."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def iter_csv(rows: Iterable[Iterable[object]]) -> Iterator[str]:
+    """Построчно отдает CSV, не накапливая файл в памяти."""
+    writer = csv.writer(EchoBuffer())
+    for row in rows:
+        yield writer.writerow(row)
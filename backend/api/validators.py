@@ -1,30 +1,8 @@
-from typing import Optional, List, Dict, Any
+from typing import Optional, Dict, Any
 
 from rest_framework.exceptions import ValidationError
 
 
-class SubscribeUniqueValidator:
-    """Проверяет, что пользователь не пытается подписаться на самого себя."""
-
-    default_message = 'Невозможно подписаться на самого себя'
-
-    def __init__(self, fields: List[str], message: Optional[str] = None):
-        """Инициализация валидатора."""
-        self.fields = fields
-        self.message = message or self.default_message
-
-    def __call__(self, attrs: Dict[str, Any]) -> None:
-        """Выполняет проверку валидации."""
-        user = attrs.get(self.fields[0])
-        author = attrs.get(self.fields[1])
-
-        if user == author:
-            raise ValidationError(
-                detail={'errors': self.message},
-                code='self_subscription'
-            )
-
-
 class UniqueDataInManyFieldValidator:
     """Проверяет уникальность значений в списке объектов или словарей."""
 
@@ -0,0 +1,125 @@
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from django.db.models import Count, Max, OuterRef, Subquery
+
+from recipes.models import Recipe, RecipeFavorite, ShoppingCart
+from users.models import Subscription, User
+
+# Связи зрителя: модель, поле владельца связи, поле идентификатора объекта
+VIEWER_RELATIONS: Dict[str, Tuple[type, str, str]] = {
+    'favorites': (RecipeFavorite, 'author', 'recipe_id'),
+    'shopping_cart': (ShoppingCart, 'author', 'recipe_id'),
+    'subscriptions': (Subscription, 'user', 'author_recipe_id'),
+}
+
+
+class ViewerContext:
+    """Связи текущего пользователя с рецептами и авторами запроса.
+
+    Избранное, корзина и подписки зрителя загружаются одним запросом на
+    каждый тип связи и только для тех объектов, которые попадут в ответ.
+    Экземпляр общий для всех вложенных сериализаторов запроса.
+    """
+
+    def __init__(self, user: Optional[User]) -> None:
+        """Инициализация пустого контекста для пользователя."""
+        self.user = user if user and user.is_authenticated else None
+        self._related: Dict[str, Set[int]] = {
+            name: set() for name in VIEWER_RELATIONS
+        }
+        self._loaded: Dict[str, Set[int]] = {
+            name: set() for name in VIEWER_RELATIONS
+        }
+
+    def load(self, relation: str, object_ids: Iterable[int]) -> None:
+        """Загружает связь зрителя для еще не проверенных объектов."""
+        if self.user is None:
+            return
+        object_ids = set(object_ids) - self._loaded[relation]
+        if not object_ids:
+            return
+
+        model, owner_field, object_field = VIEWER_RELATIONS[relation]
+        self._loaded[relation] |= object_ids
+        self._related[relation].update(
+            model.objects.filter(
+                **{owner_field: self.user, f'{object_field}__in': object_ids}
+            ).values_list(object_field, flat=True)
+        )
+
+    def load_recipes(
+            self,
+            recipes: Iterable[Recipe],
+            favorites: bool = True,
+            shopping_cart: bool = True,
+            authors: bool = True
+    ) -> None:
+        """Загружает избранное, корзину и подписки на авторов рецептов.
+
+        Флагами можно отключить связи, которые не попадут в ответ.
+        """
+        recipes = list(recipes)
+        recipe_ids = [recipe.id for recipe in recipes]
+        if favorites:
+            self.load('favorites', recipe_ids)
+        if shopping_cart:
+            self.load('shopping_cart', recipe_ids)
+        if authors:
+            self.load_authors(recipe.author_id for recipe in recipes)
+
+    def load_authors(self, author_ids: Iterable[int]) -> None:
+        """Загружает подписки зрителя на указанных авторов."""
+        self.load('subscriptions', author_ids)
+
+    def has(self, relation: str, object_id: int) -> bool:
+        """Проверяет связь зрителя с объектом, догружая ее по запросу."""
+        if self.user is None:
+            return False
+        self.load(relation, (object_id,))
+        return object_id in self._related[relation]
+
+    def is_favorited(self, recipe_id: int) -> bool:
+        """Находится ли рецепт в избранном зрителя."""
+        return self.has('favorites', recipe_id)
+
+    def is_in_shopping_cart(self, recipe_id: int) -> bool:
+        """Находится ли рецепт в корзине зрителя."""
+        return self.has('shopping_cart', recipe_id)
+
+    def is_subscribed(self, author_id: int) -> bool:
+        """Подписан ли зритель на автора."""
+        return self.has('subscriptions', author_id)
+
+    def get_version(self) -> Tuple[Optional[int], ...]:
+        """Отпечаток связей зрителя для валидаторов условных запросов.
+
+        Для каждой связи берется число записей и последний id: любое
+        добавление или удаление меняет отпечаток. Считается одним запросом.
+        """
+        if self.user is None:
+            return ()
+        fingerprint = {}
+        for name, (model, owner_field, _) in VIEWER_RELATIONS.items():
+            relations = model.objects.filter(
+                **{owner_field: OuterRef('pk')}
+            ).order_by().values(owner_field)
+            fingerprint[f'{name}_count'] = Subquery(
+                relations.annotate(value=Count('pk')).values('value')
+            )
+            fingerprint[f'{name}_last'] = Subquery(
+                relations.annotate(value=Max('pk')).values('value')
+            )
+        return User.objects.filter(pk=self.user.pk).annotate(
+            **fingerprint
+        ).values_list(*fingerprint).get()
+
+
+def get_viewer(context: dict) -> ViewerContext:
+    """Возвращает контекст зрителя, создавая его в контексте сериализатора."""
+    viewer: Optional[ViewerContext] = context.get('viewer')
+    if viewer is None:
+        request = context.get('request')
+        viewer = context['viewer'] = ViewerContext(
+            getattr(request, 'user', None)
+        )
+    return viewer
@@ -0,0 +1,89 @@
+from datetime import datetime
+from hashlib import md5
+from typing import Callable, Optional, Tuple
+
+from django.db.models.query import QuerySet
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+# Валидаторы ответа: строка для ETag и дата для Last-Modified
+Validators = Tuple[str, Optional[datetime]]
+
+
+class ConditionalGetMixin:
+    """Миксин условных GET-запросов для list и retrieve.
+
+    Вьюсет описывает версию ответа методами get_list_validators и
+    get_object_validators. Если клиент прислал совпадающий If-None-Match
+    или If-Modified-Since, отдается 304 без обращения к сериализаторам.
+    """
+
+    def make_validators(
+            self, *version, updated_at: Optional[datetime] = None
+    ) -> Validators:
+        """Дополняет версию данных адресом запроса и форматом ответа."""
+        request: Request = self.request
+        version = ':'.join(map(str, (
+            request.build_absolute_uri(),
+            request.accepted_renderer.format,
+            *version
+        )))
+        return version, updated_at
+
+    def get_list_validators(self, queryset: QuerySet) -> Optional[Validators]:
+        """Валидаторы списка; None отключает условный ответ."""
+        return None
+
+    def get_object_validators(self) -> Optional[Validators]:
+        """Валидаторы объекта; None отключает условный ответ."""
+        return None
+
+    def list(self, request: Request, *args, **kwargs):
+        """Список объектов с поддержкой условных запросов."""
+        validators = self.get_list_validators(
+            self.filter_queryset(self.get_queryset())
+        )
+        return self.conditional_response(
+            validators, super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request: Request, *args, **kwargs):
+        """Объект с поддержкой условных запросов."""
+        return self.conditional_response(
+            self.get_object_validators(),
+            super().retrieve, request, *args, **kwargs
+        )
+
+    def conditional_response(
+            self,
+            validators: Optional[Validators],
+            view: Callable[..., Response],
+            request: Request,
+            *args,
+            **kwargs
+    ):
+        """Отдает 304 при совпадении валидаторов, иначе вызывает view."""
+        if validators is None:
+            return view(request, *args, **kwargs)
+
+        version, updated_at = validators
+        etag = quote_etag(
+            md5(version.encode(), usedforsecurity=False).hexdigest()
+        )
+        last_modified = int(updated_at.timestamp()) if updated_at else None
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = view(request, *args, **kwargs)
+        if response.status_code in (
+            status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED
+        ):
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+            patch_vary_headers(response, ('Authorization',))
+        return response
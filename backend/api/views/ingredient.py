@@ -1,13 +1,27 @@
+from typing import Optional
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
 from django_filters.rest_framework import DjangoFilterBackend
+from django_filters.utils import translate_validation
 from rest_framework import viewsets
 from rest_framework.permissions import AllowAny
+from rest_framework.request import Request
+from rest_framework.response import Response
 
+from api.catalog import IngredientCatalog, get_ingredient_catalog
 from api.filters import IngredientFilter
 from api.serializers import IngredientSerializer
+from api.views.conditional import ConditionalGetMixin, Validators
 from recipes.models import Ingredient
+from recipes.search import get_ingredient_search_backend
 
 
-class IngredientViewSet(viewsets.ReadOnlyModelViewSet):
+class IngredientViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """Вьюсет для ингредиентов."""
 
     queryset = Ingredient.objects.all()
@@ -16,3 +30,86 @@ class IngredientViewSet(viewsets.ReadOnlyModelViewSet):
     pagination_class = None
     filter_backends = [DjangoFilterBackend]
     filterset_class = IngredientFilter
+
+    def list(self, request: Request, *args, **kwargs):
+        """Ингредиенты с началом названия name из каталога в памяти.
+
+        Каталог перечитывается из БД только после изменения ингредиентов,
+        поэтому обычный запрос к списку не обращается к БД. Полный список
+        в JSON отдается готовыми байтами. Нечеткий поиск q идет по индексу
+        pg_trgm, если он есть в СУБД, иначе по триграммам каталога.
+        """
+        filterset = self.filterset_class(
+            data=request.query_params, queryset=self.get_queryset()
+        )
+        if not filterset.is_valid():
+            raise translate_validation(filterset.errors)
+        name = filterset.form.cleaned_data.get('name', '')
+        query = filterset.form.cleaned_data.get('q', '')
+        if query and get_ingredient_search_backend(connection).in_database:
+            return Response(self.get_serializer(
+                filterset.qs, many=True
+            ).data)
+        catalog = get_ingredient_catalog()
+        if query:
+            return Response(catalog.fuzzy_search(query))
+        if not name and request.accepted_renderer.format == 'json' and (
+            'indent' not in request.accepted_media_type
+        ):
+            return self.full_list_response(request, catalog)
+        return self.conditional_response(
+            self.make_validators(
+                catalog.version, updated_at=catalog.updated_at
+            ),
+            lambda request: Response(catalog.search(name)),
+            request
+        )
+
+    def full_list_response(
+            self, request: Request, catalog: IngredientCatalog
+    ) -> HttpResponse:
+        """Весь каталог из готовых байтов JSON, сжатых под клиента.
+
+        Тело строится один раз на версию каталога, поэтому ответ
+        обходится копией памяти. Клиент может хранить его
+        INGREDIENTS_MAX_AGE секунд и затем проверять по сильному ETag.
+        """
+        content = catalog.full_list
+        encoding, body = content.select(
+            request.META.get('HTTP_ACCEPT_ENCODING', '')
+        )
+        etag = content.etags[encoding]
+        last_modified = (
+            int(catalog.updated_at.timestamp()) if catalog.updated_at
+            else None
+        )
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = HttpResponse(
+                body, content_type=request.accepted_renderer.media_type
+            )
+            response['Content-Length'] = len(body)
+            if encoding:
+                response['Content-Encoding'] = encoding
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        response['Cache-Control'] = (
+            f'public, max-age={settings.INGREDIENTS_MAX_AGE}'
+        )
+        patch_vary_headers(response, ('Accept-Encoding',))
+        return response
+
+    def get_object_validators(self) -> Optional[Validators]:
+        """Версия ингредиента по дате его изменения."""
+        try:
+            updated_at = Ingredient.objects.filter(
+                pk=self.kwargs['pk']
+            ).values_list('updated_at', flat=True).first()
+        except (TypeError, ValueError, ValidationError):
+            return None
+        if updated_at is None:
+            return None
+        return self.make_validators(updated_at, updated_at=updated_at)
@@ -1,6 +1,12 @@
-from django.shortcuts import get_object_or_404, redirect
+from typing import Optional
+
+from django.core.exceptions import ValidationError
+from django.db.models import Case, Count, Max, Prefetch, Sum, When
+from django.db.models.query import QuerySet
+from django.http import Http404
+from django.shortcuts import redirect
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import status, viewsets
+from rest_framework import serializers, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Request
@@ -8,15 +14,26 @@ from rest_framework.response import Response
 from rest_framework.serializers import Serializer
 from rest_framework.views import APIView
 
+from api.cache import resolve_short_link
 from api.filters import RecipeFilter
+from api.pagination import PageOrCursorPagination
 from api.permissions import IsAuthorOrReadOnly, ReadOnly
 from api.serializers import RecipeChangeSerializer, RecipeGetSerializer
+from api.viewer import ViewerContext
+from api.views.conditional import ConditionalGetMixin, Validators
 from api.views.recipe_favorite import RecipeFavoriteMixin
+from api.views.recipe_reader import RecipeReaderMixin
 from api.views.shopping_cart import ShoppingCartMixin
-from recipes.models import Recipe
+from core.constants import SIMILAR_RECIPES_LIMIT, SIMILAR_RECIPES_LIMIT_MAX
+from recipes.models import (
+    Recipe, RecipeIngredients, RecipePopularity, RecipeSimilarityBucket
+)
+from users.models import FeedEntry
 
 
 class RecipeViewSet(
+    ConditionalGetMixin,
+    RecipeReaderMixin,
     viewsets.ModelViewSet,
     RecipeFavoriteMixin,
     ShoppingCartMixin
@@ -28,20 +45,82 @@ class RecipeViewSet(
     filter_backends = [DjangoFilterBackend]
     filterset_class = RecipeFilter
     serializer_class = RecipeChangeSerializer
+    pagination_class = PageOrCursorPagination
     ordering = ['-id']
+    cursor_ordering = '-id'
+    # Действия, которые отдают карточки рецептов
+    read_actions = ('list', 'retrieve', 'feed', 'popular', 'similar')
 
     def get_permissions(self):
         """Определяет права доступа в зависимости от действия."""
         if (
-            self.action == 'download_shopping_cart'
+            self.action in ('download_shopping_cart', 'shopping_cart_summary')
             or self.request.method == 'POST'
         ):
             self.permission_classes = [IsAuthenticated]
         return super().get_permissions()
 
+    def get_queryset(self):
+        """Подгружает автора и ингредиенты для отображения рецептов.
+
+        Связи, поля которых клиент исключил из ответа, не загружаются.
+        """
+        queryset = super().get_queryset()
+        if self.action in self.read_actions:
+            fields = RecipeGetSerializer.get_sparse_fields(self.request)
+            if 'author' in fields:
+                queryset = queryset.select_related('author')
+            if 'ingredients' in fields:
+                queryset = queryset.prefetch_related(Prefetch(
+                    'recipe_ingredients',
+                    queryset=RecipeIngredients.objects.select_related(
+                        'ingredient'
+                    ).order_by('id')
+                ))
+        return queryset
+
+    def get_list_validators(self, queryset: QuerySet) -> Validators:
+        """Версия списка: состав и версии рецептов, связи зрителя.
+
+        Last-Modified для списка не отдается: удаление рецепта не меняет
+        даты изменения оставшихся. При сортировке по популярности версия
+        включает и версию рейтинга.
+        """
+        state = queryset.aggregate(
+            count=Count('id'), last_id=Max('id'), versions=Sum('version')
+        )
+        ranking = (
+            RecipePopularity.objects.get_version()
+            if self.request.query_params.get('ordering') == 'popular'
+            else ()
+        )
+        return self.make_validators(
+            *state.values(),
+            *ranking,
+            *ViewerContext(self.request.user).get_version()
+        )
+
+    def get_object_validators(self) -> Optional[Validators]:
+        """Версия рецепта и связи зрителя."""
+        try:
+            recipe = Recipe.objects.filter(pk=self.kwargs['pk']).values_list(
+                'version', 'updated_at'
+            ).first()
+        except (TypeError, ValueError, ValidationError):
+            return None
+        if recipe is None:
+            return None
+
+        version, updated_at = recipe
+        viewer_version = ViewerContext(self.request.user).get_version()
+        return self.make_validators(
+            version, *viewer_version,
+            updated_at=None if viewer_version else updated_at
+        )
+
     def get_serializer_class(self):
         """Выбирает сериализатор в зависимости от типа запроса."""
-        if self.action in ('list', 'retrieve'):
+        if self.action in self.read_actions:
             return RecipeGetSerializer
         if self.action in ['create', 'update', 'partial_update']:
             return RecipeChangeSerializer
@@ -66,6 +145,70 @@ class RecipeViewSet(
         super().perform_update(serializer)
         return Response(serializer.data)
 
+    @action(
+        detail=False,
+        methods=['GET'],
+        permission_classes=[IsAuthenticated],
+        cursor_ordering='-recipe_id'
+    )
+    def feed(self, request: Request):
+        """Рецепты авторов из подписок пользователя, от новых к старым.
+
+        Страница ленты читается по индексу записей ленты, затем рецепты
+        страницы загружаются по первичному ключу.
+        """
+        page = self.paginate_queryset(
+            FeedEntry.objects.get_feed(request.user)
+        )
+        recipes = self.get_queryset().filter(
+            id__in=[entry['recipe_id'] for entry in page]
+        )
+        return self.get_paginated_response(self.read_recipes(recipes))
+
+    @action(
+        detail=False,
+        methods=['GET'],
+        cursor_ordering='rank'
+    )
+    def popular(self, request: Request):
+        """Рецепты от популярных к непопулярным.
+
+        Страница читается курсором по месту в рейтинге, затем рецепты
+        страницы загружаются по первичному ключу в том же порядке.
+        """
+        page = self.paginate_queryset(
+            RecipePopularity.objects.get_ranking()
+        )
+        recipes = self.get_queryset().filter(
+            id__in=[entry['recipe_id'] for entry in page]
+        ).order_by('popularity__rank')
+        return self.get_paginated_response(self.read_recipes(recipes))
+
+    @action(detail=True, methods=['GET'])
+    def similar(self, request: Request, pk: int):
+        """Рецепты с самыми похожими наборами ингредиентов.
+
+        Число рецептов задается параметром limit. Кандидаты берутся из
+        индекса LSH и упорядочиваются по коэффициенту Жаккара.
+        """
+        limit = serializers.IntegerField(
+            min_value=1, max_value=SIMILAR_RECIPES_LIMIT_MAX
+        ).run_validation(
+            request.query_params.get('limit', SIMILAR_RECIPES_LIMIT)
+        )
+        ids = [
+            recipe_id for recipe_id, _ in
+            RecipeSimilarityBucket.objects.get_similar(
+                self.get_object(), limit
+            )
+        ]
+        recipes = self.get_queryset().filter(id__in=ids).order_by(Case(
+            *(When(id=recipe_id, then=position)
+              for position, recipe_id in enumerate(ids)),
+            default=len(ids)
+        ))
+        return Response(self.read_recipes(recipes))
+
     @action(detail=True, methods=['GET'], url_path='get-link')
     def get_short_link(self, request: Request, pk: int):
         """Генерирует короткую ссылку для рецепта."""
@@ -81,7 +224,7 @@ class RecipeViewSet(
         host = request.get_host()
         domain = f'{scheme}://{host}'
         return Response(
-            {'short-link': f'{domain}/s/{recipe.short_link}'},
+            {'short-link': f'{domain}/s/{recipe.get_signed_short_link()}'},
             status=status.HTTP_200_OK
         )
 
@@ -92,5 +235,7 @@ class RecipeRedirectView(APIView):
     permission_classes = [ReadOnly]
 
     def get(self, request: Request, short_link: str):
-        recipe = get_object_or_404(Recipe, short_link=short_link)
-        return redirect(recipe.get_frontend_absolute_url())
\ No newline at end of file
+        pk = resolve_short_link(short_link)
+        if pk is None:
+            raise Http404
+        return redirect(Recipe(pk=pk).get_frontend_absolute_url())
\ No newline at end of file
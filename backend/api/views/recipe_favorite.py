@@ -2,36 +2,65 @@ from django.shortcuts import get_object_or_404
 from rest_framework.decorators import action
 from rest_framework.request import Request
 
-from api.serializers import RecipeFavoriteSerializer
-from api.utils import object_delete, object_update
+from api.serializers import BaseRecipeSerializer, BulkRecipeActionSerializer
+from api.utils import object_create, object_delete, objects_bulk_change
+from core.constants import (
+    NOT_IN_FAVORITE_ERROR,
+    REPEAT_ADDED_FAVORITE_ERROR
+)
 from recipes.models import Recipe, RecipeFavorite
 
 
 class RecipeFavoriteMixin:
     """Миксин для работы с избранными рецептами."""
 
-    def get_data(self, request: Request, pk: int) -> dict:
-        """Подготавливает данные для работы с избранными рецептами."""
-        return {
-            'author': request.user,
-            'recipe': get_object_or_404(Recipe, id=pk)
-        }
-
     @action(detail=True, methods=['POST'], url_path='favorite')
     def post_favorite(self, request: Request, pk: int):
         """Добавляет рецепт в избранное."""
-        data: dict = self.get_data(request=request, pk=pk)
-        serializer = RecipeFavoriteSerializer(
-            data={key: obj.id for key, obj in data.items()},
-            context={'request': request}
+        recipe = get_object_or_404(
+            Recipe.objects.only(*BaseRecipeSerializer.Meta.fields), id=pk
+        )
+        return object_create(
+            model=RecipeFavorite,
+            data={'author': request.user, 'recipe': recipe},
+            error_message=REPEAT_ADDED_FAVORITE_ERROR,
+            serializer=BaseRecipeSerializer(recipe)
         )
-        return object_update(serializer=serializer)
 
     @post_favorite.mapping.delete
     def delete_favorite(self, request: Request, pk: int):
         """Удаляет рецепт из избранного."""
         return object_delete(
-            data=self.get_data(request=request, pk=pk),
-            error_message='У вас нет данного рецепта в избранном.',
-            model=RecipeFavorite
-        )
\ No newline at end of file
+            model=RecipeFavorite,
+            data={'author_id': request.user.id, 'recipe_id': pk},
+            error_message=NOT_IN_FAVORITE_ERROR,
+            target=Recipe.objects.filter(id=pk)
+        )
+
+    @action(detail=False, methods=['POST'], url_path='favorite/bulk')
+    def post_favorite_bulk(self, request: Request):
+        """Добавляет пачку рецептов в избранное.
+
+        Returns:
+            Статус по каждому id: added, already_added или not_found
+        """
+        return objects_bulk_change(
+            serializer=BulkRecipeActionSerializer(data=request.data),
+            request=request,
+            model=RecipeFavorite,
+            add=True
+        )
+
+    @post_favorite_bulk.mapping.delete
+    def delete_favorite_bulk(self, request: Request):
+        """Удаляет пачку рецептов из избранного.
+
+        Returns:
+            Статус по каждому id: removed, not_added или not_found
+        """
+        return objects_bulk_change(
+            serializer=BulkRecipeActionSerializer(data=request.data),
+            request=request,
+            model=RecipeFavorite,
+            add=False
+        )
@@ -0,0 +1,57 @@
+from django.conf import settings
+from django.db.models.query import QuerySet
+from django.shortcuts import get_object_or_404
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from api.readers import RecipeReader
+
+
+class RecipeReaderMixin:
+    """Миксин быстрого чтения рецептов через RecipeReader.
+
+    Включается настройкой RECIPE_READ_ENGINE = 'values'. Иначе list и
+    retrieve работают через RecipeGetSerializer.
+    """
+
+    def use_reader(self) -> bool:
+        """Используется ли быстрый движок чтения."""
+        return settings.RECIPE_READ_ENGINE == 'values'
+
+    def read_recipes(self, queryset: QuerySet) -> list:
+        """Карточки рецептов выбранным движком чтения."""
+        if not self.use_reader():
+            return self.get_serializer(queryset, many=True).data
+
+        reader = RecipeReader(self.request)
+        return reader.read(reader.get_queryset(queryset))
+
+    def list(self, request: Request, *args, **kwargs):
+        """Список рецептов из строк values()."""
+        if not self.use_reader():
+            return super().list(request, *args, **kwargs)
+
+        reader = RecipeReader(request)
+        queryset = reader.get_queryset(
+            self.filter_queryset(self.get_queryset())
+        )
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return Response(reader.read(queryset))
+        return self.get_paginated_response(reader.read(page))
+
+    def retrieve(self, request: Request, *args, **kwargs):
+        """Рецепт из строки values()."""
+        if not self.use_reader():
+            return super().retrieve(request, *args, **kwargs)
+
+        reader = RecipeReader(request)
+        queryset = reader.get_queryset(
+            self.filter_queryset(self.get_queryset())
+        )
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = get_object_or_404(
+            queryset, **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+        self.check_object_permissions(request, row)
+        return Response(reader.read([row])[0])
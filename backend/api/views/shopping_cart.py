@@ -1,39 +1,29 @@
-import csv
-import io
 from datetime import datetime
 
-from django.http import HttpResponse
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from rest_framework.decorators import action
 from rest_framework.request import Request
-
-from api.serializers import (
-    DownloadShoppingCartSerializer,
-    ShoppingCartSerializer
+from rest_framework.response import Response
+from rest_framework.serializers import ValidationError
+
+from api.exporters import EXPORTERS
+from api.negotiation import ExportContentNegotiation
+from api.serializers import BaseRecipeSerializer, BulkRecipeActionSerializer
+from api.utils import object_create, object_delete, objects_bulk_change
+from core.constants import (
+    NOT_IN_SHOPPING_CART_ERROR,
+    REPEAT_ADDED_SHOPPING_CART_ERROR,
+    SHOPPING_LIST_CHUNK_SIZE,
+    UNKNOWN_EXPORT_FORMAT_ERROR
 )
-from api.utils import object_delete, object_update
-from recipes.models import Recipe, ShoppingCart
+from recipes.models import Recipe, ShoppingCart, ShoppingListItem
 
 
 class ShoppingCartMixin:
     """Миксин для работы с корзиной покупок пользователя.
     Обеспечивает добавление/удаление рецептов и выгрузку списка покупок."""
 
-    def get_data(self, request: Request, pk: int) -> dict:
-        """Формирует базовые данные для операций с корзиной.
-
-        Args:
-            request: Объект HTTP-запроса
-            pk: ID рецепта
-
-        Returns:
-            Словарь с данными: автор (текущий пользователь) и рецепт
-        """
-        return {
-            'author': request.user,
-            'recipe': get_object_or_404(Recipe, id=pk)
-        }
-
     @action(detail=True, methods=['POST'], url_path='shopping_cart')
     def post_shopping_cart(self, request: Request, pk: int):
         """Добавляет рецепт в корзину покупок.
@@ -43,14 +33,17 @@ class ShoppingCartMixin:
             pk: ID рецепта для добавления
 
         Returns:
-            Результат операции добавления (сериализованные данные или ошибка)
+            Краткое представление рецепта или ошибка повторного добавления
         """
-        data: dict = self.get_data(request=request, pk=pk)
-        serializer = ShoppingCartSerializer(
-            data={key: obj.id for key, obj in data.items()},
-            context={'request': request}
+        recipe = get_object_or_404(
+            Recipe.objects.only(*BaseRecipeSerializer.Meta.fields), id=pk
+        )
+        return object_create(
+            model=ShoppingCart,
+            data={'author': request.user, 'recipe': recipe},
+            error_message=REPEAT_ADDED_SHOPPING_CART_ERROR,
+            serializer=BaseRecipeSerializer(recipe)
         )
-        return object_update(serializer=serializer)
 
     @post_shopping_cart.mapping.delete
     def delete_shopping_cart(self, request: Request, pk: int):
@@ -64,62 +57,104 @@ class ShoppingCartMixin:
             Результат операции удаления
 
         Raises:
-            NotFound: Если рецепт не найден в корзине
+            NotFound: Если рецепт не найден
         """
         return object_delete(
-            data=self.get_data(request=request, pk=pk),
-            error_message='У вас нет данного рецепта в корзине.',
-            model=ShoppingCart
+            model=ShoppingCart,
+            data={'author_id': request.user.id, 'recipe_id': pk},
+            error_message=NOT_IN_SHOPPING_CART_ERROR,
+            target=Recipe.objects.filter(id=pk)
         )
 
-    @action(detail=False, methods=['GET'], url_path='download_shopping_cart')
-    def download_shopping_cart(self, request):
-        """Генерирует и возвращает CSV-файл со списком покупок.
+    @action(detail=False, methods=['POST'], url_path='shopping_cart/bulk')
+    def post_shopping_cart_bulk(self, request: Request):
+        """Добавляет пачку рецептов в корзину.
 
         Returns:
-            HttpResponse с CSV-файлом, содержащим:
-            - Название ингредиента
-            - Единицу измерения
-            - Необходимое количество
+            Статус по каждому id: added, already_added или not_found
+        """
+        return objects_bulk_change(
+            serializer=BulkRecipeActionSerializer(data=request.data),
+            request=request,
+            model=ShoppingCart,
+            add=True
+        )
+
+    @post_shopping_cart_bulk.mapping.delete
+    def delete_shopping_cart_bulk(self, request: Request):
+        """Удаляет пачку рецептов из корзины.
 
-        Файл имеет кодировку cp1251 и формат имени:
-        shopping_cart.csv_{user_id}_{timestamp}
+        Returns:
+            Статус по каждому id: removed, not_added или not_found
         """
-        # Сериализация данных корзины
-        serializer = DownloadShoppingCartSerializer(
-            instance=ShoppingCart.objects.all(),
-            many=True, context={'request': request}
+        return objects_bulk_change(
+            serializer=BulkRecipeActionSerializer(data=request.data),
+            request=request,
+            model=ShoppingCart,
+            add=False
         )
 
+    @action(
+        detail=False,
+        methods=['GET'],
+        url_path='download_shopping_cart',
+        content_negotiation_class=ExportContentNegotiation
+    )
+    def download_shopping_cart(self, request):
+        """Генерирует и возвращает файл со списком покупок.
+
+        Формат задается параметром format: csv (по умолчанию), txt, json
+        или pdf. Файл содержит для каждого ингредиента:
+        - Название ингредиента
+        - Единицу измерения
+        - Необходимое количество
+
+        CSV имеет кодировку cp1251, имя файла имеет формат
+        shopping_cart.{format}_{user_id}_{timestamp}
+
+        Список читается одним запросом из поддерживаемых сумм
+        ShoppingListItem и отдается частями по мере чтения курсора.
+
+        Raises:
+            ValidationError: Если формат неизвестен
+            ExportUnavailable: Если PDF не успел сверстаться
+        """
+        exporter_format = request.query_params.get('format', 'csv')
+        if exporter_format not in EXPORTERS:
+            raise ValidationError({
+                'format': UNKNOWN_EXPORT_FORMAT_ERROR.format(
+                    formats=', '.join(EXPORTERS)
+                )
+            })
+        exporter = EXPORTERS[exporter_format]
+
         # Формирование имени файла с timestamp
         now = datetime.now()
         formatted_time = now.strftime('%d-%m-%Y_%H_%M_%S')
 
-        # Настройка HTTP-ответа для файла
-        response = HttpResponse(content_type='text/csv; charset=cp1251')
-        filename = f'shopping_cart.csv_{request.user.id}_{formatted_time}'
+        # Строки кодируются в ответе по charset из content_type
+        response = StreamingHttpResponse(
+            exporter.render(
+                ShoppingListItem.objects.get_shopping_list(
+                    request.user
+                ).iterator(chunk_size=SHOPPING_LIST_CHUNK_SIZE)
+            ),
+            content_type=exporter.content_type
+        )
+        filename = exporter.get_filename(request.user.id, formatted_time)
         response['Content-Disposition'] = (
             f'attachment; filename="{filename}"'
         )
+        return response
 
-        # Запись данных в CSV
-        csv_buffer = io.TextIOWrapper(response, encoding='cp1251', newline='')
-        writer = csv.writer(csv_buffer)
-
-        # Заголовки столбцов
-        writer.writerow(['Ингредиент', 'Единица измерения', 'Количество'])
-
-        # Данные ингредиентов (если есть)
-        if serializer.data:
-            ingredients = serializer.data[0]['ingredients']
-            rows = [
-                [
-                    ingredient['name'],
-                    ingredient['measurement_unit'],
-                    ingredient['total_amount']
-                ] for ingredient in ingredients
-            ]
-            writer.writerows(rows)
-
-        csv_buffer.flush()
-        return response
\ No newline at end of file
+    @action(detail=False, methods=['GET'], url_path='shopping_cart_summary')
+    def shopping_cart_summary(self, request: Request):
+        """Возвращает список покупок текущего пользователя в JSON.
+
+        Returns:
+            Список ингредиентов с полями name, measurement_unit и
+            total_amount в алфавитном порядке
+        """
+        return Response(list(
+            ShoppingListItem.objects.get_shopping_list(request.user)
+        ))
@@ -1,13 +1,17 @@
+from django.db.models import F
 from django.shortcuts import get_object_or_404
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Request
-
-from api.serializers import (
-    SubscriptionChangedSerializer,
-    SubscriptionGetSerializer
+from rest_framework.serializers import ValidationError
+
+from api.serializers import SubscriptionGetSerializer
+from api.utils import object_create, object_delete
+from core.constants import (
+    NOT_SUBSCRIBED_ERROR,
+    REPEAT_SUBSCRIPTION_ERROR,
+    SELF_SUBSCRIPTION_ERROR
 )
-from api.utils import object_delete, object_update
 from users.models import Subscription, User
 
 
@@ -15,30 +19,26 @@ class SubscriptionMixin:
     """Миксин для управления подписками пользователей.
     Обеспечивает функционал подписки/отписки и просмотра подписок."""
 
-    def get_data(self, request: Request, id: int) -> dict:
-        """Подготавливает базовые данные для операций с подписками.
-
-        Args:
-            request: Объект запроса
-            id: ID пользователя, на которого подписываются/отписываются
-
-        Returns:
-            Словарь с данными: текущий пользователь и целевой пользователь
-        """
-        return {
-            'user': request.user,
-            'author_recipe': get_object_or_404(User, id=id)
-        }
-
-    @action(['GET'], detail=False, url_path='subscriptions')
+    @action(
+        ['GET'],
+        detail=False,
+        url_path='subscriptions',
+        cursor_ordering='-subscribed_at'
+    )
     def subscriptions(self, request: Request):
         """Получает список всех подписок текущего пользователя.
 
+        Подписки упорядочены от новых к старым, что позволяет листать их
+        курсором по дате подписки. Последние рецепты авторов страницы
+        читаются из общего кеша, а недостающие - одним запросом.
+
         Returns:
             Ответ с пагинированным списком подписок в формате JSON
         """
         user = request.user
-        queryset = User.objects.filter(authors__user=user)
+        queryset = User.objects.filter(authors__user=user).annotate(
+            subscribed_at=F('authors__created_at')
+        ).order_by('-subscribed_at')
         pages = self.paginate_queryset(queryset)
 
         serializer = SubscriptionGetSerializer(
@@ -64,12 +64,17 @@ class SubscriptionMixin:
         Returns:
             Результат операции подписки (успех/ошибка)
         """
-        data: dict = self.get_data(request=request, id=id)
-        serializer = SubscriptionChangedSerializer(
-            data={key: obj.id for key, obj in data.items()},
-            context={'request': request}
+        author = get_object_or_404(User, id=id)
+        if author.id == request.user.id:
+            raise ValidationError({'errors': [SELF_SUBSCRIPTION_ERROR]})
+        return object_create(
+            model=Subscription,
+            data={'user': request.user, 'author_recipe': author},
+            error_message=REPEAT_SUBSCRIPTION_ERROR,
+            serializer=SubscriptionGetSerializer(
+                author, context={'request': request}
+            )
         )
-        return object_update(serializer=serializer)
 
     @post_subscribe.mapping.delete
     def delete_subscribe(self, request: Request, id: int):
@@ -86,7 +91,8 @@ class SubscriptionMixin:
             NotFound: Если подписка не найдена
         """
         return object_delete(
-            data=self.get_data(request=request, id=id),
-            error_message='У вас нет данного пользователя в подписчиках.',
-            model=Subscription
+            model=Subscription,
+            data={'user_id': request.user.id, 'author_recipe_id': id},
+            error_message=NOT_SUBSCRIBED_ERROR,
+            target=User.objects.filter(id=id)
         )
\ No newline at end of file
@@ -1,10 +1,10 @@
 from djoser import views as djoser_views
 from rest_framework import response, status
 from rest_framework.decorators import action
-from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Request
 
+from api.pagination import PageOrCursorPagination
 from api.permissions import ReadOnly
 from api.serializers import AvatarSerializer, UserSerializer
 from api.views.subscription import SubscriptionMixin
@@ -16,9 +16,9 @@ class UserViewSet(djoser_views.UserViewSet, SubscriptionMixin):
 
     queryset = User.objects.all()
     serializer_class = UserSerializer
-    pagination_class = PageNumberPagination
-    pagination_class.page_size_query_param = 'limit'
+    pagination_class = PageOrCursorPagination
     permission_classes = [IsAuthenticated | ReadOnly]
+    cursor_ordering = 'id'
 
     @action(
         ['GET', 'PUT', 'PATCH', 'DELETE'],
@@ -1,3 +1,4 @@
+from importlib.util import find_spec
 from pathlib import Path
 from typing import List, Dict, Any
 
@@ -35,6 +36,10 @@ INSTALLED_APPS: List[str] = [
     'recipes.apps.RecipesConfig',
     'users.apps.UsersConfig',
 ]
+# Замеры производительности есть только в репозитории и не копируются
+# в образ, поэтому команда benchmark доступна лишь при разработке
+if find_spec('benchmarks') is not None:
+    INSTALLED_APPS.append('benchmarks.apps.BenchmarksConfig')
 
 # Промежуточное ПО
 MIDDLEWARE: List[str] = [
@@ -82,6 +87,24 @@ DATABASES: Dict[str, Dict[str, Any]] = {
     }
 }
 
+# Кеширование
+CACHES: Dict[str, Dict[str, Any]] = {
+    'default': {
+        'BACKEND': env.str(
+            'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': env.str('CACHE_LOCATION', 'foodgram'),
+    },
+    # Кеш коротких ссылок в памяти процесса: LRU на SHORT_LINK_CACHE_SIZE кодов
+    'short_links': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'short_links',
+        'OPTIONS': {
+            'MAX_ENTRIES': env.int('SHORT_LINK_CACHE_SIZE', 10000),
+        },
+    },
+}
+
 # Валидация паролей
 AUTH_PASSWORD_VALIDATORS: List[Dict[str, str]] = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -108,14 +131,36 @@ AUTH_USER_MODEL = 'users.User'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Настройки REST Framework
+# Реализация JSON для API: orjson (быстрая) или stock (стандартная DRF)
+JSON_BACKENDS: Dict[str, Dict[str, str]] = {
+    'orjson': {
+        'renderer': 'api.renderers.ORJSONRenderer',
+        'parser': 'api.parsers.ORJSONParser',
+    },
+    'stock': {
+        'renderer': 'rest_framework.renderers.JSONRenderer',
+        'parser': 'rest_framework.parsers.JSONParser',
+    },
+}
+JSON_BACKEND: Dict[str, str] = JSON_BACKENDS[env.str('JSON_BACKEND', 'orjson')]
+
 REST_FRAMEWORK: Dict[str, Any] = {
+    'DEFAULT_RENDERER_CLASSES': [
+        JSON_BACKEND['renderer'],
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        JSON_BACKEND['parser'],
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.TokenAuthentication',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.LimitPageNumberPagination',
     'PAGE_SIZE': env.int('PAGE_SIZE', 10),
     'TEST_REQUEST_DEFAULT_FORMAT': 'json'
 }
@@ -134,4 +179,33 @@ DJOSER: Dict[str, Any] = {
 }
 
 # Лимиты приложения
-RECIPES_LIMIT_MAX: int = env.int('RECIPES_LIMIT_MAX', 10)
\ No newline at end of file
+RECIPES_LIMIT_MAX: int = env.int('RECIPES_LIMIT_MAX', 10)
+RECIPE_CACHE_TIMEOUT: int = env.int('RECIPE_CACHE_TIMEOUT', 60 * 60)
+# Сколько секунд клиенты и прокси хранят полный список ингредиентов
+INGREDIENTS_MAX_AGE: int = env.int('INGREDIENTS_MAX_AGE', 24 * 60 * 60)
+# Как часто процесс сверяет версию каталога ингредиентов с БД, секунд
+INGREDIENT_CATALOG_CHECK_INTERVAL: int = env.int(
+    'INGREDIENT_CATALOG_CHECK_INTERVAL', 5
+)
+# Время жизни последних рецептов автора в кеше подписок
+AUTHOR_RECIPES_CACHE_TIMEOUT: int = env.int(
+    'AUTHOR_RECIPES_CACHE_TIMEOUT', 60 * 60
+)
+# Время жизни кода короткой ссылки в кеше и отметки о неизвестном коде
+SHORT_LINK_CACHE_TIMEOUT: int = env.int('SHORT_LINK_CACHE_TIMEOUT', 60 * 60)
+SHORT_LINK_MISSING_TIMEOUT: int = env.int('SHORT_LINK_MISSING_TIMEOUT', 60)
+# Авторы с таким числом подписчиков подмешиваются в ленты при чтении
+FEED_FANOUT_LIMIT: int = env.int('FEED_FANOUT_LIMIT', 1000)
+# Сколько часов новизны стоят десятикратного роста популярности;
+# 0 отключает учет новизны. После изменения нужен refresh_popularity --full
+POPULARITY_RECENCY_HOURS: int = env.int('POPULARITY_RECENCY_HOURS', 0)
+# Выгрузка списка покупок в PDF: число процессов верстки, сколько секунд
+# запрос ждет результат и шрифт с кириллицей
+SHOPPING_LIST_PDF_WORKERS: int = env.int('SHOPPING_LIST_PDF_WORKERS', 2)
+SHOPPING_LIST_PDF_TIMEOUT: int = env.int('SHOPPING_LIST_PDF_TIMEOUT', 10)
+SHOPPING_LIST_PDF_FONT: str = env.str(
+    'SHOPPING_LIST_PDF_FONT', '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf'
+)
+
+# Движок чтения рецептов: values (строки values()) или serializer (DRF)
+RECIPE_READ_ENGINE: str = env.str('RECIPE_READ_ENGINE', 'values')
@@ -0,0 +1,73 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.utils import override_settings
+
+from benchmarks.suites import BENCHMARKS
+
+# Кеш отключается, чтобы замерять построение ответа, а не чтение кеша.
+# Кеш коротких ссылок сам является предметом замера и остается
+BENCHMARK_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+    'short_links': settings.CACHES['short_links'],
+}
+
+
+class Command(BaseCommand):
+    """Команда сравнения производительности реализаций.
+
+    Каждый набор замеров выполняется в транзакции, которая откатывается,
+    поэтому временные данные в базе не остаются.
+    """
+
+    help = 'Сравнение производительности базовой и новой реализаций'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'suites',
+            nargs='*',
+            help=f'Наборы замеров: {", ".join(BENCHMARKS)} (по умолчанию все)'
+        )
+        parser.add_argument(
+            '--sizes',
+            type=int,
+            nargs='+',
+            default=[10, 50, 100],
+            help='Размеры входных данных'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Число запусков, из которых берется лучшее время'
+        )
+
+    def handle(self, *args, **kwargs):
+        suites = kwargs['suites'] or list(BENCHMARKS)
+        unknown = set(suites).difference(BENCHMARKS)
+        if unknown:
+            raise CommandError(
+                f'Неизвестные наборы замеров: {", ".join(sorted(unknown))}'
+            )
+
+        with override_settings(CACHES=BENCHMARK_CACHES):
+            for suite in suites:
+                with transaction.atomic():
+                    results = BENCHMARKS[suite](
+                        sizes=kwargs['sizes'], repeat=kwargs['repeat']
+                    )
+                    transaction.set_rollback(True)
+                self._write_results(suite, results)
+
+    def _write_results(self, suite: str, results: list):
+        self.stdout.write(self.style.MIGRATE_HEADING(suite))
+        self.stdout.write(
+            f'{"Замер":<24}{"Базовая, мс":>14}{"Новая, мс":>14}'
+            f'{"Ускорение":>12}'
+        )
+        for label, baseline, candidate in results:
+            speedup = baseline / candidate if candidate else float('inf')
+            self.stdout.write(
+                f'{label:<24}{baseline:>14.2f}{candidate:>14.2f}'
+                f'{speedup:>11.1f}x'
+            )
@@ -0,0 +1,610 @@
+import os
+from base64 import b64encode
+from io import BytesIO
+from random import Random
+from time import perf_counter
+from typing import (
+    Callable, Dict, Iterator, List, NamedTuple, Sequence, Set
+)
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.db.models import Count, F, Prefetch
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.cache import resolve_short_link
+from api.catalog import IngredientCatalog
+from api.parsers import ORJSONParser
+from api.readers import RecipeReader
+from api.renderers import ORJSONRenderer
+from api.serializers import IngredientSerializer, RecipeGetSerializer
+from api.exporters import CSVExporter
+from core.constants import POPULARITY_CART_WEIGHT, POPULARITY_FAVORITE_WEIGHT
+from core.utils import sign_short_link
+from recipes.models import (
+    Ingredient, Recipe, RecipeFavorite, RecipeIngredients, RecipePopularity,
+    RecipeSimilarityBucket, ShoppingCart, ShoppingListItem
+)
+from recipes.search import (
+    SearchBackend,
+    get_ingredient_search_backend,
+    get_search_backend
+)
+from recipes.similarity import MinHash, get_jaccard
+from users.models import User
+
+# Число ингредиентов во временных рецептах и размер их справочника
+BENCHMARK_INGREDIENTS = 8
+BENCHMARK_CATALOG = 500
+# Число временных пользователей, добавляющих рецепты в избранное
+BENCHMARK_FANS = 20
+# Число переходов по коротким ссылкам в одном замере
+BENCHMARK_REDIRECTS = 1000
+# Сколько наборов ингредиентов хешируется при замере сигнатур
+BENCHMARK_SIGNATURES = 20000
+# Размер картинки в теле запроса на создание рецепта, в мегабайтах
+BENCHMARK_IMAGE_MB = 2
+
+
+class BenchmarkResult(NamedTuple):
+    """Результат замера: базовая и новая реализации, в миллисекундах."""
+
+    label: str
+    baseline: float
+    candidate: float
+
+
+# Зарегистрированные наборы замеров
+BENCHMARKS: Dict[str, Callable[..., List[BenchmarkResult]]] = {}
+
+
+def register(name: str):
+    """Регистрирует набор замеров для команды benchmark."""
+    def decorator(func: Callable[..., List[BenchmarkResult]]):
+        BENCHMARKS[name] = func
+        return func
+    return decorator
+
+
+def measure(func: Callable[[], object], repeat: int) -> float:
+    """Лучшее время выполнения func из repeat запусков, в миллисекундах."""
+    timings = []
+    for _ in range(repeat):
+        started = perf_counter()
+        func()
+        timings.append(perf_counter() - started)
+    return min(timings) * 1000
+
+
+def make_request(path: str = '/api/recipes/') -> Request:
+    """GET-запрос анонимного пользователя для сериализаторов."""
+    request = Request(
+        APIRequestFactory().get(path, HTTP_HOST=settings.ALLOWED_HOSTS[0])
+    )
+    request.user = AnonymousUser()
+    return request
+
+
+def make_recipes(count: int) -> None:
+    """Дополняет базу временными рецептами до count штук.
+
+    Вызывается внутри транзакции команды, которая потом откатывается.
+    """
+    existing = Recipe.objects.count()
+    if existing >= count:
+        return
+
+    author, _ = User.objects.get_or_create(
+        email='benchmark@foodgram.local',
+        defaults={
+            'username': 'benchmark',
+            'first_name': 'Benchmark',
+            'last_name': 'Benchmark'
+        }
+    )
+    names = [f'benchmark-{index}' for index in range(BENCHMARK_CATALOG)]
+    Ingredient.objects.bulk_create(
+        [Ingredient(name=name, measurement_unit='г') for name in names],
+        ignore_conflicts=True
+    )
+    catalog = list(Ingredient.objects.filter(name__in=names))
+    # Коды ссылок по номеру рецепта, чтобы пачка не упиралась в индекс
+    recipes = Recipe.objects.bulk_create([
+        Recipe(
+            author=author,
+            name=f'Рецепт {index}',
+            image='recipes/images/benchmark.png',
+            text='Описание рецепта. ' * 20,
+            cooking_time=index % 120 + 1,
+            short_link=f'Z{index:05X}'
+        )
+        for index in range(existing, count)
+    ])
+    RecipeIngredients.objects.bulk_create([
+        RecipeIngredients(recipe=recipe, ingredient=ingredient, amount=100)
+        for recipe, ingredients in zip(
+            recipes, sample_ingredients(catalog, len(recipes), seed=count)
+        )
+        for ingredient in ingredients
+    ])
+
+
+def sample_ingredients(
+        catalog: List[Ingredient], count: int, seed: int
+) -> Iterator[Set[Ingredient]]:
+    """Наборы ингредиентов для count рецептов.
+
+    Частота ингредиента убывает с его номером в справочнике, как у соли
+    и редких специй, а наборы воспроизводимы между запусками.
+    """
+    random = Random(seed)
+    weights = [1 / (index + 1) for index in range(len(catalog))]
+    for _ in range(count):
+        ingredients = set()
+        while len(ingredients) < BENCHMARK_INGREDIENTS:
+            ingredients.update(random.choices(catalog, weights, k=1))
+        yield ingredients
+
+
+def get_benchmark_ingredients(count: int) -> List[int]:
+    """Id первых count ингредиентов временного справочника."""
+    return list(Ingredient.objects.filter(
+        name__in=[f'benchmark-{index}' for index in range(count)]
+    ).values_list('id', flat=True))
+
+
+@register('recipe_read')
+def recipe_read(sizes: Sequence[int], repeat: int) -> List[BenchmarkResult]:
+    """Чтение страницы рецептов: RecipeGetSerializer против RecipeReader."""
+    make_recipes(max(sizes))
+    request = make_request()
+    results = []
+    for size in sizes:
+        def serializer():
+            recipes = Recipe.objects.select_related('author').prefetch_related(
+                Prefetch(
+                    'recipe_ingredients',
+                    queryset=RecipeIngredients.objects.select_related(
+                        'ingredient'
+                    ).order_by('id')
+                )
+            )[:size]
+            return RecipeGetSerializer(
+                recipes, many=True, context={'request': request}
+            ).data
+
+        def reader():
+            recipe_reader = RecipeReader(request)
+            return recipe_reader.read(
+                recipe_reader.get_queryset(Recipe.objects.all())[:size]
+            )
+
+        results.append(BenchmarkResult(
+            f'{size} рецептов',
+            measure(serializer, repeat),
+            measure(reader, repeat)
+        ))
+    return results
+
+
+@register('json')
+def json_backend(sizes: Sequence[int], repeat: int) -> List[BenchmarkResult]:
+    """Рендеринг рецептов и разбор тела с картинкой: DRF против orjson."""
+    make_recipes(max(sizes))
+    request = make_request()
+    results = []
+    for size in sizes:
+        recipe_reader = RecipeReader(request)
+        data = {
+            'count': size,
+            'next': None,
+            'previous': None,
+            'results': recipe_reader.read(
+                recipe_reader.get_queryset(Recipe.objects.all())[:size]
+            )
+        }
+        results.append(BenchmarkResult(
+            f'рендеринг {size} рецептов',
+            measure(lambda: JSONRenderer().render(data), repeat),
+            measure(lambda: ORJSONRenderer().render(data), repeat)
+        ))
+
+    image = b64encode(os.urandom(BENCHMARK_IMAGE_MB * 1024 * 1024)).decode()
+    body = ORJSONRenderer().render({
+        'ingredients': [{'id': 1, 'amount': 10}] * BENCHMARK_INGREDIENTS,
+        'image': f'data:image/png;base64,{image}',
+        'name': 'Рецепт',
+        'text': 'Описание рецепта. ' * 20,
+        'cooking_time': 10
+    })
+    results.append(BenchmarkResult(
+        f'разбор {BENCHMARK_IMAGE_MB} МБ',
+        measure(lambda: JSONParser().parse(BytesIO(body)), repeat),
+        measure(lambda: ORJSONParser().parse(BytesIO(body)), repeat)
+    ))
+    return results
+
+
+@register('search')
+def search(sizes: Sequence[int], repeat: int) -> List[BenchmarkResult]:
+    """Поиск рецепта по номеру: подстрока против полнотекстового индекса."""
+    results = []
+    for size in sizes:
+        make_recipes(size)
+        query = str(size - 1)
+
+        def run(backend: SearchBackend):
+            return lambda: list(
+                backend.search(Recipe.objects.all(), query).order_by(
+                    '-search_rank', '-id'
+                ).values_list('id', flat=True)[:10]
+            )
+
+        results.append(BenchmarkResult(
+            f'{size} рецептов',
+            measure(run(SearchBackend()), repeat),
+            measure(run(get_search_backend(connection)), repeat)
+        ))
+    return results
+
+
+@register('ingredient_catalog')
+def ingredient_catalog(
+        sizes: Sequence[int], repeat: int
+) -> List[BenchmarkResult]:
+    """Подсказки по началу названия: фильтр в БД против каталога."""
+    make_recipes(1)
+    names = list(Ingredient.objects.values_list('name', flat=True))
+    catalog = IngredientCatalog.load('benchmark')
+    results = []
+    for size in sizes:
+        # Нажатия клавиш: начала названий длиной от одной до трех букв
+        prefixes = [
+            names[index % len(names)][:index % 3 + 1]
+            for index in range(size)
+        ]
+
+        def database():
+            return [
+                list(Ingredient.objects.filter(
+                    name__istartswith=prefix
+                ).values('id', 'name', 'measurement_unit'))
+                for prefix in prefixes
+            ]
+
+        results.append(BenchmarkResult(
+            f'{size} запросов, {len(names)} ингредиентов',
+            measure(database, repeat),
+            measure(
+                lambda: [catalog.search(prefix) for prefix in prefixes],
+                repeat
+            )
+        ))
+    return results
+
+
+@register('ingredient_fuzzy')
+def ingredient_fuzzy(
+        sizes: Sequence[int], repeat: int
+) -> List[BenchmarkResult]:
+    """Нечеткий поиск ингредиентов: индекс на запрос против каталога."""
+    make_recipes(1)
+    names = list(Ingredient.objects.values_list('name', flat=True))
+    catalog = IngredientCatalog.load('benchmark')
+    # Индекс триграмм строится один раз на версию каталога
+    catalog.trigrams
+    results = []
+    for size in sizes:
+        # Опечатки: в названии пропущена одна буква
+        queries = [
+            name[:len(name) // 2] + name[len(name) // 2 + 1:]
+            for name in (names[index % len(names)] for index in range(size))
+        ]
+
+        def database():
+            return [
+                list(get_ingredient_search_backend(connection).search(
+                    Ingredient.objects.all(), query
+                ).values_list('id', flat=True))
+                for query in queries
+            ]
+
+        results.append(BenchmarkResult(
+            f'{size} запросов, {len(names)} ингредиентов',
+            measure(database, repeat),
+            measure(
+                lambda: [catalog.fuzzy_search(query) for query in queries],
+                repeat
+            )
+        ))
+    return results
+
+
+@register('ingredient_list')
+def ingredient_list(
+        sizes: Sequence[int], repeat: int
+) -> List[BenchmarkResult]:
+    """Полный список ингредиентов: сериализация против готовых байтов."""
+    make_recipes(1)
+    catalog = IngredientCatalog.load('benchmark')
+    # Сжатие выполняется один раз на версию каталога и в замер не входит
+    catalog.full_list
+    results = []
+    for size in sizes:
+        def serialize():
+            return [
+                ORJSONRenderer().render(IngredientSerializer(
+                    Ingredient.objects.all(), many=True
+                ).data)
+                for _ in range(size)
+            ]
+
+        results.append(BenchmarkResult(
+            f'{size} запросов, {len(catalog.ingredients)} ингредиентов',
+            measure(serialize, repeat),
+            measure(
+                lambda: [
+                    catalog.full_list.select('gzip, br') for _ in range(size)
+                ],
+                repeat
+            )
+        ))
+    return results
+
+
+@register('ingredients')
+def ingredients(sizes: Sequence[int], repeat: int) -> List[BenchmarkResult]:
+    """Фильтр по ингредиентам: соединение на каждый id против индекса."""
+    results = []
+    for size in sizes:
+        make_recipes(size)
+        *required, first_excluded, second_excluded = (
+            get_benchmark_ingredients(6)
+        )
+        excluded = [first_excluded, second_excluded]
+
+        def joins():
+            recipes = Recipe.objects.all()
+            for ingredient_id in required:
+                recipes = recipes.filter(
+                    recipe_ingredients__ingredient_id=ingredient_id
+                )
+            recipes = recipes.exclude(
+                recipe_ingredients__ingredient_id__in=excluded
+            )
+            return recipes.count(), list(recipes.values_list('id')[:10])
+
+        def index():
+            recipes = Recipe.objects.filter(
+                id__in=RecipeIngredients.objects.get_recipes_with_all(
+                    required
+                )
+            ).exclude(
+                id__in=RecipeIngredients.objects.get_recipes_with_any(
+                    excluded
+                )
+            )
+            return recipes.count(), list(recipes.values_list('id')[:10])
+
+        results.append(BenchmarkResult(
+            f'{size} рецептов',
+            measure(joins, repeat),
+            measure(index, repeat)
+        ))
+    return results
+
+
+def make_fans(count: int) -> None:
+    """Добавляет временные рецепты в избранное и корзины пользователей.
+
+    Каждый пользователь отмечает десятую часть рецептов, счетчики
+    рецептов при этом не меняются.
+    """
+    random = Random(count)
+    recipe_ids = list(Recipe.objects.values_list('id', flat=True))
+    for index in range(BENCHMARK_FANS):
+        fan, _ = User.objects.get_or_create(
+            email=f'fan-{index}@foodgram.local',
+            defaults={
+                'username': f'fan-{index}',
+                'first_name': 'Fan',
+                'last_name': 'Fan'
+            }
+        )
+        for model in (RecipeFavorite, ShoppingCart):
+            model.objects.bulk_create(
+                [
+                    model(author=fan, recipe_id=recipe_id)
+                    for recipe_id in random.sample(
+                        recipe_ids, len(recipe_ids) // 10
+                    )
+                ],
+                ignore_conflicts=True
+            )
+
+
+@register('popular')
+def popular(sizes: Sequence[int], repeat: int) -> List[BenchmarkResult]:
+    """Самые популярные рецепты: подсчет связей против таблицы оценок."""
+    results = []
+    for size in sizes:
+        make_recipes(size)
+        make_fans(size)
+        RecipePopularity.objects.refresh(full=True)
+
+        def count():
+            return list(Recipe.objects.annotate(
+                score=Count('recipe_favorite', distinct=True)
+                * POPULARITY_FAVORITE_WEIGHT
+                + Count('shopping_cart', distinct=True)
+                * POPULARITY_CART_WEIGHT
+            ).order_by('-score', '-id').values_list('id', flat=True)[:10])
+
+        def table():
+            return list(Recipe.objects.filter(
+                id__in=[
+                    entry['recipe_id'] for entry in
+                    RecipePopularity.objects.get_ranking()[:10]
+                ]
+            ).order_by('popularity__rank').values_list(
+                'id', flat=True
+            ))
+
+        results.append(BenchmarkResult(
+            f'{size} рецептов',
+            measure(count, repeat),
+            measure(table, repeat)
+        ))
+
+        def refresh(full: bool):
+            def run():
+                Recipe.objects.filter(
+                    id__in=Recipe.objects.values('id')[:size // 100]
+                ).update(favorites_count=F('favorites_count') + 1)
+                return RecipePopularity.objects.refresh(full=full)
+            return run
+
+        results.append(BenchmarkResult(
+            f'пересчет {size}, изменен 1%',
+            measure(refresh(True), repeat),
+            measure(refresh(False), repeat)
+        ))
+    return results
+
+
+@register('similar')
+def similar(sizes: Sequence[int], repeat: int) -> List[BenchmarkResult]:
+    """Похожие рецепты: сравнение со всеми рецептами против индекса LSH."""
+    results = []
+    minhash = MinHash()
+    for size in sizes:
+        make_recipes(size)
+        RecipeSimilarityBucket.objects.build()
+        recipe = Recipe.objects.order_by('id').first()
+
+        def pairwise():
+            buckets = RecipeSimilarityBucket.objects
+            ingredient_sets = buckets.get_ingredient_sets(
+                Recipe.objects.values_list('id', flat=True)
+            )
+            ingredients = ingredient_sets.pop(recipe.id)
+            return sorted(
+                (
+                    (recipe_id, get_jaccard(ingredients, candidate))
+                    for recipe_id, candidate in ingredient_sets.items()
+                ),
+                key=lambda item: (-item[1], -item[0])
+            )[:10]
+
+        results.append(BenchmarkResult(
+            f'{size} рецептов',
+            measure(pairwise, repeat),
+            measure(
+                lambda: RecipeSimilarityBucket.objects.get_similar(
+                    recipe, 10
+                ),
+                repeat
+            )
+        ))
+
+    sets = list(RecipeSimilarityBucket.objects.get_ingredient_sets(
+        Recipe.objects.values_list('id', flat=True)[:BENCHMARK_SIGNATURES]
+    ).values())
+    results.append(BenchmarkResult(
+        f'сигнатуры {len(sets)} рецептов, Python против NumPy',
+        measure(lambda: minhash.get_signatures(sets, use_numpy=False), repeat),
+        measure(lambda: minhash.get_signatures(sets), repeat)
+    ))
+    return results
+
+
+@register('short_links')
+def short_links(sizes: Sequence[int], repeat: int) -> List[BenchmarkResult]:
+    """Переходы по популярным ссылкам: запрос к БД против кеша процесса."""
+    results = []
+    for size in sizes:
+        make_recipes(size)
+        codes = list(Recipe.objects.order_by('?').values_list(
+            'short_link', flat=True
+        )[:10])
+        codes = [codes[index % len(codes)] for index in range(
+            BENCHMARK_REDIRECTS
+        )]
+
+        def database():
+            return [
+                Recipe.objects.filter(short_link=code).values_list(
+                    'pk', flat=True
+                ).first()
+                for code in codes
+            ]
+
+        results.append(BenchmarkResult(
+            f'{BENCHMARK_REDIRECTS} переходов, {size} рецептов',
+            measure(database, repeat),
+            measure(
+                lambda: [resolve_short_link(code) for code in codes], repeat
+            )
+        ))
+        signed = [
+            sign_short_link(pk) for pk in Recipe.objects.filter(
+                short_link__in=codes
+            ).values_list('pk', flat=True)
+        ]
+        signed = [signed[index % len(signed)] for index in range(
+            BENCHMARK_REDIRECTS
+        )]
+        results.append(BenchmarkResult(
+            f'подписанные ссылки, {size} рецептов',
+            measure(database, repeat),
+            measure(
+                lambda: [resolve_short_link(code) for code in signed], repeat
+            )
+        ))
+    return results
+
+
+@register('shopping_list')
+def shopping_list(
+        sizes: Sequence[int], repeat: int
+) -> List[BenchmarkResult]:
+    """Список покупок: агрегат по корзинам против таблицы сумм."""
+    results = []
+    for size in sizes:
+        make_recipes(size)
+        make_fans(size)
+        ShoppingListItem.objects.rebuild()
+        user = User.objects.get(email='fan-0@foodgram.local')
+
+        def per_cart():
+            # Прежняя выгрузка: агрегат для каждой строки всех корзин
+            lists = [
+                list(RecipeIngredients.shopping_list.get_queryset(user))
+                for _ in ShoppingCart.objects.all()
+            ]
+            return ''.join(CSVExporter().render(lists[0]))
+
+        def export(queryset):
+            return lambda: ''.join(CSVExporter().render(queryset.iterator()))
+
+        results.append(BenchmarkResult(
+            f'{ShoppingCart.objects.count()} корзин, {size} рецептов',
+            measure(per_cart, repeat),
+            measure(export(
+                RecipeIngredients.shopping_list.get_queryset(user)
+            ), repeat)
+        ))
+        results.append(BenchmarkResult(
+            f'агрегат против таблицы, {size}',
+            measure(export(
+                RecipeIngredients.shopping_list.get_queryset(user)
+            ), repeat),
+            measure(export(
+                ShoppingListItem.objects.get_shopping_list(user)
+            ), repeat)
+        ))
+    return results
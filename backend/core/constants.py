@@ -9,6 +9,11 @@ TEMPLATE_MESSAGE_UNIQUE_ERROR = '{field_name} не должны повторят
 ### Готовые сообщения об ошибках ###
 REPEAT_ADDED_FAVORITE_ERROR = 'Нельзя повторно добавить рецепт в избранные.'
 REPEAT_ADDED_SHOPPING_CART_ERROR = 'Нельзя повторно добавить рецепт в корзину.'
+REPEAT_SUBSCRIPTION_ERROR = 'Нельзя повторно подписаться на пользователя'
+SELF_SUBSCRIPTION_ERROR = 'Невозможно подписаться на самого себя'
+NOT_IN_FAVORITE_ERROR = 'У вас нет данного рецепта в избранном.'
+NOT_IN_SHOPPING_CART_ERROR = 'У вас нет данного рецепта в корзине.'
+NOT_SUBSCRIBED_ERROR = 'У вас нет данного пользователя в подписчиках.'
 MIN_COOKING_TIME_ERROR = f'Время не может быть меньше {MIN_INTEGER_VALUE} минуты.'
 MAX_COOKING_TIME_ERROR = f'Время не может быть меньше {MAX_INTEGER_VALUE} минуты.'
 MIN_INGREDIENT_AMOUNT_ERROR = f'Количество должно быть равно {MIN_INTEGER_VALUE} или больше.'
@@ -16,6 +21,20 @@ MAX_INGREDIENT_AMOUNT_ERROR = f'Количество должно быть ра
 USER_EMAIL_ERROR = 'Данный электронный адрес уже используется.'
 USER_USERNAME_ERROR = 'Пользователь с таким ником уже существует.'
 SUPERUSER_STAFF_ERROR = 'Суперпользователь должен иметь is_staff=True.'
+UNKNOWN_FIELDS_ERROR = 'Неизвестные поля: {fields}.'
+CURSOR_ORDERING_ERROR = (
+    'Курсор не поддерживает поиск и сортировку, используйте page.'
+)
+UNKNOWN_EXPORT_FORMAT_ERROR = (
+    'Неизвестный формат. Доступные форматы: {formats}.'
+)
+SHOPPING_LIST_PDF_TIMEOUT_ERROR = (
+    'Не удалось подготовить PDF, попробуйте позже.'
+)
+
+# Ключи кеша
+# Последние RECIPES_LIMIT_MAX карточек рецептов автора для подписок
+AUTHOR_RECIPES_CACHE_KEY = 'author_recipes:{author_id}'
 
 ### Префиксы схем ###
 COOKBOOK = 'cookbook'
@@ -35,4 +54,61 @@ FRONTEND_DETAIL_URL = '/recipes/{pk}/'
 USER_AVATAR_PATH = 'users/'
 
 ### Прочие настройки ###
-MAX_LENGTH_SHORT_LINK = 6
\ No newline at end of file
+MAX_LENGTH_SHORT_LINK = 6
+SHORT_LINK_ALPHABET = (
+    '0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'
+)
+# Сколько раз генерируется короткая ссылка при совпадении с существующей
+SHORT_LINK_ATTEMPTS = 5
+# Подписанная ссылка: id рецепта в base62 и подпись HMAC этой длины.
+# Она всегда длиннее MAX_LENGTH_SHORT_LINK, поэтому не путается со старыми
+SHORT_LINK_SIGNATURE_LENGTH = 6
+SHORT_LINK_MAX_ID_LENGTH = 11
+SHORT_LINK_SALT = 'recipes.short_link'
+
+# Полнотекстовый поиск
+SEARCH_CONFIG = 'russian'
+# Вес названия относительно описания, как у весов A и B в ts_rank
+SEARCH_NAME_WEIGHT = 2.5
+
+# Нечеткий поиск ингредиентов
+# Порог похожести по триграммам, как pg_trgm.similarity_threshold
+INGREDIENT_SIMILARITY_THRESHOLD = 0.3
+INGREDIENT_SEARCH_LIMIT = 20
+
+# Популярность рецептов
+# Вклад одного добавления в избранное и в корзину в популярность
+POPULARITY_FAVORITE_WEIGHT = 2
+POPULARITY_CART_WEIGHT = 1
+POPULARITY_BATCH_SIZE = 1000
+
+# Похожие рецепты
+# Число хеш-функций MinHash и полос LSH: порог похожести около
+# (1 / SIMILARITY_BANDS) ** (SIMILARITY_BANDS / SIMILARITY_PERMUTATIONS),
+# для 20 полос по 3 строки - 0.37.
+# После изменения нужен build_similarity --full
+SIMILARITY_PERMUTATIONS = 60
+SIMILARITY_BANDS = 20
+SIMILARITY_SEED = 20241122
+# Сколько кандидатов из LSH проверяется точным коэффициентом Жаккара
+SIMILARITY_CANDIDATES = 200
+SIMILARITY_BATCH_SIZE = 5000
+SIMILAR_RECIPES_LIMIT = 6
+SIMILAR_RECIPES_LIMIT_MAX = 30
+
+# Пакетные действия с рецептами
+# Сколько рецептов можно передать в одном пакетном запросе
+BULK_RECIPES_LIMIT = 100
+# Результаты пакетного добавления и удаления по каждому id
+BULK_ADDED = 'added'
+BULK_ALREADY_ADDED = 'already_added'
+BULK_REMOVED = 'removed'
+BULK_NOT_ADDED = 'not_added'
+BULK_NOT_FOUND = 'not_found'
+
+# Список покупок
+# Сколько строк списка покупок читается из курсора за раз при выгрузке
+SHOPPING_LIST_CHUNK_SIZE = 2000
+SHOPPING_LIST_BATCH_SIZE = 1000
+SHOPPING_LIST_TITLE = 'Список покупок'
+SHOPPING_LIST_PDF_FONT_SIZE = 12
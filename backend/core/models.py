@@ -1,4 +1,7 @@
-from django.db import models
+from typing import Any, Iterable, List, Tuple
+
+from django.db import connections, models, transaction
+from django.db.models.functions import Greatest
 
 from core.utils import to_snake_case
 
@@ -14,3 +17,149 @@ class PrefixedDBModel(models.Model):
         table_name = to_snake_case(cls.__name__)
         prefix_name = cls.prefix_name
         cls.Meta.db_table = f'{prefix_name}_{table_name}'
+
+
+def shift_counter(field: str, delta: int) -> Greatest:
+    """Выражение для сдвига счетчика на delta, не опускающее его ниже нуля.
+
+    Записи, созданные в обход модели, счетчик не увеличивают; их удаление
+    не должно нарушать ограничение неотрицательности.
+    """
+    return Greatest(models.F(field) + delta, 0)
+
+
+class CounterFieldsMixin:
+    """Защита счетчиков от перезаписи при сохранении модели целиком.
+
+    Счетчики меняются только атомарными UPDATE, поэтому save() без
+    update_fields не пишет в БД их устаревшие значения из памяти.
+    """
+
+    counter_fields: Tuple[str, ...] = ()
+
+    def save(self, *args, **kwargs) -> None:
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.counter_fields
+            ]
+        super().save(*args, **kwargs)
+
+
+class ToggleQuerySet(models.QuerySet):
+    """Записи-переключатели: избранное, корзина, подписки.
+
+    Запись включается INSERT ... ON CONFLICT DO NOTHING и выключается
+    DELETE, а о результате говорит RETURNING этих команд. Повтор
+    отсекает уникальное ограничение модели, поэтому предварительный
+    SELECT не нужен. Прочие ограничения, например CHECK, по-прежнему
+    вызывают IntegrityError.
+
+    Модель должна определять update_related(delta): перенос добавления
+    (delta=1) или удаления (delta=-1) записи в счетчики и производные
+    таблицы. Он выполняется в той же транзакции, что и запись.
+    """
+
+    def insert_ignoring_conflicts(
+            self, instances: Iterable[models.Model], returning: str
+    ) -> List[Any]:
+        """Вставляет записи INSERT ... ON CONFLICT DO NOTHING.
+
+        Возвращает значения поля returning только реально вставленных
+        записей: их сообщает RETURNING той же команды, поэтому
+        параллельные запросы не учтут одну запись дважды.
+        """
+        instances = list(instances)
+        if not instances:
+            return []
+        fields = [
+            field for field in self.model._meta.concrete_fields
+            if not field.primary_key
+        ]
+        connection = connections[self.db]
+        quote_name = connection.ops.quote_name
+        row = '({})'.format(', '.join(['%s'] * len(fields)))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'INSERT INTO {table} ({columns}) VALUES {rows} '
+                'ON CONFLICT DO NOTHING RETURNING {returning}'.format(
+                    table=quote_name(self.model._meta.db_table),
+                    columns=', '.join(
+                        quote_name(field.column) for field in fields
+                    ),
+                    rows=', '.join([row] * len(instances)),
+                    returning=quote_name(
+                        self.model._meta.get_field(returning).column
+                    )
+                ),
+                [
+                    field.get_db_prep_save(
+                        field.pre_save(instance, True), connection
+                    )
+                    for instance in instances
+                    for field in fields
+                ]
+            )
+            return [value for value, in cursor.fetchall()]
+
+    def delete_returning(self, returning: str, **values) -> List[Any]:
+        """Удаляет записи с полями values одной командой DELETE.
+
+        values - значения полей по attname, например author_id; набор
+        значений (list, set, tuple) дает условие IN. Возвращает значения
+        поля returning удаленных записей по RETURNING.
+        """
+        connection = connections[self.db]
+        quote_name = connection.ops.quote_name
+        conditions, params = [], []
+        for name, value in values.items():
+            field = self.model._meta.get_field(name)
+            if isinstance(value, (list, set, tuple)):
+                if not value:
+                    return []
+                conditions.append('{} IN ({})'.format(
+                    quote_name(field.column), ', '.join(['%s'] * len(value))
+                ))
+                params.extend(
+                    field.get_db_prep_value(item, connection)
+                    for item in value
+                )
+            else:
+                conditions.append(f'{quote_name(field.column)} = %s')
+                params.append(field.get_db_prep_value(value, connection))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'DELETE FROM {table} WHERE {conditions} '
+                'RETURNING {returning}'.format(
+                    table=quote_name(self.model._meta.db_table),
+                    conditions=' AND '.join(conditions),
+                    returning=quote_name(
+                        self.model._meta.get_field(returning).column
+                    )
+                ),
+                params
+            )
+            return [value for value, in cursor.fetchall()]
+
+    def add_one(self, **values) -> bool:
+        """Добавляет запись, если ее нет; True, если запись добавлена."""
+        instance = self.model(**values)
+        with transaction.atomic(using=self.db):
+            if not self.insert_ignoring_conflicts(
+                [instance], self.model._meta.pk.name
+            ):
+                return False
+            instance.update_related(1)
+        return True
+
+    def remove_one(self, **values) -> bool:
+        """Удаляет запись с полями values; True, если она была.
+
+        values - значения полей по attname, например author_id.
+        """
+        with transaction.atomic(using=self.db):
+            if not self.delete_returning(self.model._meta.pk.name, **values):
+                return False
+            self.model(**values).update_related(-1)
+        return True
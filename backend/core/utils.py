@@ -1,13 +1,89 @@
 from re import sub as re_sub
-from uuid import uuid4
+from secrets import choice
+from typing import Optional
 
-from core.constants import MAX_LENGTH_SHORT_LINK
+from django.conf import settings
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+from core.constants import (
+    MAX_LENGTH_SHORT_LINK,
+    SHORT_LINK_ALPHABET,
+    SHORT_LINK_MAX_ID_LENGTH,
+    SHORT_LINK_SALT,
+    SHORT_LINK_SIGNATURE_LENGTH
+)
 
 
 def generate_short_link() -> str:
-    """Генерирует короткую уникальную ссылку на основе UUID4."""
+    """Генерирует случайную короткую ссылку из букв и цифр.
+
+    Уникальность проверяет индекс БД: при совпадении рецепт сохраняется
+    с новой ссылкой.
+    """
+
+    return ''.join(
+        choice(SHORT_LINK_ALPHABET) for _ in range(MAX_LENGTH_SHORT_LINK)
+    )
+
+
+def encode_base62(number: int, length: int = 1) -> str:
+    """Записывает неотрицательное число в base62 не короче length знаков."""
+    digits = []
+    while number or len(digits) < length:
+        number, digit = divmod(number, len(SHORT_LINK_ALPHABET))
+        digits.append(SHORT_LINK_ALPHABET[digit])
+    return ''.join(reversed(digits))
+
+
+def decode_base62(text: str) -> int:
+    """Читает число, записанное в base62."""
+    number = 0
+    for char in text:
+        number = number * len(SHORT_LINK_ALPHABET) + (
+            SHORT_LINK_ALPHABET.index(char)
+        )
+    return number
+
+
+def get_short_link_signature(pk: int, secret: Optional[str] = None) -> str:
+    """Подпись HMAC id рецепта в base62 под SECRET_KEY."""
+    digest = salted_hmac(
+        SHORT_LINK_SALT, str(pk), secret=secret, algorithm='sha256'
+    ).digest()
+    return encode_base62(
+        int.from_bytes(digest, 'big')
+        % len(SHORT_LINK_ALPHABET) ** SHORT_LINK_SIGNATURE_LENGTH,
+        SHORT_LINK_SIGNATURE_LENGTH
+    )
+
+
+def sign_short_link(pk: int) -> str:
+    """Подписанная короткая ссылка, из которой id читается без БД."""
+    return encode_base62(pk) + get_short_link_signature(pk)
+
+
+def unsign_short_link(short_link: str) -> Optional[int]:
+    """Id рецепта из подписанной ссылки или None при неверной подписи.
+
+    Подпись проверяется и старыми ключами из SECRET_KEY_FALLBACKS, чтобы
+    смена ключа не ломала разосланные ссылки.
+    """
+    encoded_pk = short_link[:-SHORT_LINK_SIGNATURE_LENGTH]
+    signature = short_link[-SHORT_LINK_SIGNATURE_LENGTH:]
+    if not encoded_pk or len(encoded_pk) > SHORT_LINK_MAX_ID_LENGTH or not (
+        set(short_link) <= set(SHORT_LINK_ALPHABET)
+    ):
+        return None
 
-    return uuid4().hex[:MAX_LENGTH_SHORT_LINK]
+    pk = decode_base62(encoded_pk)
+    if encode_base62(pk) != encoded_pk:
+        return None
+    for secret in (settings.SECRET_KEY, *settings.SECRET_KEY_FALLBACKS):
+        if constant_time_compare(
+            signature, get_short_link_signature(pk, secret)
+        ):
+            return pk
+    return None
 
 
 def to_snake_case(text: str) -> str:
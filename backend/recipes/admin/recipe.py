@@ -5,6 +5,7 @@ from django.utils.html import format_html
 from recipes.models.recipe import Recipe
 from recipes.models.recipe_favorite import RecipeFavorite
 from recipes.models.recipe_ingredients import RecipeIngredients
+from recipes.models.shopping_list_item import ShoppingListItem
 
 
 class RecipeIngredientInline(admin.TabularInline):
@@ -26,6 +27,7 @@ class RecipeAdmin(admin.ModelAdmin):
         'author_link',
         'pub_date',
         'favorites_count',
+        'in_carts_count',
     )
     # Поля для поиска
     search_fields = (
@@ -36,7 +38,9 @@ class RecipeAdmin(admin.ModelAdmin):
         'author__last_name'
     )
     autocomplete_fields = ('author',)
-    readonly_fields = ('short_link', 'pub_date')
+    readonly_fields = (
+        'short_link', 'pub_date', 'favorites_count', 'in_carts_count'
+    )
     ordering = ('-pub_date',)
 
     # Группировка полей в форме редактирования
@@ -45,7 +49,9 @@ class RecipeAdmin(admin.ModelAdmin):
             'fields': ('name', 'author', 'image', 'text', 'cooking_time')
         }),
         ('Дополнительно', {
-            'fields': ('short_link', 'pub_date'),
+            'fields': (
+                'short_link', 'pub_date', 'favorites_count', 'in_carts_count'
+            ),
             'classes': ('collapse',)
         }),
     )
@@ -65,12 +71,15 @@ class RecipeAdmin(admin.ModelAdmin):
     author_link.short_description = 'Автор'
     author_link.admin_order_field = 'author'
 
-    def favorites_count(self, obj):
-        """Количество добавлений рецепта в избранное."""
-        return obj.favorites.count()
-
-    favorites_count.short_description = 'В избранном'
-    favorites_count.admin_order_field = 'favorites_count'
+    def save_related(self, request, form, formsets, change):
+        """Сохраняет ингредиенты, обновляя кеш карточки и списки покупок."""
+        if not change:
+            return super().save_related(request, form, formsets, change)
+        recipe = form.instance
+        old_amounts = ShoppingListItem.objects.get_recipe_amounts(recipe.id)
+        super().save_related(request, form, formsets, change)
+        ShoppingListItem.objects.update_recipe(recipe.id, old_amounts)
+        recipe.touch()
 
     def get_queryset(self, request):
         """Оптимизация запросов с помощью select_related и annotate."""
@@ -1,6 +1,40 @@
 from django.apps import AppConfig
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.db.models.signals import (
+    post_delete,
+    post_migrate,
+    post_save,
+    pre_delete
+)
+
+from recipes.search import get_search_backend
+
+
+def repair_search(sender: AppConfig, using: str, **kwargs) -> None:
+    """Восстанавливает синхронизацию поискового индекса после миграций."""
+    connection = connections[using]
+    get_search_backend(connection).repair(
+        connection, sender.get_model('Recipe')._meta.db_table
+    )
 
 
 class RecipesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'recipes'
+
+    def ready(self) -> None:
+        from recipes.signals import (
+            delete_recipe_marks,
+            forget_author_recipes,
+            subtract_from_author,
+            subtract_from_shopping_lists
+        )
+
+        recipe = self.get_model('Recipe')
+        post_migrate.connect(repair_search, sender=self)
+        pre_delete.connect(subtract_from_author, sender=recipe)
+        pre_delete.connect(subtract_from_shopping_lists, sender=recipe)
+        pre_delete.connect(delete_recipe_marks, sender=get_user_model())
+        post_save.connect(forget_author_recipes, sender=recipe)
+        post_delete.connect(forget_author_recipes, sender=recipe)
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.1 on 2026-10-17 06:27
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+# Модель со счетчиком, поле счетчика, модель связи и ее поле
+COUNTERS = (
+    ('recipes.Recipe', 'favorites_count', 'recipes.RecipeFavorite', 'recipe'),
+    ('recipes.Recipe', 'in_carts_count', 'recipes.ShoppingCart', 'recipe'),
+    ('users.User', 'recipes_count', 'recipes.Recipe', 'author'),
+    ('users.User', 'followers_count', 'users.Subscription', 'author_recipe'),
+)
+
+
+def fill_counters(apps, schema_editor):
+    """Заполняет счетчики по существующим записям."""
+    for model_label, field, relation_label, relation_field in COUNTERS:
+        relations = apps.get_model(relation_label).objects.filter(
+            **{relation_field: OuterRef('pk')}
+        ).order_by().values(relation_field).annotate(
+            count=Count('pk')
+        ).values('count')
+        apps.get_model(model_label).objects.update(
+            **{field: Coalesce(Subquery(relations), 0)}
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0005_ingredient_updated_at_recipe_updated_at'),
+        ('users', '0004_user_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='favorites_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='В избранном'),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='in_carts_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='В корзинах'),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
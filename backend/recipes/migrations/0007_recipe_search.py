@@ -0,0 +1,77 @@
+from django.db import migrations
+
+# SQL заморожен здесь, чтобы миграция не зависела от будущих изменений
+# recipes.search; прочие СУБД ищут подстрокой без индекса
+INSERT_SQL = (
+    'INSERT INTO "{table}_search" (rowid, name, text) '
+    'VALUES (new.id, new.name, new.text);'
+)
+DELETE_SQL = (
+    'INSERT INTO "{table}_search" ("{table}_search", rowid, name, text) '
+    "VALUES ('delete', old.id, old.name, old.text);"
+)
+INSTALL_SQL = {
+    'postgresql': (
+        'ALTER TABLE "{table}" ADD COLUMN IF NOT EXISTS "search_vector" '
+        'tsvector GENERATED ALWAYS AS ('
+        "setweight(to_tsvector('russian', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('russian', coalesce(text, '')), 'B')) "
+        'STORED',
+        'CREATE INDEX IF NOT EXISTS "{table}_search_vector_idx" '
+        'ON "{table}" USING gin ("search_vector")',
+    ),
+    'sqlite': (
+        'CREATE VIRTUAL TABLE IF NOT EXISTS "{table}_search" USING '
+        "fts5(name, text, content='{table}', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')",
+        'CREATE TRIGGER IF NOT EXISTS "{table}_search_insert" '
+        f'AFTER INSERT ON "{{table}}" BEGIN {INSERT_SQL} END',
+        'CREATE TRIGGER IF NOT EXISTS "{table}_search_delete" '
+        f'AFTER DELETE ON "{{table}}" BEGIN {DELETE_SQL} END',
+        'CREATE TRIGGER IF NOT EXISTS "{table}_search_update" '
+        'AFTER UPDATE OF name, text ON "{table}" '
+        f'BEGIN {DELETE_SQL} {INSERT_SQL} END',
+        'INSERT INTO "{table}_search" ("{table}_search") '
+        "VALUES ('rebuild')",
+    ),
+}
+UNINSTALL_SQL = {
+    'postgresql': (
+        'DROP INDEX IF EXISTS "{table}_search_vector_idx"',
+        'ALTER TABLE "{table}" DROP COLUMN IF EXISTS "search_vector"',
+    ),
+    'sqlite': (
+        'DROP TRIGGER IF EXISTS "{table}_search_insert"',
+        'DROP TRIGGER IF EXISTS "{table}_search_delete"',
+        'DROP TRIGGER IF EXISTS "{table}_search_update"',
+        'DROP TABLE IF EXISTS "{table}_search"',
+    ),
+}
+
+
+def execute_for_vendor(apps, schema_editor, statements):
+    """Выполняет команды СУБД соединения для таблицы рецептов."""
+    table = apps.get_model('recipes', 'Recipe')._meta.db_table
+    for statement in statements.get(schema_editor.connection.vendor, ()):
+        schema_editor.execute(statement.format(table=table))
+
+
+def install_search(apps, schema_editor):
+    """Создает полнотекстовый индекс рецептов."""
+    execute_for_vendor(apps, schema_editor, INSTALL_SQL)
+
+
+def uninstall_search(apps, schema_editor):
+    """Удаляет полнотекстовый индекс рецептов."""
+    execute_for_vendor(apps, schema_editor, UNINSTALL_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0006_recipe_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search, uninstall_search),
+    ]
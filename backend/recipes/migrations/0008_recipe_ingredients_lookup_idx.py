@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2026-10-17 07:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0007_recipe_search'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='recipeingredients',
+            index=models.Index(fields=['ingredient', 'recipe'], name='recipe_ingredients_lookup_idx'),
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.2.1 on 2026-10-17 07:21
+
+import django.db.models.deletion
+from math import log10
+
+from django.conf import settings
+from django.db import migrations, models
+
+# Веса на момент миграции; формула заморожена здесь, чтобы миграция не
+# зависела от будущих изменений recipes.models.recipe_popularity
+FAVORITE_WEIGHT = 2
+CART_WEIGHT = 1
+
+
+def get_popularity_score(favorites_count, in_carts_count, pub_date):
+    """Популярность рецепта по его счетчикам и дате публикации."""
+    points = favorites_count * FAVORITE_WEIGHT + in_carts_count * CART_WEIGHT
+    if not settings.POPULARITY_RECENCY_HOURS:
+        return float(points)
+    return log10(1 + points) + (
+        pub_date.timestamp() / 3600 / settings.POPULARITY_RECENCY_HOURS
+    )
+
+
+def fill_popularity(apps, schema_editor):
+    """Рассчитывает популярность существующих рецептов."""
+    popularity = apps.get_model('recipes', 'RecipePopularity')
+    popularity.objects.bulk_create(
+        [
+            popularity(
+                recipe_id=recipe_id,
+                favorites_count=favorites,
+                in_carts_count=carts,
+                score=get_popularity_score(favorites, carts, pub_date)
+            )
+            for recipe_id, favorites, carts, pub_date in apps.get_model(
+                'recipes', 'Recipe'
+            ).objects.values_list(
+                'id', 'favorites_count', 'in_carts_count', 'pub_date'
+            )
+        ],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0008_recipe_ingredients_lookup_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecipePopularity',
+            fields=[
+                ('recipe', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='popularity', serialize=False, to='recipes.recipe', verbose_name='Рецепт')),
+                ('favorites_count', models.PositiveIntegerField(verbose_name='В избранном при пересчете')),
+                ('in_carts_count', models.PositiveIntegerField(verbose_name='В корзинах при пересчете')),
+                ('score', models.FloatField(verbose_name='Популярность')),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True, verbose_name='Дата пересчета')),
+            ],
+            options={
+                'verbose_name': 'популярность рецепта',
+                'verbose_name_plural': 'Популярность рецептов',
+                'db_table': 'cookbook_recipe_popularity',
+                'abstract': False,
+                'indexes': [models.Index(fields=['-score', '-recipe'], name='recipe_popularity_rank_idx')],
+            },
+        ),
+        migrations.RunPython(fill_popularity, migrations.RunPython.noop),
+    ]
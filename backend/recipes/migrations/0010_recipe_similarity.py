@@ -0,0 +1,84 @@
+# Generated by Django 5.2.1 on 2026-10-17 07:31
+
+import django.db.models.deletion
+from collections import defaultdict
+from hashlib import blake2b
+from random import Random
+from struct import pack
+
+from django.db import migrations, models
+
+# Параметры MinHash на момент миграции; код заморожен здесь, чтобы
+# миграция не зависела от будущих изменений recipes.similarity
+PERMUTATIONS = 60
+BANDS = 20
+SEED = 20241122
+PRIME = 2 ** 31 - 1
+BUCKET_BYTES = 7
+
+
+def get_buckets(ids, coefficients):
+    """Хеши полос LSH MinHash-сигнатуры набора id."""
+    signature = [
+        min((a * x + b) % PRIME for x in ids) for a, b in coefficients
+    ]
+    rows = PERMUTATIONS // BANDS
+    return [
+        int.from_bytes(blake2b(
+            pack(f'<{rows}I', *signature[band * rows:(band + 1) * rows]),
+            digest_size=BUCKET_BYTES
+        ).digest(), 'little')
+        for band in range(BANDS)
+    ]
+
+
+def fill_similarity(apps, schema_editor):
+    """Строит индекс похожих рецептов по существующим ингредиентам."""
+    bucket_model = apps.get_model('recipes', 'RecipeSimilarityBucket')
+    ingredient_sets = defaultdict(set)
+    for recipe_id, ingredient_id in apps.get_model(
+        'recipes', 'RecipeIngredients'
+    ).objects.values_list('recipe_id', 'ingredient_id'):
+        ingredient_sets[recipe_id].add(ingredient_id)
+
+    random = Random(SEED)
+    a = [random.randrange(1, PRIME) for _ in range(PERMUTATIONS)]
+    b = [random.randrange(0, PRIME) for _ in range(PERMUTATIONS)]
+    coefficients = list(zip(a, b))
+    bucket_model.objects.bulk_create(
+        [
+            bucket_model(recipe_id=recipe_id, band=band, bucket=bucket)
+            for recipe_id, ids in ingredient_sets.items()
+            for band, bucket in enumerate(get_buckets(ids, coefficients))
+        ],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0009_recipe_popularity'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecipeSimilarityBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band', models.PositiveSmallIntegerField(verbose_name='Номер полосы')),
+                ('bucket', models.BigIntegerField(verbose_name='Хеш полосы')),
+                ('recipe', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='recipes.recipe', verbose_name='Рецепт')),
+            ],
+            options={
+                'verbose_name': 'полоса сигнатуры рецепта',
+                'verbose_name_plural': 'Индекс похожих рецептов',
+                'db_table': 'cookbook_recipe_similarity_bucket',
+                'abstract': False,
+                'default_related_name': 'similarity_buckets',
+                'indexes': [models.Index(fields=['band', 'bucket', 'recipe'], name='recipe_similarity_bucket_idx')],
+                'constraints': [models.UniqueConstraint(fields=('recipe', 'band'), name='unique_recipe_similarity_band')],
+            },
+        ),
+        migrations.RunPython(fill_similarity, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.1 on 2026-10-17 07:46
+
+import core.utils
+from secrets import choice
+
+from django.db import migrations, models
+from django.db.models import Count
+
+# Алфавит и длина ссылки на момент миграции; генератор заморожен здесь,
+# чтобы миграция не зависела от будущих изменений core.utils
+ALPHABET = '0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'
+LENGTH = 6
+
+
+def generate_short_link():
+    """Случайная короткая ссылка из букв и цифр."""
+    return ''.join(choice(ALPHABET) for _ in range(LENGTH))
+
+
+def deduplicate_short_links(apps, schema_editor):
+    """Выдает новые ссылки рецептам, чьи ссылки совпали с чужими."""
+    recipe_model = apps.get_model('recipes', 'Recipe')
+    taken = set(recipe_model.objects.values_list('short_link', flat=True))
+    kept = set()
+    duplicates = recipe_model.objects.values('short_link').annotate(
+        count=Count('id')
+    ).filter(count__gt=1).values_list('short_link', flat=True)
+    for recipe in recipe_model.objects.filter(
+        short_link__in=list(duplicates)
+    ).order_by('short_link', 'id'):
+        if recipe.short_link not in kept:
+            kept.add(recipe.short_link)
+            continue
+        short_link = generate_short_link()
+        while short_link in taken:
+            short_link = generate_short_link()
+        taken.add(short_link)
+        recipe_model.objects.filter(pk=recipe.pk).update(
+            short_link=short_link
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0010_recipe_similarity'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            deduplicate_short_links, migrations.RunPython.noop
+        ),
+        migrations.AlterField(
+            model_name='recipe',
+            name='short_link',
+            field=models.CharField(default=core.utils.generate_short_link, max_length=6, unique=True, verbose_name='Короткая ссылка'),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.1 on 2026-10-17 08:22
+
+import django.db.models.deletion
+import recipes.models.fields
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fill_shopping_lists(apps, schema_editor):
+    """Собирает списки покупок по существующим корзинам."""
+    item = apps.get_model('recipes', 'ShoppingListItem')
+    item.objects.bulk_create(
+        [
+            item(**total)
+            for total in apps.get_model(
+                'recipes', 'RecipeIngredients'
+            ).objects.filter(
+                recipe__shopping_cart__isnull=False
+            ).values(
+                'ingredient_id',
+                author_id=models.F('recipe__shopping_cart__author')
+            ).annotate(total_amount=models.Sum('amount')).order_by()
+        ],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0011_recipe_short_link_unique'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ShoppingListItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_amount', models.PositiveIntegerField(default=0, verbose_name='Количество')),
+                ('author', recipes.models.fields.UserForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL, verbose_name='Владелец списка покупок')),
+                ('ingredient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='recipes.ingredient', verbose_name='Ингредиент')),
+            ],
+            options={
+                'verbose_name': 'ингредиент списка покупок',
+                'verbose_name_plural': 'Списки покупок',
+                'db_table': 'cookbook_shopping_list_item',
+                'abstract': False,
+                'default_related_name': 'shopping_list_items',
+                'constraints': [models.UniqueConstraint(fields=('author', 'ingredient'), name='unique_shopping_list_item')],
+            },
+        ),
+        migrations.RunPython(fill_shopping_lists, migrations.RunPython.noop),
+    ]
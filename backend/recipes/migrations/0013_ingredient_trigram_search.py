@@ -0,0 +1,43 @@
+from django.db import migrations
+
+# SQL заморожен здесь, чтобы миграция не зависела от будущих изменений
+# recipes.search; индекс нужен только PostgreSQL, прочие СУБД ищут по
+# триграммам каталога в памяти
+INSTALL_SQL = (
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'CREATE INDEX IF NOT EXISTS "{table}_name_trgm_idx" '
+    'ON "{table}" USING gin (name gin_trgm_ops)',
+)
+UNINSTALL_SQL = (
+    'DROP INDEX IF EXISTS "{table}_name_trgm_idx"',
+)
+
+
+def execute_for_postgresql(apps, schema_editor, statements):
+    """Выполняет команды для таблицы ингредиентов в PostgreSQL."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    table = apps.get_model('recipes', 'Ingredient')._meta.db_table
+    for statement in statements:
+        schema_editor.execute(statement.format(table=table))
+
+
+def install_trigram_search(apps, schema_editor):
+    """Создает индекс триграмм названий ингредиентов."""
+    execute_for_postgresql(apps, schema_editor, INSTALL_SQL)
+
+
+def uninstall_trigram_search(apps, schema_editor):
+    """Удаляет индекс триграмм названий ингредиентов."""
+    execute_for_postgresql(apps, schema_editor, UNINSTALL_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0012_shopping_list_item'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_trigram_search, uninstall_trigram_search),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.1 on 2026-10-17 09:55
+
+from django.db import migrations, models
+
+
+def number_popularity(apps, schema_editor):
+    """Нумерует места рецептов, уже попавших в рейтинг."""
+    quote_name = schema_editor.quote_name
+    schema_editor.execute(
+        'UPDATE {table} SET {rank} = ranked.position FROM ('
+        'SELECT {recipe}, ROW_NUMBER() OVER ('
+        'ORDER BY {score} DESC, {recipe} DESC'
+        ') AS position FROM {table}'
+        ') AS ranked WHERE {table}.{recipe} = ranked.{recipe}'.format(
+            table=quote_name(
+                apps.get_model('recipes', 'RecipePopularity')._meta.db_table
+            ),
+            rank=quote_name('rank'),
+            recipe=quote_name('recipe_id'),
+            score=quote_name('score')
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0013_ingredient_trigram_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipepopularity',
+            name='rank',
+            field=models.PositiveIntegerField(db_index=True, null=True, verbose_name='Место в рейтинге'),
+        ),
+        migrations.RunPython(number_popularity, migrations.RunPython.noop),
+    ]
@@ -4,7 +4,10 @@ from recipes.models.ingredient import Ingredient
 from recipes.models.recipe import Recipe
 from recipes.models.recipe_favorite import RecipeFavorite
 from recipes.models.recipe_ingredients import RecipeIngredients
+from recipes.models.recipe_popularity import RecipePopularity
+from recipes.models.recipe_similarity import RecipeSimilarityBucket
 from recipes.models.shopping_cart import ShoppingCart
+from recipes.models.shopping_list_item import ShoppingListItem
 
 __all__ = [
     'CookbookBaseModel',
@@ -12,6 +15,9 @@ __all__ = [
     'Recipe',
     'RecipeFavorite',
     'RecipeIngredients',
+    'RecipePopularity',
+    'RecipeSimilarityBucket',
     'ShoppingCart',
+    'ShoppingListItem',
     'UserForeignKey'
 ]
\ No newline at end of file
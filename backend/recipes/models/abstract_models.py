@@ -1,6 +1,11 @@
+from collections import defaultdict
+from typing import Iterable, Set
+
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count
 
+from core.models import ToggleQuerySet, shift_counter
 from recipes.models.base_models import CookbookBaseModel
 from recipes.models.fields import UserForeignKey
 from recipes.models.recipe import Recipe
@@ -8,6 +13,57 @@ from recipes.models.recipe import Recipe
 User = get_user_model()
 
 
+class BaseActionRecipeQuerySet(ToggleQuerySet):
+    """QuerySet записей пользователя о рецептах: избранного, корзины."""
+
+    def add(self, author_id: int, recipe_ids: Iterable[int]) -> Set[int]:
+        """Добавляет рецепты пользователю, возвращает id добавленных.
+
+        Записи вставляются одним INSERT с пропуском конфликтов, счетчики
+        сдвигаются одним UPDATE только для рецептов из его RETURNING.
+        """
+        with transaction.atomic():
+            added = set(self.insert_ignoring_conflicts(
+                [
+                    self.model(author_id=author_id, recipe_id=recipe_id)
+                    for recipe_id in set(recipe_ids)
+                ],
+                'recipe_id'
+            ))
+            self.model.update_recipe_counters(added, 1)
+        return added
+
+    def remove(self, author_id: int, recipe_ids: Iterable[int]) -> Set[int]:
+        """Удаляет рецепты у пользователя, возвращает id удаленных.
+
+        Удаленные рецепты берутся из RETURNING того же DELETE.
+        """
+        with transaction.atomic():
+            removed = set(self.delete_returning(
+                'recipe_id', author_id=author_id, recipe_id=set(recipe_ids)
+            ))
+            self.model.update_recipe_counters(removed, -1)
+        return removed
+
+    def delete(self):
+        """Удаляет записи выборки, уменьшая счетчики их рецептов.
+
+        Вызывается при удалении пользователя и для массового удаления в
+        админке. Записи не загружаются: счетчики уменьшаются одним UPDATE
+        на каждое встречающееся число удаляемых записей рецепта.
+        """
+        with transaction.atomic(using=self.db):
+            recipe_ids = defaultdict(list)
+            for row in self.order_by().values('recipe_id').annotate(
+                count=Count('pk')
+            ):
+                recipe_ids[row['count']].append(row['recipe_id'])
+            deleted = super().delete()
+            for count, ids in recipe_ids.items():
+                self.model.update_recipe_counters(ids, -count)
+        return deleted
+
+
 class BaseActionRecipeModel(CookbookBaseModel):
     """Заготовка для моделей, связанных с добавлением рецептов."""
 
@@ -16,5 +72,44 @@ class BaseActionRecipeModel(CookbookBaseModel):
         to=Recipe, verbose_name='Рецепт', on_delete=models.CASCADE
     )
 
+    # Поле-счетчик рецепта, которое поддерживают записи модели
+    recipe_counter: str
+
+    objects = BaseActionRecipeQuerySet.as_manager()
+
     class Meta(CookbookBaseModel.Meta):
-        abstract = True
\ No newline at end of file
+        abstract = True
+
+    @classmethod
+    def update_recipe_counters(
+            cls, recipe_ids: Iterable[int], delta: int
+    ) -> None:
+        """Изменяет счетчики рецептов на delta."""
+        recipe_ids = list(recipe_ids)
+        if recipe_ids:
+            Recipe.objects.filter(pk__in=recipe_ids).update(**{
+                cls.recipe_counter: shift_counter(cls.recipe_counter, delta)
+            })
+
+    def update_recipe_counter(self, delta: int) -> None:
+        """Изменяет счетчик рецепта на delta."""
+        self.update_recipe_counters([self.recipe_id], delta)
+
+    def update_related(self, delta: int) -> None:
+        """Переносит добавление (1) или удаление (-1) записи в счетчик."""
+        self.update_recipe_counter(delta)
+
+    def save(self, *args, **kwargs) -> None:
+        """Сохраняет запись и увеличивает счетчик рецепта при создании."""
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding:
+                self.update_related(1)
+
+    def delete(self, *args, **kwargs):
+        """Удаляет запись и уменьшает счетчик рецепта."""
+        with transaction.atomic():
+            deleted = super().delete(*args, **kwargs)
+            self.update_related(-1)
+            return deleted
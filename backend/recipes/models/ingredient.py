@@ -16,11 +16,26 @@ class Ingredient(CookbookBaseModel):
         verbose_name='Единицы измерений',
         max_length=LENGTH_CHARFIELD_64
     )
+    updated_at = models.DateTimeField(
+        verbose_name='Дата изменения', auto_now=True
+    )
 
     class Meta(CookbookBaseModel.Meta):
         verbose_name = 'ингредиент'
         verbose_name_plural = 'Ингредиенты'
         ordering = ['name']
 
+    def save(self, *args, **kwargs) -> None:
+        """Сохраняет ингредиент и сбрасывает кеш рецептов с ним."""
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        if not adding:
+            self.recipes.touch()
+
+    def delete(self, *args, **kwargs):
+        """Сбрасывает кеш рецептов с ингредиентом перед его удалением."""
+        self.recipes.touch()
+        return super().delete(*args, **kwargs)
+
     def __str__(self) -> str:
         return f'{self.name.capitalize()} - {self.measurement_unit}.'
\ No newline at end of file
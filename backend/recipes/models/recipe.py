@@ -1,9 +1,12 @@
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models.functions import RowNumber
 from django.utils.timezone import now
 
 from core.constants import (
+    AUTHOR_RECIPES_CACHE_KEY,
     FRONTEND_DETAIL_URL,
     LENGTH_CHARFIELD_256,
     MAX_COOKING_TIME_ERROR,
@@ -11,17 +14,43 @@ from core.constants import (
     MAX_LENGTH_SHORT_LINK,
     MIN_COOKING_TIME_ERROR,
     MIN_INTEGER_VALUE,
-    RECIPE_IMAGE_PATH
+    RECIPE_IMAGE_PATH,
+    SHORT_LINK_ATTEMPTS
 )
-from core.utils import generate_short_link
+from core.models import CounterFieldsMixin, shift_counter
+from core.utils import generate_short_link, sign_short_link
 from recipes.models.base_models import CookbookBaseModel
 from recipes.models.fields import UserForeignKey
 from recipes.models.ingredient import Ingredient
+from users.models import FeedEntry
 
 User = get_user_model()
 
 
-class Recipe(CookbookBaseModel):
+class RecipeQuerySet(models.QuerySet):
+    """QuerySet рецептов."""
+
+    def touch(self) -> int:
+        """Повышает версию рецептов после изменения их отображения."""
+        return self.update(version=models.F('version') + 1, updated_at=now())
+
+    def latest_per_author(self, limit: int) -> 'RecipeQuerySet':
+        """Не более limit последних рецептов каждого автора.
+
+        Рецепты нумеруются ROW_NUMBER() в окне по автору, поэтому для
+        любого числа авторов выборка остается одним запросом. Прочие
+        фильтры применяются до нумерации.
+        """
+        return self.annotate(
+            author_rank=models.Window(
+                RowNumber(),
+                partition_by=models.F('author_id'),
+                order_by=models.F('id').desc()
+            )
+        ).filter(author_rank__lte=limit).order_by('-id')
+
+
+class Recipe(CounterFieldsMixin, CookbookBaseModel):
     """Модель рецептов."""
 
     author = UserForeignKey(verbose_name='Автор рецепта')
@@ -54,12 +83,28 @@ class Recipe(CookbookBaseModel):
     )
     short_link = models.CharField(
         verbose_name='Короткая ссылка', default=generate_short_link,
-        max_length=MAX_LENGTH_SHORT_LINK
+        max_length=MAX_LENGTH_SHORT_LINK, unique=True
     )
     pub_date = models.DateTimeField(
         verbose_name='Дата публикации',
         default=now, editable=False
     )
+    updated_at = models.DateTimeField(
+        verbose_name='Дата изменения', auto_now=True
+    )
+    version = models.PositiveIntegerField(
+        verbose_name='Версия', default=1, editable=False
+    )
+    favorites_count = models.PositiveIntegerField(
+        verbose_name='В избранном', default=0, editable=False
+    )
+    in_carts_count = models.PositiveIntegerField(
+        verbose_name='В корзинах', default=0, editable=False
+    )
+
+    objects = RecipeQuerySet.as_manager()
+
+    counter_fields = ('version', 'favorites_count', 'in_carts_count')
 
     class Meta(CookbookBaseModel.Meta):
         default_related_name = 'recipes'
@@ -71,4 +116,53 @@ class Recipe(CookbookBaseModel):
         return f'[{self.id}] {self.name}'
 
     def get_frontend_absolute_url(self) -> str:
-        return FRONTEND_DETAIL_URL.format(pk=self.pk)
\ No newline at end of file
+        return FRONTEND_DETAIL_URL.format(pk=self.pk)
+
+    def get_signed_short_link(self) -> str:
+        """Код короткой ссылки, который проверяется без обращения к БД."""
+        return sign_short_link(self.pk)
+
+    def update_author_counter(self, delta: int) -> None:
+        """Изменяет счетчик рецептов автора на delta."""
+        User.objects.filter(pk=self.author_id).update(
+            recipes_count=shift_counter('recipes_count', delta)
+        )
+
+    def forget_author_recipes(self) -> None:
+        """Сбрасывает последние рецепты автора в кеше после коммита.
+
+        Вызывается сигналами post_save и post_delete, поэтому покрывает
+        и удаление рецептов QuerySet или каскадом.
+        """
+        key = AUTHOR_RECIPES_CACHE_KEY.format(author_id=self.author_id)
+        transaction.on_commit(lambda: cache.delete(key))
+
+    def save(self, *args, **kwargs) -> None:
+        """Сохраняет рецепт, при создании обновляя счетчик автора и ленты."""
+        adding = self._state.adding
+        with transaction.atomic():
+            if adding:
+                self.insert(*args, **kwargs)
+                self.update_author_counter(1)
+                FeedEntry.objects.fan_out(self)
+            else:
+                super().save(*args, **kwargs)
+
+    def insert(self, *args, **kwargs) -> None:
+        """Вставляет новый рецепт, заменяя занятую короткую ссылку."""
+        for _ in range(SHORT_LINK_ATTEMPTS - 1):
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                if not Recipe.objects.filter(
+                    short_link=self.short_link
+                ).exists():
+                    raise
+            self.short_link = generate_short_link()
+        super().save(*args, **kwargs)
+
+    def touch(self) -> None:
+        """Повышает версию рецепта после изменения его данных."""
+        Recipe.objects.filter(pk=self.pk).touch()
+        self.refresh_from_db(fields=('version', 'updated_at'))
\ No newline at end of file
@@ -1,3 +1,5 @@
+from typing import Iterable
+
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 
@@ -31,6 +33,30 @@ class RecipeIngredientsQuerySet(models.QuerySet):
             measurement_unit=models.F('ingredient__measurement_unit')
         )
 
+    def get_recipes_with_all(
+            self, ingredient_ids: Iterable[int]
+    ) -> 'RecipeIngredientsQuerySet':
+        """Id рецептов, в которых есть все указанные ингредиенты.
+
+        Пересечение строится одним проходом по индексу (ingredient,
+        recipe) с группировкой по рецепту, а не соединением на каждый
+        ингредиент, поэтому цена зависит только от числа найденных связей.
+        """
+        ingredient_ids = set(ingredient_ids)
+        return self.filter(
+            ingredient_id__in=ingredient_ids
+        ).order_by().values('recipe_id').annotate(
+            found=models.Count('ingredient_id', distinct=True)
+        ).filter(found=len(ingredient_ids)).values('recipe_id')
+
+    def get_recipes_with_any(
+            self, ingredient_ids: Iterable[int]
+    ) -> 'RecipeIngredientsQuerySet':
+        """Id рецептов, в которых есть хотя бы один из ингредиентов."""
+        return self.filter(
+            ingredient_id__in=set(ingredient_ids)
+        ).order_by().values('recipe_id')
+
 
 class ShopCartListManager(models.Manager):
     """
@@ -87,6 +113,12 @@ class RecipeIngredients(CookbookBaseModel):
         default_related_name = 'recipe_ingredients'
         verbose_name = 'ингредиент рецепта'
         verbose_name_plural = 'Связь ингредиентов с рецептами'
+        indexes = [
+            models.Index(
+                fields=('ingredient', 'recipe'),
+                name='recipe_ingredients_lookup_idx'
+            )
+        ]
 
     def __str__(self):
         return f'Рецепт #{self.recipe.id} - Ингредиент #{self.ingredient.id}'
@@ -0,0 +1,172 @@
+from datetime import datetime
+from math import log10
+
+from django.conf import settings
+from django.db import connections, models, transaction
+
+from core.constants import (
+    POPULARITY_BATCH_SIZE,
+    POPULARITY_CART_WEIGHT,
+    POPULARITY_FAVORITE_WEIGHT
+)
+from recipes.models.base_models import CookbookBaseModel
+from recipes.models.recipe import Recipe
+
+
+def get_popularity_score(
+        favorites_count: int, in_carts_count: int, pub_date: datetime
+) -> float:
+    """Популярность рецепта по его счетчикам и дате публикации.
+
+    С учетом новизны популярность логарифмическая: рецепт, опубликованный
+    на POPULARITY_RECENCY_HOURS часов позже, стоит в десять раз больше
+    добавлений. Оценка зависит только от данных рецепта, а не от текущего
+    времени, поэтому пересчитывать нужно только изменившиеся рецепты.
+    """
+    points = (
+        favorites_count * POPULARITY_FAVORITE_WEIGHT
+        + in_carts_count * POPULARITY_CART_WEIGHT
+    )
+    if not settings.POPULARITY_RECENCY_HOURS:
+        return float(points)
+    return log10(1 + points) + (
+        pub_date.timestamp() / 3600 / settings.POPULARITY_RECENCY_HOURS
+    )
+
+
+class RecipePopularityQuerySet(models.QuerySet):
+    """QuerySet таблицы популярности рецептов."""
+
+    def get_stale_recipes(self, full: bool = False) -> models.QuerySet:
+        """Рецепты без оценки или со счетчиками, изменившимися с пересчета."""
+        recipes = Recipe.objects.all()
+        if not full:
+            recipes = recipes.filter(
+                models.Q(popularity__isnull=True)
+                | ~models.Q(popularity__favorites_count=models.F(
+                    'favorites_count'
+                ))
+                | ~models.Q(popularity__in_carts_count=models.F(
+                    'in_carts_count'
+                ))
+            )
+        return recipes.values_list(
+            'id', 'favorites_count', 'in_carts_count', 'pub_date'
+        ).order_by('id')
+
+    def refresh(self, full: bool = False) -> int:
+        """Пересчитывает оценки устаревших рецептов, возвращает их число.
+
+        Оценки считаются по денормализованным счетчикам рецептов, без
+        подсчета избранного и корзин. Рецепты читаются пачками по id, а
+        оценки записываются через upsert, после чего места в рейтинге
+        нумеруются заново.
+        """
+        stale = self.get_stale_recipes(full)
+        refreshed = last_id = 0
+        with transaction.atomic():
+            while batch := list(
+                stale.filter(id__gt=last_id)[:POPULARITY_BATCH_SIZE]
+            ):
+                self.save_batch([
+                    self.model(
+                        recipe_id=recipe_id,
+                        favorites_count=favorites,
+                        in_carts_count=carts,
+                        score=get_popularity_score(favorites, carts, pub_date)
+                    )
+                    for recipe_id, favorites, carts, pub_date in batch
+                ])
+                refreshed += len(batch)
+                last_id = batch[-1][0]
+            if refreshed:
+                self.renumber()
+        return refreshed
+
+    def renumber(self) -> None:
+        """Записывает места рецептов в рейтинге.
+
+        Места нумеруются ROW_NUMBER() по убыванию оценки одной командой
+        UPDATE, перезаписываются только сдвинувшиеся строки. Место
+        уникально, поэтому курсор рейтинга листает по нему без OFFSET.
+        """
+        connection = connections[self.db]
+        quote_name = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'UPDATE {table} SET {rank} = ranked.position FROM ('
+                'SELECT {recipe}, ROW_NUMBER() OVER ('
+                'ORDER BY {score} DESC, {recipe} DESC'
+                ') AS position FROM {table}'
+                ') AS ranked WHERE {table}.{recipe} = ranked.{recipe} '
+                'AND {table}.{rank} IS DISTINCT FROM ranked.position'.format(
+                    table=quote_name(self.model._meta.db_table),
+                    rank=quote_name('rank'),
+                    recipe=quote_name('recipe_id'),
+                    score=quote_name('score')
+                )
+            )
+
+    def save_batch(self, batch: list) -> None:
+        """Вставляет или обновляет пачку оценок."""
+        self.bulk_create(
+            batch,
+            update_conflicts=True,
+            unique_fields=('recipe',),
+            update_fields=(
+                'favorites_count', 'in_carts_count', 'score', 'updated_at'
+            )
+        )
+
+    def get_ranking(self) -> models.QuerySet:
+        """Id рецептов в поле recipe_id от популярных к непопулярным."""
+        return self.values('recipe_id', 'rank').order_by('rank')
+
+    def get_version(self) -> tuple:
+        """Версия рейтинга для условных запросов."""
+        return tuple(self.aggregate(
+            count=models.Count('recipe_id'),
+            refreshed_at=models.Max('updated_at')
+        ).values())
+
+
+class RecipePopularity(CookbookBaseModel):
+    """Предрассчитанная популярность рецептов.
+
+    Таблица заполняется командой refresh_popularity, которую нужно
+    запускать по расписанию. Рецепты, созданные после последнего
+    пересчета, в рейтинг не попадают до следующего запуска.
+    """
+
+    recipe = models.OneToOneField(
+        to=Recipe, verbose_name='Рецепт', primary_key=True,
+        on_delete=models.CASCADE, related_name='popularity'
+    )
+    favorites_count = models.PositiveIntegerField(
+        verbose_name='В избранном при пересчете'
+    )
+    in_carts_count = models.PositiveIntegerField(
+        verbose_name='В корзинах при пересчете'
+    )
+    score = models.FloatField(verbose_name='Популярность')
+    rank = models.PositiveIntegerField(
+        verbose_name='Место в рейтинге', null=True, db_index=True
+    )
+    updated_at = models.DateTimeField(
+        verbose_name='Дата пересчета', auto_now=True, db_index=True
+    )
+
+    objects = RecipePopularityQuerySet.as_manager()
+
+    class Meta(CookbookBaseModel.Meta):
+        verbose_name = 'популярность рецепта'
+        verbose_name_plural = 'Популярность рецептов'
+        indexes = [
+            models.Index(
+                fields=('-score', '-recipe'),
+                name='recipe_popularity_rank_idx'
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f'Рецепт #{self.recipe_id}: {self.score}'
@@ -0,0 +1,152 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set, Tuple
+
+from django.db import models, transaction
+
+from core.constants import SIMILARITY_BATCH_SIZE, SIMILARITY_CANDIDATES
+from recipes.models.base_models import CookbookBaseModel
+from recipes.models.recipe import Recipe
+from recipes.models.recipe_ingredients import RecipeIngredients
+from recipes.similarity import MinHash, get_jaccard
+
+
+class RecipeSimilarityQuerySet(models.QuerySet):
+    """QuerySet индекса LSH похожих рецептов."""
+
+    def get_ingredient_sets(
+            self, recipe_ids: Iterable[int]
+    ) -> Dict[int, Set[int]]:
+        """Наборы id ингредиентов рецептов одним запросом."""
+        ingredient_sets = defaultdict(set)
+        for recipe_id, ingredient_id in RecipeIngredients.objects.filter(
+            recipe_id__in=list(recipe_ids)
+        ).values_list('recipe_id', 'ingredient_id'):
+            ingredient_sets[recipe_id].add(ingredient_id)
+        return ingredient_sets
+
+    def index(self, ingredient_sets: Dict[int, Set[int]]) -> int:
+        """Заменяет полосы рецептов по их наборам ингредиентов.
+
+        Рецепты без ингредиентов из индекса удаляются. Возвращает число
+        проиндексированных рецептов.
+        """
+        minhash = MinHash()
+        ingredient_sets = {
+            recipe_id: ids for recipe_id, ids in ingredient_sets.items()
+            if ids
+        }
+        signatures = minhash.get_signatures(list(ingredient_sets.values()))
+        with transaction.atomic():
+            self.filter(recipe_id__in=list(ingredient_sets)).delete()
+            self.bulk_create([
+                self.model(recipe_id=recipe_id, band=band, bucket=bucket)
+                for recipe_id, signature in zip(ingredient_sets, signatures)
+                for band, bucket in enumerate(minhash.get_buckets(signature))
+            ])
+        return len(ingredient_sets)
+
+    def index_recipe(self, recipe: Recipe) -> None:
+        """Обновляет полосы рецепта после изменения ингредиентов."""
+        ingredient_sets = self.get_ingredient_sets([recipe.id])
+        if not ingredient_sets:
+            self.filter(recipe=recipe).delete()
+            return
+        self.index(ingredient_sets)
+
+    def build(self, full: bool = False) -> int:
+        """Индексирует рецепты пачками по id, возвращает их число.
+
+        По умолчанию индексируются только рецепты, которых нет в индексе.
+        """
+        recipes = Recipe.objects.all()
+        if not full:
+            recipes = recipes.filter(similarity_buckets__isnull=True)
+        recipe_ids = recipes.values_list('id', flat=True).order_by('id')
+        indexed = last_id = 0
+        while batch := list(
+            recipe_ids.filter(id__gt=last_id)[:SIMILARITY_BATCH_SIZE]
+        ):
+            indexed += self.index(self.get_ingredient_sets(batch))
+            last_id = batch[-1]
+        return indexed
+
+    def get_candidates(self, recipe: Recipe, buckets: List[int]) -> List[int]:
+        """Id рецептов с общими полосами, по убыванию их числа."""
+        same_bucket = models.Q()
+        for band, bucket in enumerate(buckets):
+            same_bucket |= models.Q(band=band, bucket=bucket)
+        return list(self.filter(same_bucket).exclude(
+            recipe_id=recipe.id
+        ).values('recipe_id').annotate(
+            bands=models.Count('band')
+        ).order_by('-bands', '-recipe_id').values_list(
+            'recipe_id', flat=True
+        )[:SIMILARITY_CANDIDATES])
+
+    def get_similar(
+            self, recipe: Recipe, limit: int
+    ) -> List[Tuple[int, float]]:
+        """Похожие рецепты с коэффициентом Жаккара, от самых похожих.
+
+        Кандидаты находятся по индексу полос, а порядок считается по
+        точному коэффициенту Жаккара только для них. Если рецепта еще
+        нет в индексе, его полосы считаются на лету.
+        """
+        ingredients = self.get_ingredient_sets([recipe.id])[recipe.id]
+        if not ingredients:
+            return []
+        buckets = list(self.filter(recipe=recipe).order_by(
+            'band'
+        ).values_list('bucket', flat=True))
+        if not buckets:
+            minhash = MinHash()
+            buckets = minhash.get_buckets(
+                minhash.get_signatures([ingredients])[0]
+            )
+
+        candidates = self.get_ingredient_sets(
+            self.get_candidates(recipe, buckets)
+        )
+        return sorted(
+            (
+                (recipe_id, get_jaccard(ingredients, candidate))
+                for recipe_id, candidate in candidates.items()
+            ),
+            key=lambda item: (-item[1], -item[0])
+        )[:limit]
+
+
+class RecipeSimilarityBucket(CookbookBaseModel):
+    """Полоса MinHash-сигнатуры рецепта в индексе LSH.
+
+    Индекс строится командой build_similarity и обновляется при
+    сохранении ингредиентов рецепта через API.
+    """
+
+    recipe = models.ForeignKey(
+        to=Recipe, verbose_name='Рецепт', on_delete=models.CASCADE
+    )
+    band = models.PositiveSmallIntegerField(verbose_name='Номер полосы')
+    bucket = models.BigIntegerField(verbose_name='Хеш полосы')
+
+    objects = RecipeSimilarityQuerySet.as_manager()
+
+    class Meta(CookbookBaseModel.Meta):
+        default_related_name = 'similarity_buckets'
+        verbose_name = 'полоса сигнатуры рецепта'
+        verbose_name_plural = 'Индекс похожих рецептов'
+        constraints = [
+            models.UniqueConstraint(
+                fields=('recipe', 'band'),
+                name='unique_recipe_similarity_band'
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=('band', 'bucket', 'recipe'),
+                name='recipe_similarity_bucket_idx'
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f'Рецепт #{self.recipe_id}: полоса {self.band}'
@@ -1,11 +1,53 @@
+from collections import defaultdict
+from typing import Iterable, Set
+
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, transaction
 
-from recipes.models.abstract_models import BaseActionRecipeModel
+from recipes.models.abstract_models import (
+    BaseActionRecipeModel,
+    BaseActionRecipeQuerySet
+)
+from recipes.models.shopping_list_item import ShoppingListItem
 
 User = get_user_model()
 
 
+class ShoppingCartQuerySet(BaseActionRecipeQuerySet):
+    """QuerySet корзин покупок."""
+
+    def add(self, author_id: int, recipe_ids: Iterable[int]) -> Set[int]:
+        """Добавляет рецепты в корзину и в список покупок пользователя."""
+        with transaction.atomic():
+            added = super().add(author_id, recipe_ids)
+            ShoppingListItem.objects.shift_recipes([author_id], added, 1)
+        return added
+
+    def remove(self, author_id: int, recipe_ids: Iterable[int]) -> Set[int]:
+        """Удаляет рецепты из корзины и из списка покупок пользователя."""
+        with transaction.atomic():
+            removed = super().remove(author_id, recipe_ids)
+            ShoppingListItem.objects.shift_recipes([author_id], removed, -1)
+        return removed
+
+    def delete(self):
+        """Удаляет записи корзин, вычитая их рецепты из списков покупок.
+
+        Вызывается при удалении пользователя и для массового удаления
+        корзин в админке, каскадное удаление вместе с рецептом учитывает
+        сигнал pre_delete рецепта.
+        """
+        authors = defaultdict(list)
+        for author_id, recipe_id in self.values_list('author_id', 'recipe_id'):
+            authors[recipe_id].append(author_id)
+        with transaction.atomic():
+            for recipe_id, author_ids in authors.items():
+                ShoppingListItem.objects.shift_recipes(
+                    author_ids, [recipe_id], -1
+                )
+            return super().delete()
+
+
 class ShoppingCart(BaseActionRecipeModel):
     """
     Модель для хранения рецептов в корзине покупок пользователя.
@@ -16,6 +58,10 @@ class ShoppingCart(BaseActionRecipeModel):
     - created_at (DateTime): дата добавления
     """
 
+    recipe_counter = 'in_carts_count'
+
+    objects = ShoppingCartQuerySet.as_manager()
+
     class Meta(BaseActionRecipeModel.Meta):
         """Мета-класс с настройками модели."""
 
@@ -32,6 +78,13 @@ class ShoppingCart(BaseActionRecipeModel):
         verbose_name = 'рецепт к покупке'
         verbose_name_plural = 'Корзина покупок'
 
+    def update_related(self, delta: int) -> None:
+        """Переносит запись в счетчик рецепта и в список покупок."""
+        super().update_related(delta)
+        ShoppingListItem.objects.shift_recipes(
+            [self.author_id], [self.recipe_id], delta
+        )
+
     def __str__(self) -> str:
         """Строковое представление объекта для админки и отладки."""
         return f'Рецепт #{self.recipe.id}'
\ No newline at end of file
@@ -0,0 +1,170 @@
+from itertools import islice
+from typing import Dict, Iterable
+
+from django.db import models, transaction
+
+from core.constants import SHOPPING_LIST_BATCH_SIZE
+from core.models import shift_counter
+from recipes.models.base_models import CookbookBaseModel
+from recipes.models.fields import UserForeignKey
+from recipes.models.ingredient import Ingredient
+from recipes.models.recipe_ingredients import RecipeIngredients
+from users.models.user import User
+
+
+class ShoppingListItemQuerySet(models.QuerySet):
+    """QuerySet списков покупок пользователей.
+
+    Суммы ингредиентов сдвигаются атомарными UPDATE в транзакции
+    изменения корзины или рецепта. Строки с нулевой суммой не удаляются,
+    чтобы параллельное добавление в корзину не потеряло свой сдвиг;
+    их убирает rebuild.
+    """
+
+    def get_recipe_amounts(self, recipe_id: int) -> Dict[int, int]:
+        """Количества ингредиентов рецепта по id ингредиента."""
+        return dict(RecipeIngredients.objects.filter(
+            recipe_id=recipe_id
+        ).values_list('ingredient_id', 'amount'))
+
+    def shift(
+            self, author_ids: Iterable[int], amounts: Dict[int, int]
+    ) -> None:
+        """Сдвигает суммы ингредиентов в списках пользователей.
+
+        Args:
+            author_ids: Id пользователей, чьи списки меняются
+            amounts: Сдвиг суммы по id ингредиента, может быть отрицательным
+        """
+        amounts = {
+            ingredient_id: amount for ingredient_id, amount in amounts.items()
+            if amount
+        }
+        author_ids = list(author_ids)
+        if not amounts or not author_ids:
+            return
+
+        self.bulk_create(
+            [
+                self.model(author_id=author_id, ingredient_id=ingredient_id)
+                for author_id in author_ids
+                for ingredient_id, amount in amounts.items() if amount > 0
+            ],
+            batch_size=SHOPPING_LIST_BATCH_SIZE,
+            ignore_conflicts=True
+        )
+        self.filter(
+            author_id__in=author_ids, ingredient_id__in=list(amounts)
+        ).update(total_amount=shift_counter('total_amount', models.Case(
+            *[
+                models.When(ingredient_id=ingredient_id, then=amount)
+                for ingredient_id, amount in amounts.items()
+            ],
+            default=0,
+            output_field=models.IntegerField()
+        )))
+
+    def shift_recipes(
+            self, author_ids: Iterable[int], recipe_ids: Iterable[int],
+            sign: int
+    ) -> None:
+        """Прибавляет (sign=1) или вычитает (sign=-1) рецепты из списков."""
+        recipe_ids = list(recipe_ids)
+        if not recipe_ids:
+            return
+        self.shift(author_ids, {
+            ingredient_id: sign * amount for ingredient_id, amount
+            in RecipeIngredients.objects.filter(
+                recipe_id__in=recipe_ids
+            ).values('ingredient_id').annotate(
+                total_amount=models.Sum('amount')
+            ).values_list('ingredient_id', 'total_amount').order_by()
+        })
+
+    def update_recipe(
+            self, recipe_id: int, old_amounts: Dict[int, int]
+    ) -> None:
+        """Переносит в списки изменение ингредиентов рецепта в корзинах.
+
+        Вызывается после записи новых ингредиентов, old_amounts -
+        количества, которые были у рецепта до изменения.
+        """
+        amounts = self.get_recipe_amounts(recipe_id)
+        self.shift(
+            User.objects.filter(
+                shopping_cart__recipe_id=recipe_id
+            ).values_list('id', flat=True),
+            {
+                ingredient_id: amounts.get(ingredient_id, 0)
+                - old_amounts.get(ingredient_id, 0)
+                for ingredient_id in amounts.keys() | old_amounts.keys()
+            }
+        )
+
+    def rebuild(self) -> int:
+        """Пересобирает все списки по корзинам, возвращает число строк."""
+        totals = RecipeIngredients.objects.filter(
+            recipe__shopping_cart__isnull=False
+        ).values(
+            'ingredient_id',
+            author_id=models.F('recipe__shopping_cart__author')
+        ).annotate(total_amount=models.Sum('amount')).order_by()
+        rebuilt = 0
+        with transaction.atomic():
+            self.all().delete()
+            totals = totals.iterator(chunk_size=SHOPPING_LIST_BATCH_SIZE)
+            while batch := [
+                self.model(**total)
+                for total in islice(totals, SHOPPING_LIST_BATCH_SIZE)
+            ]:
+                self.bulk_create(batch)
+                rebuilt += len(batch)
+        return rebuilt
+
+    def get_shopping_list(self, author: User) -> 'ShoppingListItemQuerySet':
+        """Список покупок пользователя в алфавитном порядке.
+
+        Поля совпадают с ShopCartListManager: name, measurement_unit и
+        total_amount.
+        """
+        return self.filter(author=author, total_amount__gt=0).values(
+            'total_amount',
+            name=models.F('ingredient__name'),
+            measurement_unit=models.F('ingredient__measurement_unit')
+        ).order_by('ingredient__name')
+
+
+class ShoppingListItem(CookbookBaseModel):
+    """Сумма ингредиента в корзине покупок пользователя.
+
+    Поддерживается при добавлении и удалении рецептов из корзины и при
+    изменении ингредиентов рецепта, поэтому список покупок читается
+    без соединения корзин с рецептами.
+    """
+
+    author = UserForeignKey(verbose_name='Владелец списка покупок')
+    ingredient = models.ForeignKey(
+        to=Ingredient, verbose_name='Ингредиент', on_delete=models.CASCADE
+    )
+    total_amount = models.PositiveIntegerField(
+        verbose_name='Количество', default=0
+    )
+
+    objects = ShoppingListItemQuerySet.as_manager()
+
+    class Meta(CookbookBaseModel.Meta):
+        default_related_name = 'shopping_list_items'
+        verbose_name = 'ингредиент списка покупок'
+        verbose_name_plural = 'Списки покупок'
+        constraints = [
+            models.UniqueConstraint(
+                fields=('author', 'ingredient'),
+                name='unique_shopping_list_item'
+            )
+        ]
+
+    def __str__(self) -> str:
+        return (
+            f'Пользователь #{self.author_id} - '
+            f'Ингредиент #{self.ingredient_id}'
+        )
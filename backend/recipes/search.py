@@ -0,0 +1,406 @@
+import re
+from collections import Counter, defaultdict
+from typing import Dict, FrozenSet, List, Sequence, Tuple, Type
+
+from django.db import connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.models import BooleanField, Case, FloatField, Q, Value, When
+from django.db.models.expressions import RawSQL
+from django.db.models.query import QuerySet
+
+from core.constants import (
+    INGREDIENT_SEARCH_LIMIT,
+    INGREDIENT_SIMILARITY_THRESHOLD,
+    SEARCH_CONFIG,
+    SEARCH_NAME_WEIGHT
+)
+
+WORD_PATTERN = re.compile(r'\w+')
+# Слова для триграмм, как в pg_trgm: буквы и цифры без подчеркивания
+TRIGRAM_WORD_PATTERN = re.compile(r'[^\W_]+')
+# Ранг совпадений по началу названия, выше любой похожести
+PREFIX_RANK = 2.0
+
+
+class SearchBackend:
+    """Поиск рецептов по названию и описанию без индекса.
+
+    Используется для СУБД без полнотекстового индекса: каждое слово
+    запроса ищется подстрокой, ранг у всех найденных рецептов одинаковый.
+    Наследники хранят индекс в БД и синхронизируют его при записи
+    рецептов средствами самой СУБД, поэтому индекс не расходится с
+    таблицей и при массовых операциях через QuerySet.
+    """
+
+    def install(self, connection: BaseDatabaseWrapper, table: str) -> None:
+        """Создает индекс для таблицы рецептов и заполняет его."""
+
+    def uninstall(self, connection: BaseDatabaseWrapper, table: str) -> None:
+        """Удаляет индекс таблицы рецептов."""
+
+    def repair(self, connection: BaseDatabaseWrapper, table: str) -> None:
+        """Восстанавливает синхронизацию индекса после миграций."""
+
+    def get_words(self, query: str) -> List[str]:
+        """Слова поискового запроса."""
+        return WORD_PATTERN.findall(query)
+
+    def get_empty(self, queryset: QuerySet) -> QuerySet:
+        """Пустая выдача для запроса без слов."""
+        return queryset.none().annotate(
+            search_rank=Value(0.0, output_field=FloatField())
+        )
+
+    def search(self, queryset: QuerySet, query: str) -> QuerySet:
+        """Рецепты, подходящие под запрос, с рангом search_rank."""
+        words = self.get_words(query)
+        if not words:
+            return self.get_empty(queryset)
+        for word in words:
+            queryset = queryset.filter(
+                Q(name__icontains=word) | Q(text__icontains=word)
+            )
+        return queryset.annotate(
+            search_rank=Value(0.0, output_field=FloatField())
+        )
+
+    def execute(
+            self, connection: BaseDatabaseWrapper, statements: List[str]
+    ) -> None:
+        """Выполняет DDL-запросы индекса."""
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+
+
+class PostgreSQLSearchBackend(SearchBackend):
+    """Поиск по вычисляемой колонке tsvector с GIN-индексом.
+
+    Колонка хранится в таблице рецептов и пересчитывается PostgreSQL при
+    любой записи названия или описания. Название входит в вектор с
+    весом A, описание - с весом B.
+    """
+
+    column = 'search_vector'
+
+    def install(self, connection: BaseDatabaseWrapper, table: str) -> None:
+        """Добавляет колонку tsvector и GIN-индекс по ней."""
+        self.execute(connection, [
+            f'ALTER TABLE "{table}" ADD COLUMN IF NOT EXISTS "{self.column}" '
+            f'tsvector GENERATED ALWAYS AS ('
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', "
+            f"coalesce(name, '')), 'A') || "
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', "
+            f"coalesce(text, '')), 'B')) STORED",
+            f'CREATE INDEX IF NOT EXISTS "{table}_{self.column}_idx" '
+            f'ON "{table}" USING gin ("{self.column}")',
+        ])
+
+    def uninstall(self, connection: BaseDatabaseWrapper, table: str) -> None:
+        """Удаляет GIN-индекс и колонку tsvector."""
+        self.execute(connection, [
+            f'DROP INDEX IF EXISTS "{table}_{self.column}_idx"',
+            f'ALTER TABLE "{table}" DROP COLUMN IF EXISTS "{self.column}"',
+        ])
+
+    def search(self, queryset: QuerySet, query: str) -> QuerySet:
+        """Рецепты, подходящие под запрос, с рангом ts_rank."""
+        if not self.get_words(query):
+            return self.get_empty(queryset)
+        column = f'"{queryset.model._meta.db_table}"."{self.column}"'
+        tsquery = f"websearch_to_tsquery('{SEARCH_CONFIG}', %s)"
+        return queryset.filter(
+            RawSQL(
+                f'{column} @@ {tsquery}', [query],
+                output_field=BooleanField()
+            )
+        ).annotate(
+            search_rank=RawSQL(
+                f'ts_rank({column}, {tsquery})', [query],
+                output_field=FloatField()
+            )
+        )
+
+
+class SQLiteSearchBackend(SearchBackend):
+    """Поиск по теневой таблице FTS5.
+
+    Таблица FTS5 хранит только индекс, а текст читает из таблицы
+    рецептов. Синхронизацию выполняют триггеры на вставку, изменение и
+    удаление рецептов. SQLite пересоздает таблицу при части миграций и
+    теряет ее триггеры, поэтому после миграций они восстанавливаются.
+    Слова запроса ищутся по префиксу, название весит больше описания.
+    """
+
+    def get_search_table(self, table: str) -> str:
+        """Имя теневой таблицы FTS5."""
+        return f'{table}_search'
+
+    def get_triggers(self, table: str) -> List[str]:
+        """Триггеры синхронизации теневой таблицы с таблицей рецептов."""
+        search_table = self.get_search_table(table)
+        insert = (
+            f'INSERT INTO "{search_table}" (rowid, name, text) '
+            f'VALUES (new.id, new.name, new.text);'
+        )
+        delete = (
+            f'INSERT INTO "{search_table}" ("{search_table}", rowid, name, '
+            f"text) VALUES ('delete', old.id, old.name, old.text);"
+        )
+        return [
+            f'CREATE TRIGGER IF NOT EXISTS "{search_table}_insert" '
+            f'AFTER INSERT ON "{table}" BEGIN {insert} END',
+            f'CREATE TRIGGER IF NOT EXISTS "{search_table}_delete" '
+            f'AFTER DELETE ON "{table}" BEGIN {delete} END',
+            f'CREATE TRIGGER IF NOT EXISTS "{search_table}_update" '
+            f'AFTER UPDATE OF name, text ON "{table}" '
+            f'BEGIN {delete} {insert} END',
+        ]
+
+    def install(self, connection: BaseDatabaseWrapper, table: str) -> None:
+        """Создает таблицу FTS5 и триггеры, индексирует рецепты."""
+        search_table = self.get_search_table(table)
+        self.execute(connection, [
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS "{search_table}" USING '
+            f"fts5(name, text, content='{table}', content_rowid='id', "
+            f"tokenize='unicode61 remove_diacritics 2')",
+            *self.get_triggers(table),
+            f'INSERT INTO "{search_table}" ("{search_table}") '
+            f"VALUES ('rebuild')",
+        ])
+
+    def uninstall(self, connection: BaseDatabaseWrapper, table: str) -> None:
+        """Удаляет триггеры и таблицу FTS5."""
+        search_table = self.get_search_table(table)
+        self.execute(connection, [
+            *(
+                f'DROP TRIGGER IF EXISTS "{search_table}_{event}"'
+                for event in ('insert', 'delete', 'update')
+            ),
+            f'DROP TABLE IF EXISTS "{search_table}"',
+        ])
+
+    def repair(self, connection: BaseDatabaseWrapper, table: str) -> None:
+        """Возвращает триггеры, потерянные при пересоздании таблицы."""
+        if self.get_search_table(table) in (
+            connection.introspection.table_names()
+        ):
+            self.execute(connection, self.get_triggers(table))
+
+    def search(self, queryset: QuerySet, query: str) -> QuerySet:
+        """Рецепты, подходящие под запрос, с рангом bm25."""
+        words = self.get_words(query)
+        if not words:
+            return self.get_empty(queryset)
+        table = queryset.model._meta.db_table
+        search_table = self.get_search_table(table)
+        match = ' '.join(f'"{word}"*' for word in words)
+        # Таблица FTS5 присоединяется один раз: MATCH выполняется одним
+        # проходом по индексу, а bm25 берется из той же строки
+        return queryset.extra(
+            select={
+                'search_rank':
+                    f'-bm25("{search_table}", {SEARCH_NAME_WEIGHT}, 1.0)'
+            },
+            tables=[search_table],
+            where=[
+                f'"{search_table}".rowid = "{table}"."id"',
+                f'"{search_table}" MATCH %s',
+            ],
+            params=[match]
+        )
+
+
+SEARCH_BACKENDS: Dict[str, Type[SearchBackend]] = {
+    'postgresql': PostgreSQLSearchBackend,
+    'sqlite': SQLiteSearchBackend,
+}
+
+
+def get_search_backend(connection: BaseDatabaseWrapper) -> SearchBackend:
+    """Поисковый бэкенд для СУБД соединения."""
+    return SEARCH_BACKENDS.get(connection.vendor, SearchBackend)()
+
+
+def get_trigrams(text: str) -> FrozenSet[str]:
+    """Триграммы текста по правилам pg_trgm.
+
+    Каждое слово приводится к нижнему регистру и дополняется двумя
+    пробелами в начале и одним в конце.
+    """
+    return frozenset(
+        padded[index:index + 3]
+        for word in TRIGRAM_WORD_PATTERN.findall(text.casefold())
+        for padded in (f'  {word} ',)
+        for index in range(len(padded) - 2)
+    )
+
+
+class TrigramIndex:
+    """Инвертированный индекс триграмм названий в памяти процесса.
+
+    Для каждой триграммы хранятся позиции названий, в которые она
+    входит, поэтому похожесть считается только для названий с общими
+    с запросом триграммами.
+    """
+
+    def __init__(self, names: Sequence[str]):
+        self.sizes: List[int] = []
+        postings = defaultdict(list)
+        for position, name in enumerate(names):
+            trigrams = get_trigrams(name)
+            self.sizes.append(len(trigrams))
+            for trigram in trigrams:
+                postings[trigram].append(position)
+        self.postings: Dict[str, List[int]] = dict(postings)
+
+    def get_similar(
+            self,
+            query: str,
+            threshold: float = INGREDIENT_SIMILARITY_THRESHOLD
+    ) -> List[Tuple[int, float]]:
+        """Позиции названий с похожестью не ниже threshold.
+
+        Похожесть - доля общих триграмм среди всех триграмм запроса и
+        названия, как similarity() в pg_trgm.
+        """
+        trigrams = get_trigrams(query)
+        shared = Counter()
+        for trigram in trigrams:
+            shared.update(self.postings.get(trigram, ()))
+        similar = []
+        for position, count in shared.items():
+            similarity = count / (
+                len(trigrams) + self.sizes[position] - count
+            )
+            if similarity >= threshold:
+                similar.append((position, similarity))
+        return similar
+
+
+def rank_positions(
+        prefix_positions: Sequence[int],
+        similar: Sequence[Tuple[int, float]],
+        limit: int = INGREDIENT_SEARCH_LIMIT
+) -> List[int]:
+    """Позиции выдачи: сначала совпадения по началу, затем похожие.
+
+    Совпадения по началу идут в порядке позиций, похожие - по убыванию
+    похожести, при равной похожести - в порядке позиций.
+    """
+    prefix = sorted(prefix_positions)[:limit]
+    seen = set(prefix)
+    return prefix + [
+        position for position, _ in sorted(
+            similar, key=lambda item: (-item[1], item[0])
+        )
+        if position not in seen
+    ][:limit - len(prefix)]
+
+
+class IngredientSearchBackend(SearchBackend):
+    """Нечеткий поиск ингредиентов без индекса в БД.
+
+    Индекс триграмм строится в памяти по названиям выборки при каждом
+    поиске, поэтому API ищет по каталогу процесса, где индекс строится
+    один раз на версию каталога. Наследники с in_database ищут
+    средствами СУБД.
+    """
+
+    in_database = False
+
+    def search(self, queryset: QuerySet, query: str) -> QuerySet:
+        """Не более INGREDIENT_SEARCH_LIMIT похожих ингредиентов.
+
+        Совпадения по началу названия получают ранг PREFIX_RANK и идут
+        первыми в порядке выборки, затем похожие названия по убыванию
+        похожести в ранге search_rank.
+        """
+        rows = list(queryset.values_list('id', 'name'))
+        folded = query.casefold()
+        prefix = [
+            position for position, (_, name) in enumerate(rows)
+            if name.casefold().startswith(folded)
+        ]
+        similar = TrigramIndex([name for _, name in rows]).get_similar(query)
+        positions = rank_positions(prefix, similar)
+        if not positions:
+            return self.get_empty(queryset)
+        ranks = dict(similar)
+        ranks.update((position, PREFIX_RANK) for position in prefix)
+        return queryset.filter(
+            id__in=[rows[position][0] for position in positions]
+        ).annotate(search_rank=Case(
+            *(
+                When(id=rows[position][0], then=Value(ranks[position]))
+                for position in positions
+            ),
+            output_field=FloatField()
+        )).order_by(Case(
+            *(
+                When(id=rows[position][0], then=order)
+                for order, position in enumerate(positions)
+            )
+        ))
+
+
+class PostgreSQLIngredientSearchBackend(IngredientSearchBackend):
+    """Нечеткий поиск ингредиентов по GIN-индексу pg_trgm.
+
+    Индекс обслуживает и ILIKE по началу названия, и оператор
+    похожести %. Порог оператора задает pg_trgm.similarity_threshold,
+    по умолчанию он равен INGREDIENT_SIMILARITY_THRESHOLD.
+    """
+
+    in_database = True
+
+    def get_index(self, table: str) -> str:
+        """Имя индекса триграмм."""
+        return f'{table}_name_trgm_idx'
+
+    def install(self, connection: BaseDatabaseWrapper, table: str) -> None:
+        """Подключает pg_trgm и создает GIN-индекс по названию."""
+        self.execute(connection, [
+            'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+            f'CREATE INDEX IF NOT EXISTS "{self.get_index(table)}" '
+            f'ON "{table}" USING gin (name gin_trgm_ops)',
+        ])
+
+    def uninstall(self, connection: BaseDatabaseWrapper, table: str) -> None:
+        """Удаляет GIN-индекс, расширение остается для других индексов."""
+        self.execute(connection, [
+            f'DROP INDEX IF EXISTS "{self.get_index(table)}"',
+        ])
+
+    def search(self, queryset: QuerySet, query: str) -> QuerySet:
+        """Не более INGREDIENT_SEARCH_LIMIT похожих ингредиентов."""
+        column = f'"{queryset.model._meta.db_table}"."name"'
+        pattern = connections[queryset.db].ops.prep_for_like_query(
+            query
+        ) + '%'
+        return queryset.filter(
+            RawSQL(
+                f'({column} ILIKE %s OR {column} %% %s)', [pattern, query],
+                output_field=BooleanField()
+            )
+        ).annotate(
+            search_rank=RawSQL(
+                f'CASE WHEN {column} ILIKE %s THEN {PREFIX_RANK} '
+                f'ELSE similarity({column}, %s) END', [pattern, query],
+                output_field=FloatField()
+            )
+        ).order_by('-search_rank', 'name')[:INGREDIENT_SEARCH_LIMIT]
+
+
+INGREDIENT_SEARCH_BACKENDS: Dict[str, Type[IngredientSearchBackend]] = {
+    'postgresql': PostgreSQLIngredientSearchBackend,
+}
+
+
+def get_ingredient_search_backend(
+        connection: BaseDatabaseWrapper
+) -> IngredientSearchBackend:
+    """Бэкенд нечеткого поиска ингредиентов для СУБД соединения."""
+    return INGREDIENT_SEARCH_BACKENDS.get(
+        connection.vendor, IngredientSearchBackend
+    )()
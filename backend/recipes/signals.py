@@ -0,0 +1,43 @@
+from django.db.models import Model
+
+from recipes.models import RecipeFavorite, ShoppingCart, ShoppingListItem
+
+
+def subtract_from_shopping_lists(
+        sender: type, instance: Model, **kwargs
+) -> None:
+    """Вычитает удаляемый рецепт из списков покупок владельцев корзин.
+
+    Срабатывает и при каскадном удалении рецептов вместе с автором, и
+    при массовом удалении QuerySet, которые не вызывают Recipe.delete.
+    Корзины удаляются каскадом после сигнала, а списки владельцев
+    удаляемых корзин пользователей удаляются вместе с ними.
+    """
+    ShoppingListItem.objects.shift_recipes(
+        instance.shopping_cart.values_list('author_id', flat=True),
+        [instance.pk], -1
+    )
+
+
+def subtract_from_author(sender: type, instance: Model, **kwargs) -> None:
+    """Уменьшает счетчик рецептов автора удаляемого рецепта.
+
+    Срабатывает и при массовом удалении QuerySet, и при каскадном
+    удалении рецептов вместе с автором.
+    """
+    instance.update_author_counter(-1)
+
+
+def delete_recipe_marks(sender: type, instance: Model, **kwargs) -> None:
+    """Удаляет избранное и корзину удаляемого пользователя.
+
+    QuerySet.delete уменьшает счетчики рецептов, которые при каскадном
+    удалении не меняются.
+    """
+    RecipeFavorite.objects.filter(author=instance).delete()
+    ShoppingCart.objects.filter(author=instance).delete()
+
+
+def forget_author_recipes(sender: type, instance: Model, **kwargs) -> None:
+    """Сбрасывает кеш последних рецептов автора сохраненного рецепта."""
+    instance.forget_author_recipes()
@@ -0,0 +1,99 @@
+from hashlib import blake2b
+from random import Random
+from struct import pack
+from typing import Iterable, List, Sequence
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from core.constants import (
+    SIMILARITY_BANDS,
+    SIMILARITY_PERMUTATIONS,
+    SIMILARITY_SEED
+)
+
+# Простое число Мерсенна для универсального хеширования (a * x + b) % p
+MINHASH_PRIME = 2 ** 31 - 1
+# Размер хеша полосы в байтах: помещается в BigIntegerField
+BUCKET_BYTES = 7
+
+
+class MinHash:
+    """MinHash-сигнатуры наборов ингредиентов и их полосы LSH.
+
+    Сигнатура - минимумы SIMILARITY_PERMUTATIONS хеш-функций по id
+    ингредиентов. Доля совпавших минимумов двух сигнатур оценивает
+    коэффициент Жаккара наборов. Сигнатура режется на SIMILARITY_BANDS
+    полос, и наборы с совпавшей хотя бы одной полосой считаются
+    кандидатами в похожие. С NumPy сигнатуры пачки наборов считаются
+    векторно, без него - в цикле; результат одинаковый.
+    """
+
+    def __init__(
+            self,
+            permutations: int = SIMILARITY_PERMUTATIONS,
+            bands: int = SIMILARITY_BANDS,
+            seed: int = SIMILARITY_SEED
+    ) -> None:
+        """Инициализация воспроизводимых хеш-функций."""
+        random = Random(seed)
+        self.rows = permutations // bands
+        self.bands = bands
+        self.a = [random.randrange(1, MINHASH_PRIME) for _ in range(
+            permutations
+        )]
+        self.b = [random.randrange(0, MINHASH_PRIME) for _ in range(
+            permutations
+        )]
+
+    def get_signatures(
+            self, sets: Sequence[Iterable[int]], use_numpy: bool = True
+    ) -> List[List[int]]:
+        """Сигнатуры непустых наборов id в их порядке."""
+        sets = [sorted(set(ids)) for ids in sets]
+        if numpy is not None and use_numpy:
+            return self.get_signatures_numpy(sets)
+        return [
+            [
+                min((a * x + b) % MINHASH_PRIME for x in ids)
+                for a, b in zip(self.a, self.b)
+            ]
+            for ids in sets
+        ]
+
+    def get_signatures_numpy(self, sets: List[List[int]]) -> List[List[int]]:
+        """Сигнатуры пачки наборов одним проходом по всем id."""
+        if not sets:
+            return []
+        ids = numpy.fromiter(
+            (x for ids in sets for x in ids), dtype=numpy.int64
+        )
+        starts = numpy.cumsum([0] + [len(ids) for ids in sets[:-1]])
+        # Произведение a * x меньше 2 ** 62 и помещается в int64
+        hashes = (
+            ids[:, None] * numpy.array(self.a, dtype=numpy.int64)
+            + numpy.array(self.b, dtype=numpy.int64)
+        ) % MINHASH_PRIME
+        return numpy.minimum.reduceat(hashes, starts, axis=0).tolist()
+
+    def get_buckets(self, signature: Sequence[int]) -> List[int]:
+        """Хеши полос сигнатуры по номеру полосы."""
+        return [
+            int.from_bytes(blake2b(
+                pack(
+                    f'<{self.rows}I',
+                    *signature[band * self.rows:(band + 1) * self.rows]
+                ),
+                digest_size=BUCKET_BYTES
+            ).digest(), 'little')
+            for band in range(self.bands)
+        ]
+
+
+def get_jaccard(first: set, second: set) -> float:
+    """Коэффициент Жаккара двух наборов."""
+    if not first and not second:
+        return 0.0
+    return len(first & second) / len(first | second)
@@ -1,7 +1,9 @@
 from http import HTTPStatus
 from typing import Any, Optional, Union
 
+from django.db import connection
 from django.db.models import Model
+from django.test.utils import CaptureQueriesContext
 from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 from rest_framework.response import Response
@@ -399,6 +401,43 @@ class BaseTest:
             'Убедитесь что работает пагинация.'
         )
 
+    def url_cursor_pagination_results(
+            self, client: APIClient, url: str, limit: int,
+            response_schema: dict[str, Any]
+    ) -> list:
+        """
+        Проходит все страницы курсорной пагинации.
+
+        Args:
+            client: API клиент
+            url: URL списка
+            limit: Размер страницы
+            response_schema: Ожидаемая схема ответа
+
+        Returns:
+            list: id объектов в порядке выдачи
+
+        Raises:
+            AssertionError: если курсорная пагинация не работает
+        """
+        separator = '&' if '?' in url else '?'
+        next_url = f'{url}{separator}cursor=&limit={limit}'
+        ids = []
+        while next_url:
+            response: Response = client.get(next_url)
+            self.url_get_resource(
+                response=response,
+                url=url,
+                response_schema=response_schema
+            )
+            data: dict = response.json()
+            assert len(data['results']) <= limit, (
+                'Убедитесь что работает курсорная пагинация.'
+            )
+            ids.extend(item['id'] for item in data['results'])
+            next_url = data['next']
+        return ids
+
     def url_filters_by_query_parameters(
             self, response: Response, model: Model, filters: dict[str, Any],
             limit: Optional[int] = None
@@ -448,4 +487,122 @@ class BaseTest:
         new_count_in_db = model.objects.count()
         assert count_in_db == new_count_in_db, (
             'Убедитесь, что данные в БД не изменились.'
-        )
\ No newline at end of file
+        )
+
+    def url_queries_not_depend_on_page_size(
+            self, client: APIClient, url: str, limits: tuple = (1, 10)
+    ):
+        """
+        Проверяет, что число запросов к БД не зависит от размера страницы.
+
+        Args:
+            client: API клиент
+            url: URL списка с пагинацией
+            limits: Значения параметра limit для сравнения
+
+        Raises:
+            AssertionError: если число запросов растет вместе со страницей
+        """
+        separator = '&' if '?' in url else '?'
+        queries_counts = []
+        for limit in limits:
+            with CaptureQueriesContext(connection) as queries:
+                response: Response = client.get(
+                    f'{url}{separator}limit={limit}'
+                )
+            assert response.status_code == HTTPStatus.OK, (
+                URL_OK_ERROR.format(url=url)
+            )
+            queries_counts.append(len(queries))
+        assert len(set(queries_counts)) == 1, (
+            f'Убедитесь, что число запросов к БД на `{url}` не зависит от '
+            f'размера страницы. Получено: {queries_counts}.'
+        )
+
+    def url_not_modified(self, client: APIClient, url: str) -> str:
+        """
+        Проверяет ответ 304 на повторный запрос с If-None-Match.
+
+        Args:
+            client: API клиент
+            url: URL ресурса
+
+        Returns:
+            str: ETag ресурса
+
+        Raises:
+            AssertionError: если ETag не отдается или повторный запрос
+                возвращает тело ответа
+        """
+        response: Response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            URL_OK_ERROR.format(url=url)
+        )
+        etag = response.get('ETag')
+        assert etag, f'Убедитесь, что `{url}` отдает заголовок ETag.'
+
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Убедитесь, что `{url}` с актуальным If-None-Match отдает 304.'
+        )
+        assert not response.content, (
+            f'Убедитесь, что ответ 304 на `{url}` не содержит тела.'
+        )
+        return etag
+
+    def url_sparse_fields(
+            self, client: APIClient, url: str, expected_fields: set
+    ) -> Response:
+        """
+        Проверяет набор полей в ответе с параметрами fields или omit.
+
+        Args:
+            client: API клиент
+            url: URL с параметром выбора полей
+            expected_fields: Ожидаемые поля каждого объекта
+
+        Returns:
+            Response: Ответ сервера
+
+        Raises:
+            AssertionError: если ответ содержит лишние поля или не
+                содержит запрошенных
+        """
+        response: Response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            URL_OK_ERROR.format(url=url)
+        )
+        data = response.json()
+        for obj in data['results'] if 'results' in data else [data]:
+            assert set(obj) == expected_fields, (
+                f'Убедитесь, что `{url}` отдает только поля '
+                f'{sorted(expected_fields)}. Получено: {sorted(obj)}.'
+            )
+        return response
+
+    def url_maintains_counter(
+            self, client: APIClient, url: str, obj: Model, field: str
+    ):
+        """
+        Проверяет счетчик объекта после добавления и удаления связи.
+
+        Args:
+            client: API клиент
+            url: URL добавления (POST) и удаления (DELETE) связи
+            obj: Объект со счетчиком
+            field: Имя поля счетчика
+
+        Raises:
+            AssertionError: если счетчик не меняется вместе со связью
+        """
+        initial = getattr(obj, field)
+        for method, expected in (('post', initial + 1), ('delete', initial)):
+            response: Response = getattr(client, method)(url)
+            assert response.status_code in (
+                HTTPStatus.CREATED, HTTPStatus.NO_CONTENT
+            ), f'Убедитесь, что {method.upper()} `{url}` выполняется.'
+            obj.refresh_from_db(fields=(field,))
+            assert getattr(obj, field) == expected, (
+                f'Убедитесь, что после {method.upper()} `{url}` поле '
+                f'`{field}` равно {expected}.'
+            )
@@ -0,0 +1,15 @@
+import pytest
+from django.core.cache import caches
+
+from api.catalog import forget_catalog_check
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    for cache in caches.all():
+        cache.clear()
+    # Между тестами БД очищается без сигналов моделей
+    forget_catalog_check()
+    yield
+    for cache in caches.all():
+        cache.clear()
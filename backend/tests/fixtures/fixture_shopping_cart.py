@@ -9,19 +9,14 @@ ShoppingCart = shopping_cart_model()
 def three_shopping_cart(
     third_user, first_recipe, second_recipe, third_recipe
 ):
-    shopping_cart = [
-        ShoppingCart(author=third_user, recipe=recipe)
-        for recipe in (first_recipe, second_recipe, third_recipe)
-    ]
-    ShoppingCart.objects.bulk_create(shopping_cart)
+    # Записи создаются по одной, чтобы модель собрала список покупок
+    for recipe in (first_recipe, second_recipe, third_recipe):
+        ShoppingCart.objects.create(author=third_user, recipe=recipe)
     return list(ShoppingCart.objects.all())
 
 
 @pytest.fixture
 def all_shopping_cart(third_user, all_recipes) -> list:
-    shopping_cart = [
-        ShoppingCart(author=third_user, recipe=recipe)
-        for recipe in all_recipes
-    ]
-    ShoppingCart.objects.bulk_create(shopping_cart)
+    for recipe in all_recipes:
+        ShoppingCart.objects.create(author=third_user, recipe=recipe)
     return list(ShoppingCart.objects.all())
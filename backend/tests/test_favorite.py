@@ -101,4 +101,36 @@ class TestFavorite(BaseTest):
             url=URL_FAVORITE.format(id=favorite.recipe_id),
             model=RecipeFavorite,
             item_id=favorite.id
-        )
\ No newline at end of file
+        )
+
+    def test_favorite_updates_recipe_counter(
+        self, third_user_authorized_client: APIClient, first_recipe: Model
+    ):
+        """Проверяет счетчик избранного у рецепта."""
+        self.url_maintains_counter(
+            client=third_user_authorized_client,
+            url=URL_FAVORITE.format(id=first_recipe.id),
+            obj=first_recipe,
+            field='favorites_count'
+        )
+
+    def test_favorite_toggle_queries(
+        self, third_user_authorized_client: APIClient, first_recipe: Model,
+        django_assert_num_queries
+    ):
+        """Проверяет число запросов при добавлении и удалении из избранного."""
+        url = URL_FAVORITE.format(id=first_recipe.id)
+        # Токен, рецепт, INSERT и счетчик рецепта в одной транзакции
+        with django_assert_num_queries(6):
+            third_user_authorized_client.post(url)
+        response = third_user_authorized_client.post(url)
+        assert response.json() == {
+            'non_field_errors': ['Нельзя повторно добавить рецепт в избранные.']
+        }, 'Убедитесь, что ответ на повторное добавление не изменился.'
+        # Токен, DELETE и счетчик рецепта в одной транзакции
+        with django_assert_num_queries(5):
+            third_user_authorized_client.delete(url)
+        response = third_user_authorized_client.delete(url)
+        assert response.json() == {
+            'errors': 'У вас нет данного рецепта в избранном.'
+        }, 'Убедитесь, что ответ на повторное удаление не изменился.'
@@ -0,0 +1,185 @@
+import pytest
+from django.db.models import Model
+from pytest_django.fixtures import SettingsWrapper
+from rest_framework.test import APIClient
+
+from tests.base_test import BaseTest
+from tests.utils.models import recipe_model
+from tests.utils.recipe import (
+    IMAGE,
+    RECIPE_CURSOR_LIST_SCHEMA,
+    RESPONSE_SCHEMA_RECIPES,
+    URL_RECIPES
+)
+from tests.utils.subscription import URL_CREATE_SUBSCRIBE
+from users.models import FeedEntry
+
+# Получаем модель рецепта из фабрики
+Recipe = recipe_model()
+
+URL_FEED = URL_RECIPES + 'feed/'
+
+
+@pytest.mark.django_db(transaction=True)
+class TestFeed(BaseTest):
+    """Тесты ленты рецептов авторов из подписок."""
+
+    def get_feed_ids(self, client: APIClient) -> list:
+        """Id рецептов ленты в порядке выдачи."""
+        response = client.get(URL_FEED + '?limit=100')
+        self.url_get_resource(
+            response=response,
+            url=URL_FEED,
+            response_schema=RESPONSE_SCHEMA_RECIPES
+        )
+        return [recipe['id'] for recipe in response.json()['results']]
+
+    def create_recipe(self, client: APIClient, ingredients: list) -> int:
+        """Создает рецепт через API и возвращает его id."""
+        response = client.post(URL_RECIPES, data={
+            'ingredients': [{'id': ingredients[0].id, 'amount': 10}],
+            'image': IMAGE,
+            'name': 'Новый рецепт',
+            'text': 'Рецепт для ленты подписчиков.',
+            'cooking_time': 5
+        })
+        assert response.status_code == 201, (
+            'Убедитесь, что рецепт для проверки ленты создается.'
+        )
+        return response.json()['id']
+
+    def test_feed_unauthorized(self, api_client: APIClient):
+        """Проверяет, что лента недоступна анониму."""
+        self.url_requires_authorization(
+            client=api_client, url=URL_FEED, method='get'
+        )
+
+    @pytest.mark.parametrize('engine', ['serializer', 'values'])
+    def test_feed_follow_and_unfollow(
+            self, third_user_authorized_client: APIClient,
+            settings: SettingsWrapper, second_user: Model,
+            all_recipes: list, engine: str
+    ):
+        """Проверяет заполнение и очистку ленты при подписке и отписке."""
+        settings.RECIPE_READ_ENGINE = engine
+        url = URL_CREATE_SUBSCRIBE.format(id=second_user.id)
+        assert self.get_feed_ids(third_user_authorized_client) == [], (
+            'Убедитесь, что лента без подписок пуста.'
+        )
+
+        third_user_authorized_client.post(url)
+        expected = sorted(
+            (recipe.id for recipe in all_recipes
+             if recipe.author_id == second_user.id),
+            reverse=True
+        )
+        assert self.get_feed_ids(third_user_authorized_client) == expected, (
+            'Убедитесь, что после подписки в ленте появляются рецепты '
+            'автора от новых к старым.'
+        )
+
+        third_user_authorized_client.delete(url)
+        assert self.get_feed_ids(third_user_authorized_client) == [], (
+            'Убедитесь, что после отписки рецепты автора пропадают из ленты.'
+        )
+
+    @pytest.mark.usefixtures('third_user_subscribed_to_second')
+    def test_feed_new_recipe(
+            self, second_user_authorized_client: APIClient,
+            third_user_authorized_client: APIClient,
+            first_user_authorized_client: APIClient, ingredients: list
+    ):
+        """Проверяет попадание нового рецепта в ленты подписчиков."""
+        recipe_id = self.create_recipe(
+            second_user_authorized_client, ingredients
+        )
+        assert self.get_feed_ids(third_user_authorized_client) == [
+            recipe_id
+        ], 'Убедитесь, что новый рецепт попадает в ленту подписчика.'
+        assert self.get_feed_ids(first_user_authorized_client) == [], (
+            'Убедитесь, что рецепт не попадает в ленты других пользователей.'
+        )
+
+    @pytest.mark.usefixtures('third_user_subscribed_to_second')
+    def test_feed_cursor_pagination(
+            self, third_user_authorized_client: APIClient, all_recipes: list
+    ):
+        """Проверяет листание ленты курсором."""
+        ids = self.url_cursor_pagination_results(
+            client=third_user_authorized_client,
+            url=URL_FEED,
+            limit=2,
+            response_schema=RECIPE_CURSOR_LIST_SCHEMA
+        )
+        assert ids == self.get_feed_ids(third_user_authorized_client), (
+            'Убедитесь, что курсорная пагинация ленты выдает те же рецепты.'
+        )
+
+    @pytest.mark.usefixtures('all_recipes')
+    def test_feed_merges_popular_authors(
+            self, settings: SettingsWrapper,
+            first_user_authorized_client: APIClient,
+            second_user_authorized_client: APIClient,
+            third_user_authorized_client: APIClient,
+            second_user: Model, third_user: Model, ingredients: list
+    ):
+        """Проверяет ленту для авторов с большим числом подписчиков."""
+        settings.FEED_FANOUT_LIMIT = 2
+        url = URL_CREATE_SUBSCRIBE.format(id=second_user.id)
+        first_user_authorized_client.post(url)
+        third_user_authorized_client.post(url)
+
+        recipe_id = self.create_recipe(
+            second_user_authorized_client, ingredients
+        )
+        assert not FeedEntry.objects.filter(recipe_id=recipe_id).exists(), (
+            'Убедитесь, что рецепты популярных авторов не раскладываются '
+            'по лентам.'
+        )
+        expected = list(Recipe.objects.filter(
+            author=second_user
+        ).order_by('-id').values_list('id', flat=True))
+        assert self.get_feed_ids(third_user_authorized_client) == expected, (
+            'Убедитесь, что рецепты популярных авторов подмешиваются в ленту.'
+        )
+
+        first_user_authorized_client.delete(url)
+        assert FeedEntry.objects.filter(
+            user=third_user, recipe_id=recipe_id
+        ).exists(), (
+            'Убедитесь, что рецепты автора раскладываются по лентам, когда '
+            'подписчиков становится меньше порога.'
+        )
+        assert self.get_feed_ids(third_user_authorized_client) == expected, (
+            'Убедитесь, что лента не меняется при смене способа ее чтения.'
+        )
+
+    @pytest.mark.usefixtures('all_recipes')
+    def test_feed_restored_after_follower_delete(
+            self, settings: SettingsWrapper,
+            first_user_authorized_client: APIClient,
+            second_user_authorized_client: APIClient,
+            third_user_authorized_client: APIClient,
+            first_user: Model, second_user: Model, third_user: Model,
+            ingredients: list
+    ):
+        """Проверяет ленту, когда удаляется подписчик популярного автора."""
+        settings.FEED_FANOUT_LIMIT = 2
+        url = URL_CREATE_SUBSCRIBE.format(id=second_user.id)
+        first_user_authorized_client.post(url)
+        third_user_authorized_client.post(url)
+        recipe_id = self.create_recipe(
+            second_user_authorized_client, ingredients
+        )
+
+        type(first_user).objects.filter(pk=first_user.pk).delete()
+        second_user.refresh_from_db()
+        assert second_user.followers_count == 1, (
+            'Убедитесь, что удаление подписчика уменьшает счетчик автора.'
+        )
+        assert FeedEntry.objects.filter(
+            user=third_user, recipe_id=recipe_id
+        ).exists(), (
+            'Убедитесь, что рецепты автора раскладываются по лентам, когда '
+            'подписчиков становится меньше порога из-за удаления подписчика.'
+        )
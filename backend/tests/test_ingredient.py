@@ -1,12 +1,17 @@
+import gzip
+
 import pytest
+from django.utils.timezone import now
 from pytest_lazyfixture import lazy_fixture
 from rest_framework.response import Response
 from rest_framework.test import APIClient
 
+from api.filters import IngredientFilter
 from tests.base_test import BaseTest
 from tests.utils.general import NOT_EXISTING_ID
 from tests.utils.ingredient import (
     DENY_CHANGE_METHOD,
+    INGREDIENT_FUZZY_DATA,
     INGREDIENT_SEARCH_DATA,
     RESPONSE_SCHEMA_INGREDIENT,
     RESPONSE_SCHEMA_INGREDIENTS,
@@ -103,4 +108,198 @@ class TestIngredient(BaseTest):
             client=first_user_authorized_client,
             url=URL_GET_INGREDIENT.format(id=NOT_EXISTING_ID),
             method='get'
-        )
\ No newline at end of file
+        )
+
+    def test_get_ingredients_not_modified(
+            self, api_client: APIClient, ingredients: list
+    ):
+        """Проверяет условные запросы к каталогу ингредиентов."""
+        etag = self.url_not_modified(api_client, URL_INGREDIENTS)
+        self.url_not_modified(
+            api_client, URL_GET_INGREDIENT.format(id=ingredients[0].id)
+        )
+
+        ingredients[0].measurement_unit = 'кг'
+        ingredients[0].save()
+        response: Response = api_client.get(
+            URL_INGREDIENTS, HTTP_IF_NONE_MATCH=etag
+        )
+        assert response.status_code == 200, (
+            'Убедитесь, что после изменения каталога отдается новая версия.'
+        )
+
+    @pytest.mark.parametrize('name', [*INGREDIENT_SEARCH_DATA, 'АБ', 'Бу'])
+    def test_get_ingredients_from_catalog(
+            self, api_client: APIClient, ingredients: list, name: str,
+            django_assert_num_queries
+    ):
+        """Проверяет поиск по каталогу ингредиентов в памяти."""
+        api_client.get(URL_INGREDIENTS)
+        with django_assert_num_queries(0):
+            response: Response = api_client.get(
+                URL_INGREDIENTS + '?name=' + name
+            )
+        expected = [
+            ingredient.id for ingredient in ingredients
+            if ingredient.name.casefold().startswith(name.casefold())
+        ]
+        assert [item['id'] for item in response.json()] == expected, (
+            'Убедитесь, что каталог ищет по началу названия без учета '
+            'регистра, сохраняя порядок по названию.'
+        )
+        if name.islower():
+            assert expected == list(Ingredient.objects.filter(
+                name__istartswith=name
+            ).values_list('id', flat=True)), (
+                'Убедитесь, что каталог совпадает с фильтром в БД.'
+            )
+
+    @pytest.mark.usefixtures('ingredients')
+    def test_catalog_follows_ingredient_changes(self, api_client: APIClient):
+        """Проверяет обновление каталога при изменении ингредиентов."""
+        api_client.get(URL_INGREDIENTS)
+        ingredient = Ingredient.objects.create(
+            name='абрикосы сушеные', measurement_unit='г'
+        )
+        response: Response = api_client.get(URL_INGREDIENTS + '?name=абрикосы')
+        assert [item['id'] for item in response.json()] == [ingredient.id], (
+            'Убедитесь, что новый ингредиент появляется в каталоге.'
+        )
+
+        ingredient.delete()
+        response = api_client.get(URL_INGREDIENTS + '?name=абрикосы')
+        assert response.json() == [], (
+            'Убедитесь, что удаленный ингредиент пропадает из каталога.'
+        )
+
+    @pytest.mark.usefixtures('ingredients')
+    def test_catalog_follows_queryset_delete(self, api_client: APIClient):
+        """Проверяет обновление каталога при удалении через QuerySet."""
+        api_client.get(URL_INGREDIENTS)
+        Ingredient.objects.filter(name__istartswith='а').delete()
+        response: Response = api_client.get(URL_INGREDIENTS + '?name=а')
+        assert response.json() == [], (
+            'Убедитесь, что удаление ингредиентов через QuerySet '
+            'обновляет каталог.'
+        )
+
+    def test_catalog_follows_other_process(
+            self, api_client: APIClient, ingredients: list, settings
+    ):
+        """Проверяет, что версия каталога берется из БД, а не из процесса."""
+        settings.INGREDIENT_CATALOG_CHECK_INTERVAL = 0
+        api_client.get(URL_INGREDIENTS)
+        # Изменение в обход сигналов, как в другом процессе
+        Ingredient.objects.filter(pk=ingredients[0].pk).update(
+            name='яблоки моченые', updated_at=now()
+        )
+        response: Response = api_client.get(URL_INGREDIENTS + '?name=ябл')
+        assert [item['id'] for item in response.json()] == [
+            ingredients[0].id
+        ], (
+            'Убедитесь, что каталог сверяет версию с БД и видит изменения '
+            'других процессов.'
+        )
+
+    @pytest.mark.parametrize('encoding', ['gzip', 'br'])
+    def test_get_full_ingredients_precompressed(
+            self, api_client: APIClient, ingredients: list, encoding: str,
+            django_assert_num_queries
+    ):
+        """Проверяет готовый сжатый ответ с полным каталогом."""
+        if encoding == 'br':
+            brotli = pytest.importorskip('brotli')
+            decompress = brotli.decompress
+        else:
+            decompress = gzip.decompress
+        plain: Response = api_client.get(URL_INGREDIENTS)
+        assert 'W/' not in plain['ETag'], (
+            'Убедитесь, что полный каталог отдается с сильным ETag.'
+        )
+        assert 'max-age=' in plain['Cache-Control'], (
+            'Убедитесь, что полный каталог можно хранить на клиенте.'
+        )
+        assert [item['id'] for item in plain.json()] == [
+            ingredient.id for ingredient in ingredients
+        ], 'Убедитесь, что полный каталог содержит все ингредиенты.'
+
+        with django_assert_num_queries(0):
+            response: Response = api_client.get(
+                URL_INGREDIENTS, HTTP_ACCEPT_ENCODING=encoding
+            )
+        assert response['Content-Encoding'] == encoding, (
+            'Убедитесь, что каталог сжимается по Accept-Encoding.'
+        )
+        assert decompress(response.content) == plain.content, (
+            'Убедитесь, что сжатый каталог совпадает с несжатым.'
+        )
+        assert response['ETag'] != plain['ETag'], (
+            'Убедитесь, что у сжатого варианта свой ETag.'
+        )
+        assert api_client.get(
+            URL_INGREDIENTS, HTTP_ACCEPT_ENCODING=encoding,
+            HTTP_IF_NONE_MATCH=response['ETag']
+        ).status_code == 304, (
+            'Убедитесь, что сжатый каталог поддерживает If-None-Match.'
+        )
+
+    @pytest.mark.parametrize(
+        'accept_encoding, encoding',
+        [
+            ('gzip;q=0', None),
+            ('gzip;q=0, br;q=0', None),
+            ('br;q=0, gzip', 'gzip'),
+            ('gzip;q=0.5, identity', None),
+        ]
+    )
+    @pytest.mark.usefixtures('ingredients')
+    def test_get_full_ingredients_accept_encoding_weights(
+            self, api_client: APIClient, accept_encoding: str, encoding
+    ):
+        """Проверяет учет весов q в Accept-Encoding."""
+        response: Response = api_client.get(
+            URL_INGREDIENTS, HTTP_ACCEPT_ENCODING=accept_encoding
+        )
+        assert response.get('Content-Encoding') == encoding, (
+            'Убедитесь, что кодировки с q=0 не отдаются, а сжатие '
+            'выбирается по весам q.'
+        )
+
+    @pytest.mark.parametrize(
+        'query, expected',
+        [
+            ('помидор', ['помидор', 'помидоры', 'помидоры черри']),
+            ('Помидоры', ['помидоры', 'помидоры черри', 'помидор']),
+            ('помидр', ['помидор', 'помидоры']),
+            ('паста томатная', ['томатная паста']),
+            ('кабачок', [])
+        ],
+        ids=['prefix', 'case', 'typo', 'words', 'missing']
+    )
+    def test_get_ingredients_fuzzy(
+            self, api_client: APIClient, query: str, expected: list,
+            django_assert_max_num_queries
+    ):
+        """Проверяет нечеткий поиск ингредиентов параметром q."""
+        Ingredient.objects.bulk_create([
+            Ingredient(**item) for item in INGREDIENT_FUZZY_DATA
+        ])
+        api_client.get(URL_INGREDIENTS)
+        with django_assert_max_num_queries(0):
+            response: Response = api_client.get(
+                URL_INGREDIENTS + '?q=' + query
+            )
+        self.url_get_resource(
+            response=response,
+            url=URL_INGREDIENTS,
+            response_schema=RESPONSE_SCHEMA_INGREDIENTS
+        )
+        assert [item['name'] for item in response.json()] == expected, (
+            'Убедитесь, что сначала идут совпадения по началу названия, '
+            'затем похожие названия.'
+        )
+        assert [item['id'] for item in response.json()] == list(
+            IngredientFilter(
+                data={'q': query}, queryset=Ingredient.objects.all()
+            ).qs.values_list('id', flat=True)
+        ), 'Убедитесь, что каталог совпадает с поиском в БД.'
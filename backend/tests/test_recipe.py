@@ -1,13 +1,16 @@
 import re
 
 import pytest
+from django.db import connection
 from django.db.models import Model, Q
+from django.test.utils import CaptureQueriesContext
 from pytest_django.fixtures import SettingsWrapper
 from pytest_lazyfixture import lazy_fixture
 from rest_framework.response import Response
 from rest_framework.test import APIClient
 
 from tests.base_test import BaseTest
+from tests.utils.favorite import URL_FAVORITE
 from tests.utils.general import NOT_EXISTING_ID
 from tests.utils.models import (
     recipe_favorite_model,
@@ -20,6 +23,7 @@ from tests.utils.recipe import (
     BODY_POST_AND_PATH_BAD_REQUESTS,
     BODY_UPDATE_VALID,
     IMAGE,
+    RECIPE_CURSOR_LIST_SCHEMA,
     RESPONSE_SCHEMA_RECIPE,
     RESPONSE_SCHEMA_RECIPES,
     RESPONSE_SCHEMA_SHORT_LINK,
@@ -215,6 +219,42 @@ class TestRecipe(BaseTest):
             limit=count
         )
 
+    @pytest.mark.parametrize('limit', [1, 4, 10])
+    @pytest.mark.usefixtures('all_recipes')
+    def test_get_recipes_cursor_paginated(
+            self, api_client: APIClient, limit: int
+    ):
+        """Проверяет курсорную пагинацию списка рецептов."""
+        ids = self.url_cursor_pagination_results(
+            client=api_client,
+            url=URL_RECIPES,
+            limit=limit,
+            response_schema=RECIPE_CURSOR_LIST_SCHEMA
+        )
+        expected_ids = list(
+            Recipe.objects.order_by('-id').values_list('id', flat=True)
+        )
+        assert ids == expected_ids, (
+            'Убедитесь, что курсор выдает все рецепты от новых к старым.'
+        )
+
+    @pytest.mark.parametrize('query', ['search=пицца', 'ordering=popular'])
+    @pytest.mark.usefixtures('all_recipes')
+    def test_get_recipes_cursor_with_ordering(
+            self, api_client: APIClient, query: str
+    ):
+        """Проверяет, что курсор не пересортировывает поиск и рейтинг."""
+        response: Response = api_client.get(
+            f'{URL_RECIPES}?{query}&cursor='
+        )
+        assert response.status_code == 400, (
+            'Убедитесь, что курсор с поиском или сортировкой '
+            'возвращает статус 400.'
+        )
+        assert 'cursor' in response.json(), (
+            'Убедитесь, что ответ указывает на параметр cursor.'
+        )
+
     @pytest.mark.parametrize(
         'user', [
             lazy_fixture('first_user'),
@@ -283,7 +323,7 @@ class TestRecipe(BaseTest):
         )
         response_json: dict = response.json()
         short_link: str = response_json.get('short-link', '')
-        pattern = r'^.*/s/[a-zA-Z0-9]{2,6}$'
+        pattern = r'^.*/s/[a-zA-Z0-9]{7,}$'
         assert re.match(pattern, short_link) is not None, (
             'Убедитесь, что в ответе запроса на адрес `{url}` значение '
             '`short_link` соответствует регулярному выражению `{pattern}`.'
@@ -441,6 +481,223 @@ class TestRecipe(BaseTest):
                         'странице рецептов работает.'
                     )
 
+    @pytest.mark.usefixtures(
+        'all_favorite', 'three_shopping_cart', 'third_user_subscriptions'
+    )
+    def test_get_recipes_queries_count(
+            self, third_user_authorized_client: APIClient
+    ):
+        """Проверяет, что флаги зрителя не добавляют запросов на рецепт."""
+        self.url_queries_not_depend_on_page_size(
+            client=third_user_authorized_client,
+            url=URL_RECIPES
+        )
+
+    @pytest.mark.usefixtures('all_favorite', 'third_user_subscribed_to_first')
+    def test_get_recipes_viewer_flags(
+            self, third_user_authorized_client: APIClient,
+            three_shopping_cart: list, first_user: Model
+    ):
+        """Проверяет значения флагов зрителя в списке рецептов."""
+        response: Response = third_user_authorized_client.get(URL_RECIPES)
+        self.url_get_resource(
+            response=response,
+            url=URL_RECIPES,
+            response_schema=RESPONSE_SCHEMA_RECIPES
+        )
+        in_cart = {cart.recipe_id for cart in three_shopping_cart}
+        for recipe in response.json()['results']:
+            assert recipe['is_favorited'], (
+                'Убедитесь, что флаг `is_favorited` отражает избранное.'
+            )
+            assert recipe['is_in_shopping_cart'] == (recipe['id'] in in_cart), (
+                'Убедитесь, что флаг `is_in_shopping_cart` отражает корзину.'
+            )
+            assert recipe['author']['is_subscribed'] == (
+                recipe['author']['id'] == first_user.id
+            ), 'Убедитесь, что флаг `is_subscribed` отражает подписки.'
+
+    def test_get_recipe_detail_after_update(
+            self, api_client: APIClient,
+            second_user_authorized_client: APIClient,
+            third_user_authorized_client: APIClient,
+            first_recipe: Model, ingredients: list, all_favorite: list
+    ):
+        """Проверяет сброс кеша карточки рецепта после его изменения."""
+        url = URL_GET_RECIPE.format(id=first_recipe.id)
+        api_client.get(url)
+        body = {
+            **BODY_UPDATE_VALID,
+            'ingredients': [{'id': ingredients[2].id, 'amount': 15}]
+        }
+        response: Response = second_user_authorized_client.patch(url, body)
+        assert response.status_code == 200, (
+            'Убедитесь, что автор может изменить рецепт.'
+        )
+
+        response = third_user_authorized_client.get(url)
+        self.url_get_resource(
+            response=response,
+            url=url,
+            response_schema=RESPONSE_SCHEMA_RECIPE
+        )
+        data = response.json()
+        assert data['name'] == body['name'], (
+            'Убедитесь, что после изменения рецепта отдается новая версия.'
+        )
+        assert [
+            ingredient['id'] for ingredient in data['ingredients']
+        ] == [ingredients[2].id], (
+            'Убедитесь, что после изменения рецепта отдаются новые '
+            'ингредиенты.'
+        )
+        assert data['is_favorited'], (
+            'Убедитесь, что флаги зрителя не берутся из кеша.'
+        )
+
+    def test_get_recipe_detail_after_author_update(
+            self, api_client: APIClient, second_user: Model,
+            first_recipe: Model
+    ):
+        """Проверяет сброс кеша карточки рецепта после изменения автора."""
+        url = URL_GET_RECIPE.format(id=first_recipe.id)
+        api_client.get(url)
+        second_user.first_name = 'Обновленное'
+        second_user.save()
+
+        response: Response = api_client.get(url)
+        assert response.json()['author']['first_name'] == 'Обновленное', (
+            'Убедитесь, что после изменения профиля автора в карточке '
+            'рецепта отдаются новые данные.'
+        )
+
+    def test_author_save_keeps_recipe_version(
+            self, second_user: Model, first_recipe: Model
+    ):
+        """Проверяет, что версия рецепта не меняется без изменений автора."""
+        first_recipe.refresh_from_db()
+        version = first_recipe.version
+        second_user.is_active = True
+        second_user.save()
+        first_recipe.refresh_from_db()
+        assert first_recipe.version == version, (
+            'Убедитесь, что сохранение автора без изменения полей карточки '
+            'не сбрасывает кеш его рецептов.'
+        )
+        second_user.last_name = 'Обновленная'
+        second_user.save()
+        first_recipe.refresh_from_db()
+        assert first_recipe.version != version, (
+            'Убедитесь, что изменение полей карточки автора сбрасывает кеш '
+            'его рецептов.'
+        )
+
+    def test_get_recipe_detail_not_modified(
+            self, api_client: APIClient,
+            second_user_authorized_client: APIClient,
+            first_recipe: Model, ingredients: list
+    ):
+        """Проверяет условные запросы к рецепту."""
+        url = URL_GET_RECIPE.format(id=first_recipe.id)
+        etag = self.url_not_modified(api_client, url)
+        last_modified = api_client.get(url)['Last-Modified']
+        response: Response = api_client.get(
+            url, HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        assert response.status_code == 304, (
+            'Убедитесь, что запрос с актуальным If-Modified-Since '
+            'отдает 304.'
+        )
+
+        second_user_authorized_client.patch(url, {
+            **BODY_UPDATE_VALID,
+            'ingredients': [{'id': ingredients[2].id, 'amount': 15}]
+        })
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Убедитесь, что после изменения рецепта отдается новая версия.'
+        )
+
+    def test_get_recipes_not_modified(
+            self, third_user_authorized_client: APIClient,
+            all_recipes: list
+    ):
+        """Проверяет условные запросы к списку с учетом связей зрителя."""
+        etag = self.url_not_modified(third_user_authorized_client, URL_RECIPES)
+        third_user_authorized_client.post(
+            URL_FAVORITE.format(id=all_recipes[0].id)
+        )
+        response: Response = third_user_authorized_client.get(
+            URL_RECIPES, HTTP_IF_NONE_MATCH=etag
+        )
+        assert response.status_code == 200, (
+            'Убедитесь, что после изменения избранного отдается новая '
+            'версия списка.'
+        )
+
+    @pytest.mark.parametrize(
+        'query, expected_fields',
+        [
+            (
+                'fields=id,name,image,cooking_time',
+                {'id', 'name', 'image', 'cooking_time'}
+            ),
+            (
+                'omit=text,ingredients,is_in_shopping_cart',
+                {'id', 'name', 'image', 'cooking_time', 'author',
+                 'is_favorited'}
+            ),
+        ]
+    )
+    @pytest.mark.usefixtures('all_favorite')
+    def test_get_recipes_sparse_fields(
+            self, third_user_authorized_client: APIClient, query: str,
+            expected_fields: set
+    ):
+        """Проверяет выбор полей рецептов параметрами fields и omit."""
+        self.url_sparse_fields(
+            client=third_user_authorized_client,
+            url=f'{URL_RECIPES}?{query}',
+            expected_fields=expected_fields
+        )
+        self.url_sparse_fields(
+            client=third_user_authorized_client,
+            url=URL_GET_RECIPE.format(id=Recipe.objects.first().id)
+            + f'?{query}',
+            expected_fields=expected_fields
+        )
+
+    @pytest.mark.usefixtures('all_favorite')
+    def test_get_recipes_sparse_fields_queries_count(
+            self, third_user_authorized_client: APIClient
+    ):
+        """Проверяет, что исключенные поля не требуют запросов к БД."""
+        queries_counts = []
+        for url in (
+            URL_RECIPES,
+            f'{URL_RECIPES}?fields=id,name,image,cooking_time'
+        ):
+            with CaptureQueriesContext(connection) as queries:
+                third_user_authorized_client.get(url)
+            queries_counts.append(len(queries))
+        full, sparse = queries_counts
+        assert full - sparse >= 4, (
+            'Убедитесь, что без автора, ингредиентов и флагов зрителя не '
+            f'выполняются их запросы. Получено: {full} и {sparse}.'
+        )
+
+    @pytest.mark.parametrize('param', ['fields', 'omit'])
+    def test_get_recipes_unknown_fields(
+            self, api_client: APIClient, param: str
+    ):
+        """Проверяет ответ на запрос неизвестных полей."""
+        response: Response = api_client.get(
+            f'{URL_RECIPES}?{param}=id,unknown'
+        )
+        assert response.status_code == 400, (
+            'Убедитесь, что запрос неизвестных полей возвращает 400.'
+        )
+
     def test_delete_recipe_unauthorized(
             self, api_client: APIClient, first_recipe: Model
     ):
@@ -0,0 +1,144 @@
+from http import HTTPStatus
+
+import pytest
+from django.db.models import Model
+from rest_framework.test import APIClient
+
+from recipes.models import RecipeIngredients, ShoppingListItem
+from tests.base_test import BaseTest
+from tests.utils.favorite import URL_FAVORITE_BULK
+from tests.utils.general import NOT_EXISTING_ID
+from tests.utils.models import recipe_favorite_model, shopping_cart_model
+from tests.utils.shopping_cart import URL_SHOPPING_CART_BULK
+
+# Получаем модели из фабрики
+RecipeFavorite = recipe_favorite_model()
+ShoppingCart = shopping_cart_model()
+
+BULK_CASES = [
+    (URL_FAVORITE_BULK, RecipeFavorite, 'favorites_count'),
+    (URL_SHOPPING_CART_BULK, ShoppingCart, 'in_carts_count'),
+]
+BULK_IDS = ['favorite', 'shopping_cart']
+
+
+@pytest.mark.django_db(transaction=True)
+class TestRecipeBulk(BaseTest):
+    """Тесты пакетного добавления и удаления рецептов."""
+
+    def get_statuses(self, response) -> dict:
+        """Статусы пакетного действия по id рецепта."""
+        assert response.status_code == HTTPStatus.OK, (
+            'Убедитесь, что пакетное действие возвращает статус 200.'
+        )
+        return {
+            result['id']: result['status']
+            for result in response.json()['recipes']
+        }
+
+    @pytest.mark.parametrize('url, model, counter', BULK_CASES, ids=BULK_IDS)
+    def test_bulk_unauthorized(
+            self, api_client: APIClient, url: str, model, counter: str
+    ):
+        """Проверяет, что аноним не может менять рецепты пачкой."""
+        self.url_requires_authorization(client=api_client, url=url)
+
+    @pytest.mark.parametrize('url, model, counter', BULK_CASES, ids=BULK_IDS)
+    def test_bulk_add_and_remove(
+            self, third_user_authorized_client: APIClient, third_user: Model,
+            all_recipes: list, url: str, model, counter: str
+    ):
+        """Проверяет результаты по id и счетчики рецептов."""
+        first, second, *others = all_recipes
+        model.objects.create(author=third_user, recipe=first)
+        ids = [first.id, second.id, *(recipe.id for recipe in others)]
+
+        statuses = self.get_statuses(third_user_authorized_client.post(
+            url, data={'recipes': [*ids, second.id, NOT_EXISTING_ID]},
+            format='json'
+        ))
+        assert statuses == {
+            first.id: 'already_added',
+            **{recipe_id: 'added' for recipe_id in ids[1:]},
+            NOT_EXISTING_ID: 'not_found'
+        }, 'Убедитесь, что результат возвращается по каждому id.'
+        assert set(model.objects.filter(author=third_user).values_list(
+            'recipe_id', flat=True
+        )) == set(ids), 'Убедитесь, что рецепты добавлены пачкой.'
+        for recipe in all_recipes:
+            recipe.refresh_from_db()
+            assert getattr(recipe, counter) == 1, (
+                'Убедитесь, что счетчик рецепта растет один раз.'
+            )
+
+        statuses = self.get_statuses(third_user_authorized_client.delete(
+            url, data={'recipes': [first.id, NOT_EXISTING_ID]}, format='json'
+        ))
+        assert statuses == {
+            first.id: 'removed', NOT_EXISTING_ID: 'not_found'
+        }, 'Убедитесь, что удаление возвращает результат по каждому id.'
+        statuses = self.get_statuses(third_user_authorized_client.delete(
+            url, data={'recipes': [first.id]}, format='json'
+        ))
+        assert statuses == {first.id: 'not_added'}, (
+            'Убедитесь, что повторное удаление отмечается как not_added.'
+        )
+        first.refresh_from_db()
+        assert getattr(first, counter) == 0, (
+            'Убедитесь, что удаление уменьшает счетчик рецепта.'
+        )
+
+    @pytest.mark.parametrize('url, model, counter', BULK_CASES, ids=BULK_IDS)
+    def test_bulk_queries_independent_of_size(
+            self, third_user_authorized_client: APIClient,
+            all_recipes: list, url: str, model, counter: str,
+            django_assert_max_num_queries
+    ):
+        """Проверяет, что число запросов не зависит от размера пачки."""
+        with django_assert_max_num_queries(12):
+            third_user_authorized_client.post(
+                url, data={'recipes': [recipe.id for recipe in all_recipes]},
+                format='json'
+            )
+
+    def test_bulk_cart_updates_shopping_list(
+            self, third_user_authorized_client: APIClient, third_user: Model,
+            all_recipes: list
+    ):
+        """Проверяет список покупок после пакетного добавления и удаления."""
+        third_user_authorized_client.post(
+            URL_SHOPPING_CART_BULK,
+            data={'recipes': [recipe.id for recipe in all_recipes]},
+            format='json'
+        )
+        assert list(
+            ShoppingListItem.objects.get_shopping_list(third_user)
+        ) == list(RecipeIngredients.shopping_list.get_queryset(third_user)), (
+            'Убедитесь, что пакетное добавление обновляет список покупок.'
+        )
+
+        third_user_authorized_client.delete(
+            URL_SHOPPING_CART_BULK,
+            data={'recipes': [recipe.id for recipe in all_recipes[1:]]},
+            format='json'
+        )
+        assert list(
+            ShoppingListItem.objects.get_shopping_list(third_user)
+        ) == list(RecipeIngredients.shopping_list.get_queryset(third_user)), (
+            'Убедитесь, что пакетное удаление обновляет список покупок.'
+        )
+
+    @pytest.mark.parametrize(
+        'data',
+        [{}, {'recipes': []}, {'recipes': ['abc']}, {'recipes': [0]}],
+        ids=['missing', 'empty', 'not-int', 'zero']
+    )
+    def test_bulk_invalid(
+            self, third_user_authorized_client: APIClient, data: dict
+    ):
+        """Проверяет ответ 400 на неверный список рецептов."""
+        assert third_user_authorized_client.post(
+            URL_SHOPPING_CART_BULK, data=data, format='json'
+        ).status_code == HTTPStatus.BAD_REQUEST, (
+            'Убедитесь, что неверный список рецептов отклоняется.'
+        )
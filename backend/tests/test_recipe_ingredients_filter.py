@@ -0,0 +1,66 @@
+import pytest
+from rest_framework.test import APIClient
+
+from tests.base_test import BaseTest
+from tests.utils.recipe import URL_RECIPES
+
+
+@pytest.mark.django_db(transaction=True)
+class TestRecipeIngredientsFilter(BaseTest):
+    """Тесты фильтрации рецептов по ингредиентам."""
+
+    def get_ids(self, client: APIClient, query: str) -> set:
+        """Id рецептов, найденных по строке запроса."""
+        response = client.get(f'{URL_RECIPES}?limit=100&{query}')
+        assert response.status_code == 200, (
+            f'Убедитесь, что запрос `{query}` возвращает статус 200.'
+        )
+        return {recipe['id'] for recipe in response.json()['results']}
+
+    def test_filter_by_ingredients(
+            self, api_client: APIClient, all_recipes: list, ingredients: list
+    ):
+        """Проверяет отбор рецептов, содержащих все ингредиенты."""
+        first, second = ingredients[0].id, ingredients[1].id
+        assert self.get_ids(
+            api_client, f'ingredients={first},{second}'
+        ) == {all_recipes[0].id, all_recipes[1].id}, (
+            'Убедитесь, что рецепт должен содержать все ингредиенты из списка.'
+        )
+        assert self.get_ids(api_client, f'ingredients={second}') == {
+            all_recipes[0].id, all_recipes[1].id, all_recipes[4].id
+        }, 'Убедитесь, что фильтр работает для одного ингредиента.'
+        assert self.get_ids(
+            api_client, f'ingredients={first},{first},{second}'
+        ) == {all_recipes[0].id, all_recipes[1].id}, (
+            'Убедитесь, что повторы id в списке не влияют на результат.'
+        )
+
+    def test_filter_exclude_ingredients(
+            self, api_client: APIClient, all_recipes: list, ingredients: list
+    ):
+        """Проверяет исключение рецептов с любым из ингредиентов."""
+        first, second = ingredients[0].id, ingredients[1].id
+        assert self.get_ids(api_client, f'exclude_ingredients={second}') == {
+            all_recipes[2].id, all_recipes[3].id, all_recipes[5].id
+        }, 'Убедитесь, что исключаются рецепты с ингредиентом из списка.'
+        assert self.get_ids(
+            api_client, f'exclude_ingredients={first},{second}'
+        ) == set(), 'Убедитесь, что исключаются рецепты с любым ингредиентом.'
+        assert self.get_ids(
+            api_client, f'ingredients={first}&exclude_ingredients={second}'
+        ) == {all_recipes[2].id, all_recipes[3].id, all_recipes[5].id}, (
+            'Убедитесь, что фильтры по ингредиентам сочетаются.'
+        )
+
+    @pytest.mark.parametrize(
+        'query', ['ingredients=abc', 'exclude_ingredients=1,x']
+    )
+    def test_filter_invalid_ingredients(
+            self, api_client: APIClient, query: str
+    ):
+        """Проверяет ответ 400 на нечисловые id ингредиентов."""
+        response = api_client.get(f'{URL_RECIPES}?{query}')
+        assert response.status_code == 400, (
+            f'Убедитесь, что на запрос `{query}` возвращается статус 400.'
+        )
@@ -0,0 +1,177 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from pytest_django.fixtures import SettingsWrapper
+from rest_framework.test import APIClient
+
+from recipes.models import RecipePopularity
+from tests.base_test import BaseTest
+from tests.utils.favorite import URL_FAVORITE
+from tests.utils.models import recipe_model
+from tests.utils.recipe import (
+    RECIPE_CURSOR_LIST_SCHEMA,
+    RESPONSE_SCHEMA_RECIPES,
+    URL_RECIPES
+)
+from tests.utils.shopping_cart import URL_SHOPPING_CART
+
+# Получаем модель рецепта из фабрики
+Recipe = recipe_model()
+
+URL_POPULAR = URL_RECIPES + 'popular/'
+URL_ORDERING_POPULAR = URL_RECIPES + '?ordering=popular'
+
+
+@pytest.mark.django_db(transaction=True)
+class TestRecipePopular(BaseTest):
+    """Тесты рейтинга популярных рецептов."""
+
+    def get_ids(self, client: APIClient, url: str) -> list:
+        """Id рецептов в порядке выдачи."""
+        separator = '&' if '?' in url else '?'
+        response = client.get(f'{url}{separator}limit=100')
+        self.url_get_resource(
+            response=response,
+            url=url,
+            response_schema=RESPONSE_SCHEMA_RECIPES
+        )
+        return [recipe['id'] for recipe in response.json()['results']]
+
+    @pytest.fixture
+    def popular_recipes(
+            self, third_user_authorized_client: APIClient,
+            first_user_authorized_client: APIClient, all_recipes: list
+    ) -> list:
+        """Рецепты от популярных к непопулярным после пересчета."""
+        first, second, *others = all_recipes
+        third_user_authorized_client.post(
+            URL_FAVORITE.format(id=first.id)
+        )
+        third_user_authorized_client.post(
+            URL_SHOPPING_CART.format(id=first.id)
+        )
+        first_user_authorized_client.post(
+            URL_FAVORITE.format(id=second.id)
+        )
+        call_command('refresh_popularity')
+        return [first, second, *sorted(
+            others, key=lambda recipe: recipe.id, reverse=True
+        )]
+
+    def test_popular_ranking(
+            self, api_client: APIClient, popular_recipes: list
+    ):
+        """Проверяет порядок рецептов по избранному и корзинам."""
+        expected = [recipe.id for recipe in popular_recipes]
+        assert self.get_ids(api_client, URL_POPULAR) == expected, (
+            'Убедитесь, что `/popular/` сортирует рецепты по популярности.'
+        )
+        assert self.get_ids(api_client, URL_ORDERING_POPULAR) == expected, (
+            'Убедитесь, что `?ordering=popular` сортирует рецепты по '
+            'популярности.'
+        )
+
+    @pytest.mark.parametrize('engine', ['serializer', 'values'])
+    def test_popular_cursor_pagination(
+            self, api_client: APIClient, settings: SettingsWrapper,
+            popular_recipes: list, engine: str
+    ):
+        """Проверяет листание рейтинга курсором."""
+        settings.RECIPE_READ_ENGINE = engine
+        assert self.url_cursor_pagination_results(
+            client=api_client,
+            url=URL_POPULAR,
+            limit=2,
+            response_schema=RECIPE_CURSOR_LIST_SCHEMA
+        ) == [recipe.id for recipe in popular_recipes], (
+            'Убедитесь, что курсорная пагинация рейтинга сохраняет порядок.'
+        )
+
+    def test_popular_rank(self, popular_recipes: list):
+        """Проверяет уникальные места рецептов для курсора рейтинга."""
+        assert list(RecipePopularity.objects.order_by('rank').values_list(
+            'recipe_id', 'rank'
+        )) == [
+            (recipe.id, rank)
+            for rank, recipe in enumerate(popular_recipes, start=1)
+        ], 'Убедитесь, что пересчет нумерует места рецептов по порядку.'
+
+    def test_popular_incremental_refresh(
+            self, api_client: APIClient,
+            first_user_authorized_client: APIClient,
+            third_user_authorized_client: APIClient, popular_recipes: list
+    ):
+        """Проверяет пересчет только изменившихся рецептов."""
+        assert RecipePopularity.objects.refresh() == 0, (
+            'Убедитесь, что без изменений рецепты не пересчитываются.'
+        )
+        last = popular_recipes[-1]
+        third_user_authorized_client.post(URL_FAVORITE.format(id=last.id))
+        third_user_authorized_client.post(
+            URL_SHOPPING_CART.format(id=last.id)
+        )
+        first_user_authorized_client.post(URL_FAVORITE.format(id=last.id))
+        assert RecipePopularity.objects.refresh() == 1, (
+            'Убедитесь, что пересчитываются только рецепты с новыми '
+            'добавлениями в избранное и корзину.'
+        )
+        assert self.get_ids(api_client, URL_POPULAR)[:3] == [
+            last.id, popular_recipes[0].id, popular_recipes[1].id
+        ], 'Убедитесь, что пересчет меняет порядок рейтинга.'
+
+    def test_popular_unranked_recipe(
+            self, api_client: APIClient, popular_recipes: list
+    ):
+        """Проверяет рецепт, созданный после пересчета."""
+        recipe = Recipe.objects.create(
+            author=popular_recipes[0].author,
+            name='Новый рецепт',
+            text='Рецепт без оценки.',
+            image=popular_recipes[0].image,
+            cooking_time=5
+        )
+        assert recipe.id not in self.get_ids(api_client, URL_POPULAR), (
+            'Убедитесь, что рецепт без оценки не попадает в `/popular/`.'
+        )
+        assert self.get_ids(api_client, URL_ORDERING_POPULAR)[-1] == (
+            recipe.id
+        ), 'Убедитесь, что рецепт без оценки выводится в конце списка.'
+
+    def test_popular_recency(
+            self, api_client: APIClient, settings: SettingsWrapper,
+            popular_recipes: list
+    ):
+        """Проверяет учет новизны рецептов."""
+        settings.POPULARITY_RECENCY_HOURS = 1
+        last = popular_recipes[-1]
+        Recipe.objects.filter(pk=last.pk).update(
+            pub_date=last.pub_date + timedelta(hours=2)
+        )
+        call_command('refresh_popularity', full=True)
+        assert self.get_ids(api_client, URL_POPULAR)[0] == last.id, (
+            'Убедитесь, что с учетом новизны новый рецепт поднимается '
+            'выше старых популярных.'
+        )
+
+    def test_popular_conditional_get(
+            self, api_client: APIClient,
+            third_user_authorized_client: APIClient, popular_recipes: list
+    ):
+        """Проверяет смену ETag списка после пересчета рейтинга."""
+        etag = api_client.get(URL_ORDERING_POPULAR)['ETag']
+        third_user_authorized_client.post(
+            URL_FAVORITE.format(id=popular_recipes[-1].id)
+        )
+        assert api_client.get(
+            URL_ORDERING_POPULAR, HTTP_IF_NONE_MATCH=etag
+        ).status_code == 304, (
+            'Убедитесь, что до пересчета рейтинг списка не меняется.'
+        )
+        call_command('refresh_popularity')
+        assert api_client.get(
+            URL_ORDERING_POPULAR, HTTP_IF_NONE_MATCH=etag
+        ).status_code == 200, (
+            'Убедитесь, что после пересчета меняется ETag списка, '
+            'отсортированного по популярности.'
+        )
@@ -0,0 +1,99 @@
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db.models import Model
+from pytest_django.fixtures import SettingsWrapper
+from pytest_lazyfixture import lazy_fixture
+from rest_framework.test import APIClient
+
+from tests.utils.models import recipe_model
+from tests.utils.recipe import URL_GET_RECIPE, URL_RECIPES
+
+# Получаем модель рецепта из фабрики
+Recipe = recipe_model()
+
+# Запросы, ответы на которые сравниваются между движками чтения
+READ_URLS = (
+    URL_RECIPES,
+    URL_RECIPES + '?limit=2&page=2',
+    URL_RECIPES + '?cursor=&limit=4',
+    URL_RECIPES + '?is_favorited=1',
+    URL_RECIPES + '?is_in_shopping_cart=1',
+    URL_RECIPES + '?fields=id,name,image,cooking_time',
+    URL_RECIPES + '?omit=text,is_favorited',
+    URL_RECIPES + '?fields=author,ingredients',
+    URL_GET_RECIPE,
+    URL_GET_RECIPE + '?omit=ingredients',
+)
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures(
+    'all_favorite', 'three_shopping_cart', 'third_user_subscribed_to_second'
+)
+class TestRecipeReader:
+    """Тесты совпадения ответов быстрого движка чтения и сериализатора."""
+
+    @pytest.mark.parametrize(
+        'client',
+        [
+            lazy_fixture('api_client'),
+            lazy_fixture('third_user_authorized_client')
+        ]
+    )
+    @pytest.mark.parametrize('url', READ_URLS)
+    def test_reader_matches_serializer(
+            self, client: APIClient, settings: SettingsWrapper,
+            second_user: Model, first_recipe: Model, url: str
+    ):
+        """Проверяет побайтовое совпадение ответов двух движков."""
+        second_user.avatar = 'users/avatar.png'
+        second_user.save()
+        url = url.format(id=first_recipe.id)
+
+        contents = []
+        for engine in ('serializer', 'values'):
+            settings.RECIPE_READ_ENGINE = engine
+            cache.clear()
+            response = client.get(url)
+            assert response.status_code == 200, (
+                f'Убедитесь, что движок `{engine}` отвечает на `{url}`.'
+            )
+            contents.append(response.content)
+
+        serializer_content, values_content = contents
+        assert values_content == serializer_content, (
+            f'Убедитесь, что ответы движков на `{url}` совпадают побайтово.'
+        )
+
+    def test_reader_uses_serializer_cache(
+            self, third_user_authorized_client: APIClient,
+            settings: SettingsWrapper
+    ):
+        """Проверяет совпадение ответов при общем кеше карточек."""
+        contents = []
+        for engine in ('serializer', 'values', 'serializer'):
+            settings.RECIPE_READ_ENGINE = engine
+            contents.append(
+                third_user_authorized_client.get(URL_RECIPES).content
+            )
+        assert len(set(contents)) == 1, (
+            'Убедитесь, что карточки из общего кеша не зависят от движка, '
+            'которым они построены.'
+        )
+
+    def test_benchmark_command(self, all_recipes: list):
+        """Проверяет замер движков чтения без изменения базы."""
+        out = StringIO()
+        call_command(
+            'benchmark', 'recipe_read', sizes=[len(all_recipes) + 2],
+            repeat=1, stdout=out
+        )
+        assert 'recipe_read' in out.getvalue(), (
+            'Убедитесь, что команда benchmark выводит результаты замера.'
+        )
+        assert Recipe.objects.count() == len(all_recipes), (
+            'Убедитесь, что временные данные замера откатываются.'
+        )
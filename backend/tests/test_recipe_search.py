@@ -0,0 +1,126 @@
+import re
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Model
+from pytest_django.fixtures import SettingsWrapper
+from rest_framework.test import APIClient
+
+from recipes.search import get_search_backend
+from tests.base_test import BaseTest
+from tests.utils.models import recipe_model
+from tests.utils.recipe import URL_GET_RECIPE, URL_RECIPES
+
+# Получаем модель рецепта из фабрики
+Recipe = recipe_model()
+
+URL_SEARCH = URL_RECIPES + '?search={query}'
+
+
+@pytest.mark.django_db(transaction=True)
+class TestRecipeSearch(BaseTest):
+    """Тесты полнотекстового поиска рецептов."""
+
+    def search(self, client: APIClient, query: str) -> list:
+        """Id найденных рецептов в порядке выдачи."""
+        response = client.get(URL_SEARCH.format(query=query))
+        assert response.status_code == 200, (
+            f'Убедитесь, что поиск `{query}` возвращает статус 200.'
+        )
+        return [recipe['id'] for recipe in response.json()['results']]
+
+    @pytest.mark.parametrize('engine', ['serializer', 'values'])
+    def test_search_by_name_and_text(
+            self, api_client: APIClient, settings: SettingsWrapper,
+            all_recipes: list, engine: str
+    ):
+        """Проверяет поиск по названию и описанию."""
+        settings.RECIPE_READ_ENGINE = engine
+        first_recipe, second_recipe, third_recipe, *_ = all_recipes
+        assert self.search(api_client, 'пиццу') == [first_recipe.id], (
+            'Убедитесь, что поиск находит рецепт по слову из описания.'
+        )
+        assert self.search(api_client, 'Паста карбонара') == [
+            second_recipe.id
+        ], 'Убедитесь, что поиск находит рецепт по словам из названия.'
+        assert self.search(api_client, 'САЛАТ') == [third_recipe.id], (
+            'Убедитесь, что поиск не зависит от регистра.'
+        )
+        assert self.search(api_client, 'паста салат') == [], (
+            'Убедитесь, что рецепт должен содержать все слова запроса.'
+        )
+        assert self.search(api_client, '"*)') == [], (
+            'Убедитесь, что запрос без слов ничего не находит.'
+        )
+
+    def test_search_ranks_name_first(
+            self, api_client: APIClient, all_recipes: list
+    ):
+        """Проверяет, что совпадение в названии выше совпадения в описании."""
+        fifth_recipe, another_author_recipe = all_recipes[4:]
+        Recipe.objects.filter(pk=fifth_recipe.pk).update(name='Зелень')
+        assert self.search(api_client, 'зелень') == [
+            fifth_recipe.id, another_author_recipe.id
+        ], 'Убедитесь, что поиск сортирует рецепты по релевантности.'
+
+    def test_search_index_in_sync(
+            self, second_user_authorized_client: APIClient,
+            first_recipe: Model
+    ):
+        """Проверяет обновление индекса при изменении и удалении рецепта."""
+        url = URL_GET_RECIPE.format(id=first_recipe.id)
+        first_recipe.text = 'Тонкое тесто'
+        first_recipe.save()
+        assert self.search(second_user_authorized_client, 'пиццу') == [], (
+            'Убедитесь, что индекс обновляется при изменении описания.'
+        )
+        assert self.search(second_user_authorized_client, 'тесто') == [
+            first_recipe.id
+        ], 'Убедитесь, что в индекс попадает новое описание.'
+
+        second_user_authorized_client.delete(url)
+        assert self.search(second_user_authorized_client, 'тесто') == [], (
+            'Убедитесь, что удаленный рецепт пропадает из индекса.'
+        )
+
+    @pytest.mark.skipif(
+        connection.vendor != 'sqlite', reason='Проверка плана SQLite'
+    )
+    def test_search_uses_index(self):
+        """Проверяет, что поиск не просматривает таблицу рецептов целиком."""
+        plan = get_search_backend(connection).search(
+            Recipe.objects.all(), 'пицца'
+        ).explain()
+        assert not re.search(rf'SCAN {Recipe._meta.db_table}\b', plan), (
+            'Убедитесь, что поиск использует полнотекстовый индекс.'
+        )
+
+    @pytest.mark.skipif(
+        connection.vendor != 'sqlite', reason='Проверка плана SQLite'
+    )
+    def test_search_matches_once(self):
+        """Проверяет, что ранг берется из того же поиска по индексу."""
+        plan = get_search_backend(connection).search(
+            Recipe.objects.all(), 'пицца'
+        ).explain()
+        assert 'CORRELATED' not in plan, (
+            'Убедитесь, что ранг поиска не считается подзапросом '
+            'для каждого рецепта.'
+        )
+
+    @pytest.mark.skipif(
+        connection.vendor != 'sqlite', reason='Триггеры индекса SQLite'
+    )
+    def test_search_triggers_repaired(self):
+        """Проверяет восстановление триггеров индекса после миграций."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DROP TRIGGER "{Recipe._meta.db_table}_search_insert"'
+            )
+        call_command('migrate', verbosity=0)
+        assert f'{Recipe._meta.db_table}_search_insert' in [
+            name for name, in connection.cursor().execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger'"
+            )
+        ], 'Убедитесь, что триггеры индекса восстанавливаются после миграций.'
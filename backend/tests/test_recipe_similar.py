@@ -0,0 +1,147 @@
+from random import Random
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Model
+from pytest_django.fixtures import SettingsWrapper
+from rest_framework.test import APIClient
+
+from recipes import similarity
+from recipes.similarity import MinHash, get_jaccard
+from tests.base_test import BaseTest
+from tests.utils.recipe import IMAGE, URL_GET_RECIPE, URL_RECIPES
+
+URL_SIMILAR = URL_GET_RECIPE + 'similar/'
+
+
+class TestMinHash:
+    """Тесты MinHash-сигнатур наборов ингредиентов."""
+
+    def test_numpy_matches_python(self):
+        """Проверяет совпадение сигнатур NumPy и чистого Python."""
+        if similarity.numpy is None:
+            pytest.skip('NumPy не установлен')
+        random = Random(1)
+        sets = [random.sample(range(1, 10 ** 6), k) for k in (1, 5, 30)]
+        minhash = MinHash()
+        assert minhash.get_signatures(sets) == minhash.get_signatures(
+            sets, use_numpy=False
+        ), 'Убедитесь, что сигнатуры не зависят от наличия NumPy.'
+
+    def test_signature_estimates_jaccard(self):
+        """Проверяет оценку коэффициента Жаккара по сигнатурам."""
+        first, second = set(range(0, 300)), set(range(100, 400))
+        minhash = MinHash()
+        first_signature, second_signature = minhash.get_signatures(
+            [first, second]
+        )
+        estimate = sum(
+            first_hash == second_hash for first_hash, second_hash in zip(
+                first_signature, second_signature
+            )
+        ) / len(first_signature)
+        assert abs(estimate - get_jaccard(first, second)) < 0.2, (
+            'Убедитесь, что доля совпавших минимумов оценивает Жаккара.'
+        )
+        assert minhash.get_buckets(first_signature) == minhash.get_buckets(
+            list(first_signature)
+        ), 'Убедитесь, что полосы сигнатуры воспроизводимы.'
+
+
+@pytest.mark.django_db(transaction=True)
+class TestRecipeSimilar(BaseTest):
+    """Тесты похожих рецептов."""
+
+    def get_ids(self, client: APIClient, recipe_id: int, query: str = ''):
+        """Id похожих рецептов в порядке выдачи."""
+        response = client.get(URL_SIMILAR.format(id=recipe_id) + query)
+        assert response.status_code == 200, (
+            'Убедитесь, что похожие рецепты возвращают статус 200.'
+        )
+        return [recipe['id'] for recipe in response.json()]
+
+    @pytest.mark.parametrize('engine', ['serializer', 'values'])
+    def test_similar_ordered_by_jaccard(
+            self, api_client: APIClient, settings: SettingsWrapper,
+            all_recipes: list, engine: str
+    ):
+        """Проверяет порядок похожих рецептов по Жаккару."""
+        settings.RECIPE_READ_ENGINE = engine
+        call_command('build_similarity')
+        first_recipe, second_recipe, *_ = all_recipes
+        ingredient_sets = {
+            recipe.id: set(recipe.ingredients.values_list('id', flat=True))
+            for recipe in all_recipes
+        }
+        ids = self.get_ids(api_client, first_recipe.id)
+        assert ids[0] == second_recipe.id, (
+            'Убедитесь, что рецепт с тем же набором ингредиентов идет первым.'
+        )
+        assert first_recipe.id not in ids, (
+            'Убедитесь, что рецепт не попадает в список похожих на себя.'
+        )
+        scores = [
+            get_jaccard(
+                ingredient_sets[first_recipe.id], ingredient_sets[recipe_id]
+            ) for recipe_id in ids
+        ]
+        assert scores == sorted(scores, reverse=True), (
+            'Убедитесь, что рецепты отсортированы по коэффициенту Жаккара.'
+        )
+        assert self.get_ids(api_client, first_recipe.id, '?limit=1') == [
+            second_recipe.id
+        ], 'Убедитесь, что параметр limit ограничивает число рецептов.'
+
+    def test_similar_index_updated(
+            self, second_user_authorized_client: APIClient,
+            first_recipe: Model, ingredients: list
+    ):
+        """Проверяет обновление индекса при сохранении ингредиентов."""
+        body = {
+            'ingredients': [
+                {'id': ingredient.id, 'amount': 10}
+                for ingredient in ingredients[:2]
+            ],
+            'image': IMAGE,
+            'name': 'Пицца',
+            'text': 'Та же пицца.',
+            'cooking_time': 30
+        }
+        recipe_id = second_user_authorized_client.post(
+            URL_RECIPES, data=body, format='json'
+        ).json()['id']
+        assert self.get_ids(
+            second_user_authorized_client, first_recipe.id
+        ) == [recipe_id], (
+            'Убедитесь, что новый рецепт сразу попадает в индекс похожих.'
+        )
+
+        body['ingredients'] = [{'id': ingredients[-1].id, 'amount': 10}]
+        second_user_authorized_client.patch(
+            URL_GET_RECIPE.format(id=recipe_id), data=body, format='json'
+        )
+        assert self.get_ids(
+            second_user_authorized_client, first_recipe.id
+        ) == [], (
+            'Убедитесь, что индекс обновляется при изменении ингредиентов.'
+        )
+
+    @pytest.mark.parametrize('limit', ['0', 'abc', '1000'])
+    def test_similar_invalid_limit(
+            self, api_client: APIClient, first_recipe: Model, limit: str
+    ):
+        """Проверяет ответ 400 на неверный limit."""
+        response = api_client.get(
+            URL_SIMILAR.format(id=first_recipe.id) + f'?limit={limit}'
+        )
+        assert response.status_code == 400, (
+            f'Убедитесь, что на limit={limit} возвращается статус 400.'
+        )
+
+    def test_similar_not_found(self, api_client: APIClient):
+        """Проверяет ответ 404 для несуществующего рецепта."""
+        assert api_client.get(
+            URL_SIMILAR.format(id=10 ** 6)
+        ).status_code == 404, (
+            'Убедитесь, что для несуществующего рецепта возвращается 404.'
+        )
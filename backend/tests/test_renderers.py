@@ -0,0 +1,141 @@
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+from io import BytesIO
+
+import pytest
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+from api.parsers import ORJSONParser
+from api.renderers import ORJSONRenderer
+from tests.utils.recipe import URL_GET_RECIPE, URL_RECIPES
+
+# Данные с типами, которые orjson не кодирует сам
+DRF_TYPES_DATA = ReturnList(
+    [
+        ReturnDict(
+            {
+                'created': timezone.make_aware(datetime(2024, 5, 1, 12, 30)),
+                'utc': datetime(2024, 5, 1, 12, 30, 15, 123456,
+                                tzinfo=dt_timezone.utc),
+                'naive': datetime(2024, 5, 1, 12, 30),
+                'date': datetime(2024, 5, 1).date(),
+                'amount': Decimal('12.50'),
+                'label': gettext_lazy('Рецепт'),
+                'separators': 'a\u2028b\u2029c',
+                1: 'non-str key',
+            },
+            serializer=None
+        )
+    ],
+    serializer=None
+)
+
+
+class TestORJSONRenderer:
+    """Тесты совпадения рендерера orjson со стандартным."""
+
+    @pytest.mark.parametrize(
+        'data',
+        [
+            DRF_TYPES_DATA,
+            {'big': 2 ** 70},
+            {'text': 'Текст'},
+            [],
+        ]
+    )
+    def test_render_matches_stock(self, data):
+        """Проверяет побайтовое совпадение с JSONRenderer."""
+        assert ORJSONRenderer().render(data) == JSONRenderer().render(data), (
+            'Убедитесь, что рендерер orjson кодирует типы DRF так же, как '
+            'стандартный рендерер.'
+        )
+
+    def test_render_none(self):
+        """Проверяет пустой ответ для None."""
+        assert ORJSONRenderer().render(None) == b'', (
+            'Убедитесь, что рендерер orjson возвращает пустое тело для None.'
+        )
+
+    @pytest.mark.parametrize(
+        'accepted_media_type, renderer_context',
+        [
+            ('application/json; indent=4', None),
+            (None, {'indent': 2}),
+        ]
+    )
+    def test_render_indent(self, accepted_media_type, renderer_context):
+        """Проверяет откат на стандартный рендерер при запросе отступа."""
+        assert ORJSONRenderer().render(
+            DRF_TYPES_DATA, accepted_media_type, renderer_context
+        ) == JSONRenderer().render(
+            DRF_TYPES_DATA, accepted_media_type, renderer_context
+        ), 'Убедитесь, что отступы рендерер orjson отдает стандартному.'
+
+
+class TestORJSONParser:
+    """Тесты совпадения парсера orjson со стандартным."""
+
+    @pytest.mark.parametrize(
+        'body',
+        [
+            '{"name": "Рецепт", "amount": 1.5, "items": [1, null, true]}',
+            '"\u2028"',
+        ]
+    )
+    def test_parse_matches_stock(self, body: str):
+        """Проверяет совпадение разобранных данных."""
+        body = body.encode()
+        assert ORJSONParser().parse(BytesIO(body)) == (
+            JSONParser().parse(BytesIO(body))
+        ), 'Убедитесь, что парсер orjson разбирает JSON как стандартный.'
+
+    @pytest.mark.parametrize(
+        'body',
+        [b'{"name": ', b'{"a": NaN}', b'\xff'],
+        ids=['truncated', 'nan', 'not-utf-8']
+    )
+    def test_parse_error(self, body: bytes):
+        """Проверяет ошибку разбора как у стандартного парсера."""
+        with pytest.raises(ParseError) as orjson_error:
+            ORJSONParser().parse(BytesIO(body))
+        with pytest.raises(ParseError) as stock_error:
+            JSONParser().parse(BytesIO(body))
+        assert str(orjson_error.value) == str(stock_error.value), (
+            'Убедитесь, что парсер orjson возвращает ту же ошибку разбора.'
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures('all_favorite', 'third_user_subscribed_to_second')
+class TestJSONBackend:
+    """Тесты API с рендерером и парсером orjson."""
+
+    @pytest.mark.parametrize('url', [URL_RECIPES, URL_GET_RECIPE])
+    def test_response_matches_stock(
+            self, third_user_authorized_client: APIClient, first_recipe, url
+    ):
+        """Проверяет, что ответ API совпадает с ответом JSONRenderer."""
+        response = third_user_authorized_client.get(
+            url.format(id=first_recipe.id)
+        )
+        assert response.status_code == 200, (
+            f'Убедитесь, что `{url}` отвечает с рендерером orjson.'
+        )
+        assert response.content == JSONRenderer().render(response.data), (
+            f'Убедитесь, что ответ `{url}` совпадает со стандартным.'
+        )
+
+    def test_invalid_json(self, second_user_authorized_client: APIClient):
+        """Проверяет ответ 400 на невалидный JSON."""
+        response = second_user_authorized_client.post(
+            URL_RECIPES, data='{"name": ', content_type='application/json'
+        )
+        assert response.status_code == 400, (
+            'Убедитесь, что на невалидный JSON возвращается статус 400.'
+        )
@@ -1,10 +1,19 @@
+import csv
+import json
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from http import HTTPStatus
+from threading import Event
 
 import pytest
 from django.db.models import Model
+from pytest_django.fixtures import SettingsWrapper
 from rest_framework.response import Response
 from rest_framework.test import APIClient
 
+from api import exporters
+from api.exporters import EXPORTERS
+from api.pdf import can_render_pdf
 from tests.base_test import BaseTest
 from tests.utils.general import (
     NOT_EXISTING_ID,
@@ -146,4 +155,205 @@ class TestShoppingCart(BaseTest):
             url=URL_SHOPPING_CART.format(id=cart.recipe_id),
             model=ShoppingCart,
             item_id=cart.id
-        )
\ No newline at end of file
+        )
+
+    def test_shopping_cart_updates_recipe_counter(
+        self, third_user_authorized_client: APIClient, first_recipe: Model
+    ):
+        """Проверяет счетчик корзин у рецепта."""
+        self.url_maintains_counter(
+            client=third_user_authorized_client,
+            url=URL_SHOPPING_CART.format(id=first_recipe.id),
+            obj=first_recipe,
+            field='in_carts_count'
+        )
+
+    def download(self, client: APIClient, query: str = '') -> bytes:
+        """Скачивает список покупок и возвращает содержимое файла."""
+        response = client.get(URL_DOWNLOAD_SHOPPING_CART + query)
+        assert response.status_code == HTTPStatus.OK, (
+            URL_OK_ERROR.format(url=URL_DOWNLOAD_SHOPPING_CART)
+        )
+        assert response.streaming, (
+            'Убедитесь, что список покупок отдается потоком.'
+        )
+        return b''.join(response.streaming_content)
+
+    def get_shopping_list(self, client: APIClient) -> list:
+        """Скачивает список покупок и разбирает CSV."""
+        content = self.download(client).decode('cp1251')
+        return list(csv.reader(content.splitlines()))
+
+    def get_expected(self, carts: list) -> list:
+        """Ожидаемый список покупок: название, единица и сумма."""
+        expected = Counter()
+        for cart in carts:
+            for recipe_ingredient in cart.recipe.recipe_ingredients.all():
+                ingredient = recipe_ingredient.ingredient
+                expected[
+                    (ingredient.name, ingredient.measurement_unit)
+                ] += recipe_ingredient.amount
+        return [
+            [name, unit, amount]
+            for (name, unit), amount in sorted(expected.items())
+        ]
+
+    def test_download_shopping_cart_only_own(
+            self, third_user_authorized_client: APIClient,
+            second_user: Model, all_shopping_cart: list,
+            django_assert_num_queries
+    ):
+        """Проверяет, что в список попадает только своя корзина."""
+        ShoppingCart.objects.create(
+            author=second_user, recipe=all_shopping_cart[0].recipe
+        )
+        expected = self.get_expected(all_shopping_cart)
+
+        # Запрос токена и один агрегирующий запрос по корзине
+        with django_assert_num_queries(2):
+            header, *rows = self.get_shopping_list(
+                third_user_authorized_client
+            )
+        assert header == ['Ингредиент', 'Единица измерения', 'Количество'], (
+            'Убедитесь, что первой строкой идут заголовки столбцов.'
+        )
+        assert rows == [
+            [name, unit, str(amount)] for name, unit, amount in expected
+        ], 'Убедитесь, что количества суммируются по корзине пользователя.'
+
+    def test_download_empty_shopping_cart(
+            self, second_user_authorized_client: APIClient,
+            all_shopping_cart: list
+    ):
+        """Проверяет выгрузку пустой корзины."""
+        assert self.get_shopping_list(second_user_authorized_client) == [
+            ['Ингредиент', 'Единица измерения', 'Количество']
+        ], 'Убедитесь, что чужие корзины не попадают в список покупок.'
+        assert self.download(
+            second_user_authorized_client, '?format=json'
+        ) == b'[]', 'Убедитесь, что пустая корзина выгружается в JSON.'
+
+    def test_download_shopping_cart_json(
+            self, third_user_authorized_client: APIClient,
+            all_shopping_cart: list
+    ):
+        """Проверяет выгрузку списка покупок в JSON."""
+        assert json.loads(
+            self.download(third_user_authorized_client, '?format=json')
+        ) == [
+            {'name': name, 'measurement_unit': unit, 'total_amount': amount}
+            for name, unit, amount in self.get_expected(all_shopping_cart)
+        ], 'Убедитесь, что JSON содержит весь список покупок.'
+
+    def test_download_shopping_cart_txt(
+            self, third_user_authorized_client: APIClient,
+            all_shopping_cart: list
+    ):
+        """Проверяет выгрузку списка покупок в текстовом виде."""
+        lines = self.download(
+            third_user_authorized_client, '?format=txt'
+        ).decode().splitlines()
+        assert lines[2:] == [
+            f'{name} ({unit}) — {amount}'
+            for name, unit, amount in self.get_expected(all_shopping_cart)
+        ], 'Убедитесь, что в тексте по ингредиенту на строку.'
+
+    def test_download_shopping_cart_pdf(
+            self, third_user_authorized_client: APIClient,
+            all_shopping_cart: list
+    ):
+        """Проверяет выгрузку списка покупок в PDF."""
+        if 'pdf' not in EXPORTERS:
+            pytest.skip('reportlab или шрифт с кириллицей не установлен')
+        response = third_user_authorized_client.get(
+            URL_DOWNLOAD_SHOPPING_CART + '?format=pdf'
+        )
+        assert response['Content-Type'] == 'application/pdf', (
+            'Убедитесь, что PDF отдается с типом application/pdf.'
+        )
+        assert b''.join(response.streaming_content).startswith(b'%PDF'), (
+            'Убедитесь, что выгрузка в PDF содержит PDF-документ.'
+        )
+
+    def test_pdf_requires_cyrillic_font(self, tmp_path):
+        """Проверяет, что PDF недоступен без шрифта с кириллицей."""
+        broken_font = tmp_path / 'broken.ttf'
+        broken_font.write_bytes(b'not a font')
+        assert not can_render_pdf(str(tmp_path / 'missing.ttf')), (
+            'Убедитесь, что без файла шрифта PDF не предлагается.'
+        )
+        assert not can_render_pdf(str(broken_font)), (
+            'Убедитесь, что с неисправным шрифтом PDF не предлагается.'
+        )
+
+    def test_download_shopping_cart_pdf_timeout(
+            self, third_user_authorized_client: APIClient,
+            all_shopping_cart: list, settings: SettingsWrapper
+    ):
+        """Проверяет ответ 503, если PDF не успел сверстаться."""
+        if 'pdf' not in EXPORTERS:
+            pytest.skip('reportlab или шрифт с кириллицей не установлен')
+        settings.SHOPPING_LIST_PDF_TIMEOUT = 0
+        assert third_user_authorized_client.get(
+            URL_DOWNLOAD_SHOPPING_CART + '?format=pdf'
+        ).status_code == HTTPStatus.SERVICE_UNAVAILABLE, (
+            'Убедитесь, что запрос не ждет верстку PDF дольше таймаута.'
+        )
+
+    def test_download_shopping_cart_pdf_busy_pool(
+            self, third_user_authorized_client: APIClient,
+            all_shopping_cart: list, settings: SettingsWrapper,
+            monkeypatch: pytest.MonkeyPatch
+    ):
+        """Проверяет, что просроченная верстка PDF занимает пул до конца."""
+        if 'pdf' not in EXPORTERS:
+            pytest.skip('reportlab или шрифт с кириллицей не установлен')
+        release = Event()
+        renders = []
+
+        def render_pdf(rows, font_path):
+            renders.append(rows)
+            release.wait()
+            return b'%PDF'
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        monkeypatch.setattr(exporters, 'render_pdf', render_pdf)
+        monkeypatch.setattr(exporters, 'pdf_renders', set())
+        monkeypatch.setattr(exporters, 'get_pdf_executor', lambda: executor)
+        settings.SHOPPING_LIST_PDF_WORKERS = 1
+        settings.SHOPPING_LIST_PDF_TIMEOUT = 0
+        for _ in range(2):
+            assert third_user_authorized_client.get(
+                URL_DOWNLOAD_SHOPPING_CART + '?format=pdf'
+            ).status_code == HTTPStatus.SERVICE_UNAVAILABLE, (
+                'Убедитесь, что запрос не ждет верстку PDF дольше таймаута.'
+            )
+        release.set()
+        executor.shutdown(wait=True)
+        assert len(renders) == 1, (
+            'Убедитесь, что верстка PDF не ставится в очередь, пока '
+            'все процессы пула заняты.'
+        )
+        executor = ThreadPoolExecutor(max_workers=1)
+        settings.SHOPPING_LIST_PDF_TIMEOUT = 10
+        response = third_user_authorized_client.get(
+            URL_DOWNLOAD_SHOPPING_CART + '?format=pdf'
+        )
+        executor.shutdown(wait=True)
+        assert response.status_code == HTTPStatus.OK, (
+            'Убедитесь, что процесс пула освобождается после верстки PDF.'
+        )
+
+    def test_download_shopping_cart_unknown_format(
+            self, third_user_authorized_client: APIClient
+    ):
+        """Проверяет ответ 400 на неизвестный формат."""
+        response = third_user_authorized_client.get(
+            URL_DOWNLOAD_SHOPPING_CART + '?format=xml'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Убедитесь, что на неизвестный формат возвращается статус 400.'
+        )
+        assert 'format' in response.json(), (
+            'Убедитесь, что в ответе указан неверный параметр format.'
+        )
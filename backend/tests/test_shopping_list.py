@@ -0,0 +1,219 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Model
+from django.test import Client
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from recipes.models import Recipe, RecipeIngredients, ShoppingListItem
+from tests.base_test import BaseTest
+from tests.utils.recipe import IMAGE, URL_GET_RECIPE, URL_RECIPES
+from tests.utils.shopping_cart import (
+    URL_DOWNLOAD_SHOPPING_CART,
+    URL_SHOPPING_CART
+)
+
+URL_SHOPPING_CART_SUMMARY = URL_RECIPES + 'shopping_cart_summary/'
+
+
+@pytest.mark.django_db(transaction=True)
+class TestShoppingList(BaseTest):
+    """Тесты поддерживаемых списков покупок."""
+
+    def get_summary(self, client: APIClient) -> list:
+        """Список покупок пользователя из сводки корзины."""
+        response = client.get(URL_SHOPPING_CART_SUMMARY)
+        assert response.status_code == HTTPStatus.OK, (
+            'Убедитесь, что сводка корзины возвращает статус 200.'
+        )
+        return response.json()
+
+    def get_expected(self, user: Model) -> list:
+        """Список покупок, собранный соединением корзин с рецептами."""
+        return [
+            dict(item) for item in
+            RecipeIngredients.shopping_list.get_queryset(user)
+        ]
+
+    def test_summary_unauthorized(self, api_client: APIClient):
+        """Проверяет, что аноним не может получить сводку корзины."""
+        self.url_requires_authorization(
+            client=api_client,
+            url=URL_SHOPPING_CART_SUMMARY
+        )
+
+    def test_summary_follows_cart(
+            self, third_user_authorized_client: APIClient, third_user: Model,
+            first_recipe: Model, second_recipe: Model,
+            django_assert_num_queries
+    ):
+        """Проверяет сдвиг сумм при добавлении и удалении из корзины."""
+        for recipe in (first_recipe, second_recipe):
+            third_user_authorized_client.post(
+                URL_SHOPPING_CART.format(id=recipe.id)
+            )
+        # Запрос токена и одно чтение таблицы сумм
+        with django_assert_num_queries(2):
+            summary = self.get_summary(third_user_authorized_client)
+        assert summary == self.get_expected(third_user), (
+            'Убедитесь, что сводка совпадает с агрегатом по корзине.'
+        )
+
+        third_user_authorized_client.delete(
+            URL_SHOPPING_CART.format(id=first_recipe.id)
+        )
+        assert self.get_summary(
+            third_user_authorized_client
+        ) == self.get_expected(third_user), (
+            'Убедитесь, что удаление из корзины вычитает рецепт из списка.'
+        )
+
+        third_user_authorized_client.delete(
+            URL_SHOPPING_CART.format(id=second_recipe.id)
+        )
+        assert self.get_summary(third_user_authorized_client) == [], (
+            'Убедитесь, что пустая корзина дает пустой список покупок.'
+        )
+
+    def test_summary_follows_recipe_update(
+            self, second_user_authorized_client: APIClient,
+            third_user_authorized_client: APIClient, third_user: Model,
+            first_recipe: Model, ingredients: list,
+            three_shopping_cart: list
+    ):
+        """Проверяет сдвиг сумм при изменении ингредиентов рецепта."""
+        response = second_user_authorized_client.patch(
+            URL_GET_RECIPE.format(id=first_recipe.id),
+            data={
+                'ingredients': [
+                    {'id': ingredient.id, 'amount': 7}
+                    for ingredient in ingredients[-2:]
+                ],
+                'image': IMAGE,
+                'name': first_recipe.name,
+                'text': first_recipe.text,
+                'cooking_time': first_recipe.cooking_time
+            },
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Убедитесь, что автор может изменить рецепт.'
+        )
+        assert self.get_summary(
+            third_user_authorized_client
+        ) == self.get_expected(third_user), (
+            'Убедитесь, что изменение рецепта переносится в списки покупок.'
+        )
+
+    def test_summary_follows_recipe_delete(
+            self, second_user_authorized_client: APIClient,
+            third_user_authorized_client: APIClient, third_user: Model,
+            first_recipe: Model, three_shopping_cart: list
+    ):
+        """Проверяет вычитание удаленного рецепта из списков покупок."""
+        assert second_user_authorized_client.delete(
+            URL_GET_RECIPE.format(id=first_recipe.id)
+        ).status_code == HTTPStatus.NO_CONTENT, (
+            'Убедитесь, что автор может удалить рецепт.'
+        )
+        assert self.get_summary(
+            third_user_authorized_client
+        ) == self.get_expected(third_user), (
+            'Убедитесь, что удаленный рецепт вычитается из списков покупок.'
+        )
+
+    def test_summary_follows_recipe_queryset_delete(
+            self, third_user_authorized_client: APIClient, third_user: Model,
+            first_recipe: Model, three_shopping_cart: list
+    ):
+        """Проверяет вычитание рецептов, удаленных через QuerySet."""
+        Recipe.objects.filter(pk=first_recipe.pk).delete()
+        assert self.get_summary(
+            third_user_authorized_client
+        ) == self.get_expected(third_user), (
+            'Убедитесь, что массовое удаление рецептов вычитает их '
+            'из списков покупок.'
+        )
+
+    def test_summary_follows_author_delete(
+            self, third_user_authorized_client: APIClient, third_user: Model,
+            second_user: Model, three_shopping_cart: list
+    ):
+        """Проверяет вычитание рецептов, удаленных вместе с автором."""
+        second_user.delete()
+        assert self.get_summary(
+            third_user_authorized_client
+        ) == self.get_expected(third_user), (
+            'Убедитесь, что удаление автора вычитает его рецепты '
+            'из списков покупок.'
+        )
+
+    def test_download_follows_admin_recipe_update(
+            self, third_user_authorized_client: APIClient, third_user: Model,
+            second_user: Model, first_recipe: Model, ingredients: list,
+            three_shopping_cart: list, django_user_model
+    ):
+        """Проверяет выгрузку после правки ингредиентов рецепта в админке."""
+        admin = django_user_model.objects.create_superuser(
+            email='admin@foodgram.local', username='admin',
+            first_name='Админ', last_name='Админов', password='admin'
+        )
+        client = Client()
+        client.force_login(admin)
+        old = list(first_recipe.recipe_ingredients.order_by('id'))
+        data = {
+            'name': first_recipe.name,
+            'author': second_user.id,
+            'text': first_recipe.text,
+            'cooking_time': first_recipe.cooking_time,
+            'recipe_ingredients-TOTAL_FORMS': len(old) + 1,
+            'recipe_ingredients-INITIAL_FORMS': len(old),
+            'recipe_ingredients-MIN_NUM_FORMS': 1,
+            'recipe_ingredients-MAX_NUM_FORMS': 1000,
+        }
+        for index, recipe_ingredient in enumerate(old):
+            prefix = f'recipe_ingredients-{index}-'
+            data.update({
+                prefix + 'id': recipe_ingredient.id,
+                prefix + 'recipe': first_recipe.id,
+                prefix + 'ingredient': recipe_ingredient.ingredient_id,
+                prefix + 'amount': recipe_ingredient.amount + 5,
+            })
+        data[f'recipe_ingredients-{len(old)}-DELETE'] = ''
+        prefix = f'recipe_ingredients-{len(old)}-'
+        data.update({
+            prefix + 'recipe': first_recipe.id,
+            prefix + 'ingredient': ingredients[-1].id,
+            prefix + 'amount': 11,
+        })
+        response = client.post(
+            reverse('admin:recipes_recipe_change', args=[first_recipe.id]),
+            data
+        )
+        assert response.status_code == HTTPStatus.FOUND, (
+            'Убедитесь, что админка сохраняет ингредиенты рецепта.'
+        )
+        response = third_user_authorized_client.get(
+            URL_DOWNLOAD_SHOPPING_CART + '?format=json'
+        )
+        assert json.loads(b''.join(response.streaming_content)) == (
+            self.get_expected(third_user)
+        ), 'Убедитесь, что правка рецепта в админке попадает в выгрузку.'
+
+    def test_rebuild_shopping_lists(
+            self, third_user: Model, three_shopping_cart: list
+    ):
+        """Проверяет пересборку списков покупок командой."""
+        expected = list(
+            ShoppingListItem.objects.get_shopping_list(third_user)
+        )
+        ShoppingListItem.objects.update(total_amount=0)
+        call_command('rebuild_shopping_lists')
+        assert list(
+            ShoppingListItem.objects.get_shopping_list(third_user)
+        ) == expected == self.get_expected(third_user), (
+            'Убедитесь, что команда пересобирает списки по корзинам.'
+        )
@@ -0,0 +1,140 @@
+import pytest
+from django.db import IntegrityError
+from django.db.models import Model
+from pytest_django.fixtures import SettingsWrapper
+from rest_framework.test import APIClient
+
+from core.utils import (
+    encode_base62,
+    get_short_link_signature,
+    sign_short_link
+)
+from tests.base_test import BaseTest
+from tests.utils.models import recipe_model
+from tests.utils.recipe import (
+    URL_GET_FRONT_RECIPE,
+    URL_GET_SHORT_LINK,
+    URL_SHORT_LINK
+)
+
+# Получаем модель рецепта из фабрики
+Recipe = recipe_model()
+
+
+@pytest.mark.django_db(transaction=True)
+class TestShortLinks(BaseTest):
+    """Тесты уникальности и кеширования коротких ссылок."""
+
+    def create_recipe(self, recipe: Model, short_link: str) -> Model:
+        """Создает копию рецепта с заданной короткой ссылкой."""
+        return Recipe.objects.create(
+            author=recipe.author,
+            name=recipe.name,
+            image=recipe.image,
+            text=recipe.text,
+            cooking_time=recipe.cooking_time,
+            short_link=short_link
+        )
+
+    def test_short_link_collision(self, first_recipe: Model):
+        """Проверяет замену занятой короткой ссылки при создании."""
+        recipe = self.create_recipe(first_recipe, first_recipe.short_link)
+        assert recipe.short_link != first_recipe.short_link, (
+            'Убедитесь, что новый рецепт не получает занятую ссылку.'
+        )
+
+    def test_short_link_attempts_exhausted(
+            self, monkeypatch: pytest.MonkeyPatch, first_recipe: Model
+    ):
+        """Проверяет ошибку, если свободная ссылка не нашлась."""
+        monkeypatch.setattr(
+            'recipes.models.recipe.generate_short_link',
+            lambda: first_recipe.short_link
+        )
+        with pytest.raises(IntegrityError):
+            self.create_recipe(first_recipe, first_recipe.short_link)
+        assert Recipe.objects.count() == 1, (
+            'Убедитесь, что рецепт с занятой ссылкой не сохраняется.'
+        )
+
+    def test_redirect_cached(
+            self, api_client: APIClient, first_recipe: Model,
+            django_assert_num_queries
+    ):
+        """Проверяет, что повторный переход не обращается к БД."""
+        url = URL_SHORT_LINK.format(uuid=first_recipe.short_link)
+        api_client.get(url)
+        with django_assert_num_queries(0):
+            self.url_redirects_with_found_status(
+                client=api_client,
+                url=url,
+                expected_redirect_url=URL_GET_FRONT_RECIPE.format(
+                    id=first_recipe.id
+                )
+            )
+
+    @pytest.mark.parametrize('short_link', ['zzzzzz', 'zzzzzzz', 'a-b'])
+    def test_redirect_unknown_cached(
+            self, api_client: APIClient, short_link: str,
+            django_assert_max_num_queries
+    ):
+        """Проверяет кеширование неизвестных ссылок."""
+        url = URL_SHORT_LINK.format(uuid=short_link)
+        assert api_client.get(url).status_code == 404, (
+            'Убедитесь, что для неизвестной ссылки возвращается статус 404.'
+        )
+        with django_assert_max_num_queries(0):
+            assert api_client.get(url).status_code == 404, (
+                'Убедитесь, что неизвестная ссылка кешируется.'
+            )
+
+    def test_signed_redirect_without_queries(
+            self, api_client: APIClient, first_recipe: Model,
+            django_assert_num_queries
+    ):
+        """Проверяет переход по подписанной ссылке без запросов к БД."""
+        short_link = api_client.get(
+            URL_GET_SHORT_LINK.format(id=first_recipe.id)
+        ).json()['short-link']
+        with django_assert_num_queries(0):
+            self.url_redirects_with_found_status(
+                client=api_client,
+                url=URL_SHORT_LINK.format(uuid=short_link.rsplit('/', 1)[1]),
+                expected_redirect_url=URL_GET_FRONT_RECIPE.format(
+                    id=first_recipe.id
+                )
+            )
+
+    def test_signed_redirect_key_fallback(
+            self, api_client: APIClient, settings: SettingsWrapper
+    ):
+        """Проверяет ссылки, подписанные прежним ключом."""
+        short_link = sign_short_link(42)
+        settings.SECRET_KEY_FALLBACKS = [settings.SECRET_KEY]
+        settings.SECRET_KEY = 'new-secret-key'
+        self.url_redirects_with_found_status(
+            client=api_client,
+            url=URL_SHORT_LINK.format(uuid=short_link),
+            expected_redirect_url=URL_GET_FRONT_RECIPE.format(id=42)
+        )
+
+    @pytest.mark.parametrize(
+        'short_link',
+        [
+            encode_base62(42) + get_short_link_signature(43),
+            '0' + sign_short_link(42),
+            'zzzzzzzzzzzzzzzzzzzzzzzz',
+        ],
+        ids=['signature', 'leading-zero', 'too-long']
+    )
+    def test_signed_redirect_tampered(
+            self, api_client: APIClient, short_link: str,
+            django_assert_num_queries
+    ):
+        """Проверяет ответ 404 на поддельную подписанную ссылку."""
+        with django_assert_num_queries(0):
+            assert api_client.get(
+                URL_SHORT_LINK.format(uuid=short_link)
+            ).status_code == 404, (
+                'Убедитесь, что ссылка с неверной подписью не принимается.'
+            )
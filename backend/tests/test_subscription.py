@@ -1,4 +1,7 @@
+from http import HTTPStatus
+
 import pytest
+from django.db import IntegrityError
 from django.db.models import Model
 from pytest_lazyfixture import lazy_fixture
 from rest_framework.response import Response
@@ -8,9 +11,11 @@ from recipes.models.recipe import Recipe
 from tests.base_test import BaseTest
 from tests.utils.general import NOT_EXISTING_ID
 from tests.utils.models import subscription_model
+from tests.utils.recipe import URL_GET_RECIPE
 from tests.utils.subscription import (
     RESPONSE_SCHEMA_SUBSCRIPTION,
     RESPONSE_SCHEMA_SUBSCRIPTIONS,
+    RESPONSE_SCHEMA_SUBSCRIPTIONS_CURSOR,
     URL_CREATE_SUBSCRIBE,
     URL_GET_SUBSCRIPTIONS
 )
@@ -77,6 +82,20 @@ class TestSubscription(BaseTest):
             response_schema=RESPONSE_SCHEMA_SUBSCRIPTION
         )
 
+    @pytest.mark.usefixtures('third_user_subscribed_to_second', 'all_recipes')
+    def test_get_subscription_list_sparse_fields(
+            self, third_user_authorized_client: APIClient
+    ):
+        """Проверяет исключение полей из списка подписок."""
+        self.url_sparse_fields(
+            client=third_user_authorized_client,
+            url=URL_GET_SUBSCRIPTIONS + '?omit=recipes,recipes_count',
+            expected_fields={
+                'email', 'id', 'username', 'first_name', 'last_name',
+                'is_subscribed', 'avatar'
+            }
+        )
+
     @pytest.mark.parametrize('recipes_limit', [1, 5, 10])
     @pytest.mark.usefixtures('all_recipes')
     def test_add_subscribe_authorized_with_recipes_limit_param(
@@ -145,6 +164,43 @@ class TestSubscription(BaseTest):
         )
         self.url_pagination_results(data=response.json(), limit=limit)
 
+    @pytest.mark.usefixtures('all_recipes')
+    def test_get_subscription_list_cursor_paginated(
+            self, third_user_authorized_client: APIClient,
+            third_user_subscriptions: list
+    ):
+        """Проверяет курсорную пагинацию списка подписок."""
+        ids = self.url_cursor_pagination_results(
+            client=third_user_authorized_client,
+            url=URL_GET_SUBSCRIPTIONS,
+            limit=1,
+            response_schema=RESPONSE_SCHEMA_SUBSCRIPTIONS_CURSOR
+        )
+        expected_ids = {
+            subscription.author_recipe_id
+            for subscription in third_user_subscriptions
+        }
+        assert len(ids) == len(expected_ids) and set(ids) == expected_ids, (
+            'Убедитесь, что курсор выдает все подписки пользователя.'
+        )
+
+    @pytest.mark.usefixtures('third_user_subscriptions', 'all_recipes')
+    def test_get_subscription_list_is_subscribed(
+            self, third_user_authorized_client: APIClient
+    ):
+        """Проверяет флаг подписки у авторов в списке подписок."""
+        response: Response = third_user_authorized_client.get(
+            URL_GET_SUBSCRIPTIONS
+        )
+        self.url_get_resource(
+            response=response,
+            url=URL_GET_SUBSCRIPTIONS,
+            response_schema=RESPONSE_SCHEMA_SUBSCRIPTIONS
+        )
+        assert all(
+            author['is_subscribed'] for author in response.json()['results']
+        ), 'Убедитесь, что у авторов из подписок `is_subscribed` равен true.'
+
     @pytest.mark.parametrize('recipes_limit', [1, 5, 10])
     @pytest.mark.usefixtures('third_user_subscribed_to_second', 'all_recipes')
     def test_get_subscription_list_with_recipes_limit_param(
@@ -213,4 +269,149 @@ class TestSubscription(BaseTest):
             url=URL_CREATE_SUBSCRIBE.format(id=id_subscription),
             model=Subscription,
             item_id=id_subscription
-        )
\ No newline at end of file
+        )
+
+    @pytest.mark.usefixtures('all_recipes')
+    def test_subscribe_updates_author_counters(
+            self, third_user_authorized_client: APIClient, second_user: Model
+    ):
+        """Проверяет счетчики подписчиков и рецептов автора."""
+        url = URL_CREATE_SUBSCRIBE.format(id=second_user.id)
+        self.url_maintains_counter(
+            client=third_user_authorized_client,
+            url=url,
+            obj=second_user,
+            field='followers_count'
+        )
+        response: Response = third_user_authorized_client.post(url)
+        assert response.json()['recipes_count'] == (
+            Recipe.objects.filter(author=second_user).count()
+        ), 'Убедитесь, что `recipes_count` равен числу рецептов автора.'
+
+    def test_self_subscription_constraint(self, third_user: Model):
+        """Проверяет запрет подписки на себя на уровне базы данных."""
+        with pytest.raises(IntegrityError):
+            Subscription.objects.add_one(
+                user=third_user, author_recipe=third_user
+            )
+
+    def test_add_self_subscription_response(
+            self, third_user_authorized_client: APIClient, third_user: Model
+    ):
+        """Проверяет ответ на попытку подписаться на самого себя."""
+        response: Response = third_user_authorized_client.post(
+            URL_CREATE_SUBSCRIBE.format(id=third_user.id)
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Убедитесь, что подписка на себя возвращает статус 400.'
+        )
+        assert response.json() == {
+            'errors': ['Невозможно подписаться на самого себя']
+        }, 'Убедитесь, что ответ на подписку на себя не изменился.'
+
+    @pytest.mark.usefixtures('third_user_subscribed_to_second')
+    def test_delete_subscription_queries(
+            self, third_user_authorized_client: APIClient, second_user: Model,
+            django_assert_max_num_queries
+    ):
+        """Проверяет, что отписка не читает подписку перед удалением."""
+        with django_assert_max_num_queries(8):
+            response: Response = third_user_authorized_client.delete(
+                URL_CREATE_SUBSCRIBE.format(id=second_user.id)
+            )
+        assert response.status_code == HTTPStatus.NO_CONTENT, (
+            'Убедитесь, что отписка возвращает статус 204.'
+        )
+
+    @pytest.mark.usefixtures('third_user_subscriptions', 'all_recipes')
+    def test_get_subscription_list_recipes_in_one_query(
+            self, third_user_authorized_client: APIClient,
+            django_assert_num_queries
+    ):
+        """Проверяет выборку рецептов всех авторов страницы одним запросом."""
+        url = URL_GET_SUBSCRIPTIONS + '?recipes_limit=2'
+        # Токен, число подписок, страница авторов, их рецепты
+        # и подписки зрителя
+        with django_assert_num_queries(5):
+            response: Response = third_user_authorized_client.get(url)
+        for author in response.json()['results']:
+            expected = list(Recipe.objects.filter(
+                author_id=author['id']
+            ).order_by('-id').values_list('id', flat=True)[:2])
+            assert [
+                recipe['id'] for recipe in author['recipes']
+            ] == expected, (
+                'Убедитесь, что у автора отдаются его последние рецепты.'
+            )
+
+        # Рецепты авторов берутся из кеша для любого recipes_limit
+        with django_assert_num_queries(4):
+            response = third_user_authorized_client.get(
+                URL_GET_SUBSCRIPTIONS + '?recipes_limit=3'
+            )
+        assert all(
+            len(author['recipes']) <= 3
+            for author in response.json()['results']
+        ), 'Убедитесь, что кеш рецептов ограничивается `recipes_limit`.'
+
+    @pytest.mark.usefixtures('third_user_subscribed_to_second', 'all_recipes')
+    def test_get_subscription_list_recipes_cache_invalidation(
+            self, third_user_authorized_client: APIClient,
+            second_user_authorized_client: APIClient, second_user: Model
+    ):
+        """Проверяет сброс кеша рецептов автора при их изменении."""
+        def get_recipe_ids() -> list:
+            response: Response = third_user_authorized_client.get(
+                URL_GET_SUBSCRIPTIONS
+            )
+            return [
+                recipe['id']
+                for recipe in response.json()['results'][0]['recipes']
+            ]
+
+        def get_expected() -> list:
+            return list(Recipe.objects.filter(
+                author=second_user
+            ).order_by('-id').values_list('id', flat=True))
+
+        assert get_recipe_ids() == get_expected(), (
+            'Убедитесь, что у автора отдаются его последние рецепты.'
+        )
+        latest = Recipe.objects.filter(author=second_user).latest('id')
+        assert second_user_authorized_client.delete(
+            URL_GET_RECIPE.format(id=latest.id)
+        ).status_code == HTTPStatus.NO_CONTENT, (
+            'Убедитесь, что автор может удалить рецепт.'
+        )
+        assert get_recipe_ids() == get_expected(), (
+            'Убедитесь, что удаление рецепта сбрасывает кеш автора.'
+        )
+        Recipe.objects.filter(
+            pk=Recipe.objects.filter(author=second_user).latest('id').pk
+        ).delete()
+        assert get_recipe_ids() == get_expected(), (
+            'Убедитесь, что удаление рецептов QuerySet сбрасывает кеш автора.'
+        )
+
+        recipe = Recipe.objects.filter(author=second_user).latest('id')
+        recipe.name = 'Новое название'
+        recipe.save()
+        response: Response = third_user_authorized_client.get(
+            URL_GET_SUBSCRIPTIONS
+        )
+        assert response.json()['results'][0]['recipes'][0]['name'] == (
+            'Новое название'
+        ), 'Убедитесь, что изменение рецепта сбрасывает кеш автора.'
+
+    @pytest.mark.parametrize('recipes_limit', ['abc', '0', '-1', '1000'])
+    @pytest.mark.usefixtures('third_user_subscribed_to_second')
+    def test_get_subscription_list_invalid_recipes_limit(
+            self, third_user_authorized_client: APIClient, recipes_limit: str
+    ):
+        """Проверяет ответ 400 на неверный параметр recipes_limit."""
+        response: Response = third_user_authorized_client.get(
+            URL_GET_SUBSCRIPTIONS + '?recipes_limit=' + recipes_limit
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Убедитесь, что неверный `recipes_limit` отклоняется.'
+        )
@@ -0,0 +1,60 @@
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Model
+
+from tests.utils.models import recipe_model
+
+# Получаем модель рецепта из фабрики
+Recipe = recipe_model()
+
+
+@pytest.mark.django_db(transaction=True)
+class TestSyncCounters:
+    """Тесты команды проверки и исправления счетчиков."""
+
+    @pytest.mark.usefixtures('all_favorite', 'third_user_subscribed_to_second')
+    def test_sync_counters(self, second_user: Model, all_recipes: list):
+        """Проверяет поиск и исправление расхождений в счетчиках."""
+        call_command('sync_counters')
+        call_command('sync_counters', check=True)
+
+        Recipe.objects.update(favorites_count=0)
+        type(second_user).objects.filter(pk=second_user.pk).update(
+            recipes_count=0, followers_count=0
+        )
+        with pytest.raises(CommandError):
+            call_command('sync_counters', check=True)
+
+        call_command('sync_counters')
+        call_command('sync_counters', check=True)
+        second_user.refresh_from_db()
+        assert second_user.recipes_count == len(all_recipes) - 1, (
+            'Убедитесь, что команда исправляет счетчик рецептов автора.'
+        )
+        assert second_user.followers_count == 1, (
+            'Убедитесь, что команда исправляет счетчик подписчиков.'
+        )
+        assert all(
+            recipe.favorites_count == 1 for recipe in Recipe.objects.all()
+        ), 'Убедитесь, что команда исправляет счетчик избранного.'
+
+    @pytest.mark.usefixtures(
+        'all_favorite', 'all_shopping_cart', 'third_user_subscriptions'
+    )
+    def test_counters_follow_queryset_delete(
+            self, second_user: Model, third_user: Model
+    ):
+        """Проверяет счетчики после удаления рецептов и пользователей."""
+        call_command('sync_counters')
+        Recipe.objects.filter(
+            pk=Recipe.objects.filter(author=second_user).latest('id').pk
+        ).delete()
+        type(third_user).objects.filter(pk=third_user.pk).delete()
+        try:
+            call_command('sync_counters', check=True)
+        except CommandError as error:
+            pytest.fail(
+                'Убедитесь, что массовое удаление рецептов и пользователей '
+                f'поддерживает счетчики: {error}'
+            )
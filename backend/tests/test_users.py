@@ -22,6 +22,7 @@ from tests.utils.user import (
     RESPONSE_SCHEMA_AVATAR,
     RESPONSE_SCHEMA_USER,
     RESPONSE_SCHEMA_USERS,
+    RESPONSE_SCHEMA_USERS_CURSOR,
     URL_AVATAR,
     URL_CREATE_USER,
     URL_GET_USER,
@@ -113,6 +114,40 @@ class TestUsers(BaseTest):
             response_schema=RESPONSE_SCHEMA_USER
         )
 
+    @pytest.mark.usefixtures('all_user')
+    def test_get_users_sparse_fields(
+            self, third_user_authorized_client: APIClient, first_user: Model
+    ):
+        """Проверяет выбор полей пользователей параметрами fields и omit."""
+        self.url_sparse_fields(
+            client=third_user_authorized_client,
+            url=URL_CREATE_USER + '?fields=id,username',
+            expected_fields={'id', 'username'}
+        )
+        self.url_sparse_fields(
+            client=third_user_authorized_client,
+            url=URL_GET_USER.format(id=first_user.id) + '?omit=email,avatar',
+            expected_fields={
+                'id', 'username', 'first_name', 'last_name', 'is_subscribed'
+            }
+        )
+
+    @pytest.mark.usefixtures('all_user')
+    def test_get_users_cursor_paginated(self, api_client: APIClient):
+        """Проверяет курсорную пагинацию списка пользователей."""
+        ids = self.url_cursor_pagination_results(
+            client=api_client,
+            url=URL_CREATE_USER,
+            limit=2,
+            response_schema=RESPONSE_SCHEMA_USERS_CURSOR
+        )
+        expected_ids = list(
+            User.objects.order_by('id').values_list('id', flat=True)
+        )
+        assert ids == expected_ids, (
+            'Убедитесь, что курсор выдает всех пользователей.'
+        )
+
     @pytest.mark.parametrize('limit', [1, 999999])
     @pytest.mark.usefixtures('all_user')
     def test_get_users_paginated(
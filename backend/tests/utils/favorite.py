@@ -1,4 +1,5 @@
-from tests.utils.recipe import URL_GET_RECIPE
+from tests.utils.recipe import URL_GET_RECIPE, URL_RECIPES
 
 # Адреса страниц
 URL_FAVORITE = URL_GET_RECIPE + 'favorite/'
+URL_FAVORITE_BULK = URL_RECIPES + 'favorite/bulk/'
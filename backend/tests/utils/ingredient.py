@@ -14,6 +14,12 @@ INGREDIENT_DATA = [
 INGREDIENT_SEARCH_DATA = [
     'а', 'б', 'аб', 'ба'
 ]
+INGREDIENT_FUZZY_DATA = [
+    {'name': 'помидоры', 'measurement_unit': 'г'},
+    {'name': 'помидоры черри', 'measurement_unit': 'г'},
+    {'name': 'помидор', 'measurement_unit': 'шт'},
+    {'name': 'томатная паста', 'measurement_unit': 'г'}
+]
 
 
 DENY_CHANGE_METHOD = installation_method_urls(
@@ -212,4 +212,18 @@ RECIPE_LIST_SCHEMA = {
             'items': RECIPE_DETAIL_SCHEMA
         }
     }
-}
\ No newline at end of file
+}
+
+RECIPE_CURSOR_LIST_SCHEMA = {
+    'type': 'object',
+    'required': ['next', 'previous', 'results'],
+    'additionalProperties': False,
+    'properties': {
+        'next': {'type': ['string', 'null']},
+        'previous': {'type': ['string', 'null']},
+        'results': {
+            'type': 'array',
+            'items': RECIPE_DETAIL_SCHEMA
+        }
+    }
+}
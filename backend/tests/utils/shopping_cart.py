@@ -3,6 +3,7 @@ from tests.utils.recipe import URL_GET_RECIPE, URL_RECIPES
 # Адреса страниц
 URL_SHOPPING_CART = URL_GET_RECIPE + 'shopping_cart/'
 URL_DOWNLOAD_SHOPPING_CART = URL_RECIPES + 'download_shopping_cart/'
+URL_SHOPPING_CART_BULK = URL_RECIPES + 'shopping_cart/bulk/'
 
 # Информация для валидации
 ALLOWED_CONTENT_TYPES = (
@@ -43,3 +43,17 @@ RESPONSE_SCHEMA_SUBSCRIPTIONS = {
     'required': ['count', 'next', 'previous', 'results'],
     'additionalProperties': False
 }
+
+RESPONSE_SCHEMA_SUBSCRIPTIONS_CURSOR = {
+    'type': 'object',
+    'properties': {
+        'next': {'type': ['string', 'null']},
+        'previous': {'type': ['string', 'null']},
+        'results': {
+            'type': 'array',
+            'items': RESPONSE_SCHEMA_SUBSCRIPTION
+        }
+    },
+    'required': ['next', 'previous', 'results'],
+    'additionalProperties': False
+}
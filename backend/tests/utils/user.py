@@ -218,3 +218,14 @@ RESPONSE_SCHEMA_USERS = {
     'required': ['count', 'next', 'previous', 'results'],
     'additionalProperties': False
 }
+
+RESPONSE_SCHEMA_USERS_CURSOR = {
+    'type': 'object',
+    'properties': {
+        'next': RESPONSE_SCHEMA_USERS['properties']['next'],
+        'previous': RESPONSE_SCHEMA_USERS['properties']['previous'],
+        'results': RESPONSE_SCHEMA_USERS['properties']['results']
+    },
+    'required': ['next', 'previous', 'results'],
+    'additionalProperties': False
+}
@@ -78,14 +78,16 @@ class UserAdmin(admin.ModelAdmin):
 
     form = UserAdminForm  # Используем кастомную форму
     list_display = (
-        'username', 'email', 'get_full_name', 'last_login',
-        'is_active', 'is_staff'
+        'username', 'email', 'get_full_name', 'recipes_count',
+        'followers_count', 'last_login', 'is_active', 'is_staff'
     )
     search_fields = ('username', 'email')  # Поля для поиска
     list_filter = ('is_active', 'is_staff')  # Фильтры в списке
     ordering = ('id',)  # Сортировка по умолчанию
 
-    readonly_fields = ('date_joined', 'last_login')  # Только для чтения
+    readonly_fields = (
+        'date_joined', 'last_login', 'recipes_count', 'followers_count'
+    )  # Только для чтения
     exclude = ('groups', 'user_permissions')  # Исключенные поля
 
     def set_fieldsets(
@@ -134,7 +136,8 @@ class UserAdmin(admin.ModelAdmin):
         """Настройка формы редактирования существующего пользователя."""
         self.set_fieldsets(
             enabled_password=False,  # Отключаем поле пароля
-            fields=['last_login']  # Добавляем поле последнего входа
+            # Добавляем поле последнего входа и счетчики
+            fields=['last_login', 'recipes_count', 'followers_count']
         )
         self.inlines = [RecipeFavoriteInline, ShoppingCartInline]  # Добавляем inline-формы
         return super(UserAdmin, self).change_view(request, object_id)
\ No newline at end of file
@@ -1,7 +1,15 @@
 from django.apps import AppConfig
+from django.db.models.signals import pre_delete
 
 
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'users'
     verbose_name = 'Пользователи и подписчики'
+
+    def ready(self) -> None:
+        from users.signals import delete_subscriptions
+
+        pre_delete.connect(
+            delete_subscriptions, sender=self.get_model('User')
+        )
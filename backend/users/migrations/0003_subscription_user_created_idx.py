@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-17 06:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_alter_user_subscribers'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='subscribers',
+            field=models.ManyToManyField(related_name='subscribers', through='users.Subscription', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='subscription',
+            index=models.Index(fields=['user', '-created_at'], name='subscription_user_created_idx'),
+        ),
+    ]
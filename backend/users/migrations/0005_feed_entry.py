@@ -0,0 +1,50 @@
+# Generated by Django 5.2.1 on 2026-10-17 07:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fill_feed(apps, schema_editor):
+    """Заполняет ленты рецептами авторов из существующих подписок."""
+    feed_entry = apps.get_model('users', 'FeedEntry')
+    feed_entry.objects.bulk_create(
+        [
+            feed_entry(user_id=user_id, recipe_id=recipe_id)
+            for user_id, recipe_id in apps.get_model(
+                'users', 'Subscription'
+            ).objects.filter(
+                author_recipe__followers_count__lt=settings.FEED_FANOUT_LIMIT,
+                author_recipe__recipes__isnull=False
+            ).values_list('user_id', 'author_recipe__recipes__id')
+        ],
+        ignore_conflicts=True
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0008_recipe_ingredients_lookup_idx'),
+        ('users', '0004_user_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('recipe', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='recipes.recipe', verbose_name='Рецепт')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL, verbose_name='Подписчик')),
+            ],
+            options={
+                'verbose_name': 'запись ленты',
+                'verbose_name_plural': 'Ленты подписок',
+                'db_table': 'auth_feed_entry',
+                'abstract': False,
+                'default_related_name': 'feed_entries',
+                'constraints': [models.UniqueConstraint(fields=('user', 'recipe'), name='unique_feed_entry_user_recipe')],
+            },
+        ),
+        migrations.RunPython(fill_feed, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.1 on 2026-10-17 08:40
+
+from django.db import migrations, models
+
+
+def delete_self_subscriptions(apps, schema_editor):
+    """Удаляет подписки на самого себя, уменьшая счетчики авторов."""
+    subscription = apps.get_model('users', 'Subscription')
+    self_subscriptions = subscription.objects.filter(
+        user=models.F('author_recipe')
+    )
+    apps.get_model('users', 'User').objects.filter(
+        pk__in=self_subscriptions.values('user_id'),
+        followers_count__gt=0
+    ).update(followers_count=models.F('followers_count') - 1)
+    self_subscriptions.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_feed_entry'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            delete_self_subscriptions, migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name='subscription',
+            constraint=models.CheckConstraint(condition=models.Q(('user', models.F('author_recipe')), _negated=True), name='prevent_self_subscription'),
+        ),
+    ]
@@ -1,7 +1,9 @@
+from users.models.feed_entry import FeedEntry
 from users.models.subscription import Subscription
 from users.models.user import User
 
 __all__ = [
+    'FeedEntry',
     'Subscription',
     'User'
 ]
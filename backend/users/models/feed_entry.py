@@ -0,0 +1,126 @@
+from typing import Iterable
+
+from django.conf import settings
+from django.db import models
+
+from users.models.abstract_models import AuthBaseModel
+from users.models.user import User
+
+
+class FeedEntryQuerySet(models.QuerySet):
+    """QuerySet записей ленты подписок.
+
+    Новый рецепт раскладывается по лентам подписчиков автора при
+    создании. Авторы, у которых подписчиков не меньше FEED_FANOUT_LIMIT,
+    в ленты не раскладываются: их рецепты подмешиваются при чтении.
+    """
+
+    def is_fan_out(self, author_id: int) -> bool:
+        """Раскладываются ли рецепты автора по лентам подписчиков."""
+        return User.objects.filter(
+            pk=author_id, followers_count__lt=settings.FEED_FANOUT_LIMIT
+        ).exists()
+
+    def add(self, user_ids: Iterable[int], recipe_ids: Iterable[int]) -> None:
+        """Добавляет рецепты в ленты пользователей, пропуская имеющиеся."""
+        recipe_ids = list(recipe_ids)
+        self.bulk_create(
+            [
+                self.model(user_id=user_id, recipe_id=recipe_id)
+                for user_id in user_ids for recipe_id in recipe_ids
+            ],
+            ignore_conflicts=True
+        )
+
+    def get_follower_ids(self, author_id: int) -> models.QuerySet:
+        """Id подписчиков автора."""
+        # Подписки пользователя доступны по related_name users
+        return User.objects.filter(
+            users__author_recipe_id=author_id
+        ).values_list('id', flat=True)
+
+    def get_author_recipe_ids(self, author_id: int) -> models.QuerySet:
+        """Id рецептов автора."""
+        recipe_model = self.model._meta.get_field('recipe').related_model
+        return recipe_model.objects.filter(
+            author_id=author_id
+        ).values_list('id', flat=True)
+
+    def get_feed(self, user: User) -> models.QuerySet:
+        """Id рецептов ленты пользователя в поле recipe_id, от новых к старым.
+
+        Обычно это один проход по индексу (user, recipe) записей ленты.
+        Рецепты авторов, не раскладываемых по лентам, подмешиваются из
+        таблицы рецептов по автору.
+        """
+        entries = self.filter(user=user).values('recipe_id')
+        merged_authors = user.users.filter(
+            author_recipe__followers_count__gte=settings.FEED_FANOUT_LIMIT
+        ).values('author_recipe_id')
+        if not merged_authors.exists():
+            return entries.order_by('-recipe_id')
+
+        recipe_model = self.model._meta.get_field('recipe').related_model
+        return recipe_model.objects.filter(
+            models.Q(id__in=entries) | models.Q(author_id__in=merged_authors)
+        ).values(recipe_id=models.F('id')).order_by('-recipe_id')
+
+    def fan_out(self, recipe: models.Model) -> None:
+        """Добавляет новый рецепт в ленты подписчиков его автора."""
+        if self.is_fan_out(recipe.author_id):
+            self.add(self.get_follower_ids(recipe.author_id), [recipe.pk])
+
+    def follow(self, user_id: int, author_id: int) -> None:
+        """Заполняет ленту подписчика рецептами нового автора."""
+        if self.is_fan_out(author_id):
+            self.add([user_id], self.get_author_recipe_ids(author_id))
+
+    def unfollow(self, user_id: int, author_id: int) -> None:
+        """Убирает из ленты подписчика рецепты автора."""
+        self.filter(user_id=user_id, recipe__author_id=author_id).delete()
+
+    def restore(self, author_id: int) -> None:
+        """Раскладывает все рецепты автора, ставшего снова обычным.
+
+        Вызывается, когда подписчиков стало меньше FEED_FANOUT_LIMIT:
+        рецепты, созданные, пока автор подмешивался при чтении, и
+        подписки того времени в лентах отсутствуют.
+        """
+        if User.objects.filter(
+            pk=author_id, followers_count=settings.FEED_FANOUT_LIMIT - 1
+        ).exists():
+            self.add(
+                self.get_follower_ids(author_id),
+                self.get_author_recipe_ids(author_id)
+            )
+
+
+class FeedEntry(AuthBaseModel):
+    """Модель записи ленты: рецепт автора, на которого подписан пользователь.
+
+    Лента пользователя читается одним проходом по индексу (user, recipe)
+    от новых рецептов к старым.
+    """
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, verbose_name='Подписчик'
+    )
+    recipe = models.ForeignKey(
+        'recipes.Recipe', on_delete=models.CASCADE, verbose_name='Рецепт'
+    )
+
+    objects = FeedEntryQuerySet.as_manager()
+
+    class Meta(AuthBaseModel.Meta):
+        constraints = [
+            models.UniqueConstraint(
+                fields=('user', 'recipe'),
+                name='unique_feed_entry_user_recipe'
+            )
+        ]
+        default_related_name = 'feed_entries'
+        verbose_name = 'запись ленты'
+        verbose_name_plural = 'Ленты подписок'
+
+    def __str__(self) -> str:
+        return f'Лента #{self.user_id}: рецепт #{self.recipe_id}'
@@ -1,9 +1,49 @@
-from django.db import models
+from collections import defaultdict
 
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Count, Exists, OuterRef
+
+from core.models import ToggleQuerySet, shift_counter
 from users.models.abstract_models import AuthBaseModel
+from users.models.feed_entry import FeedEntry
 from users.models.user import User
 
 
+class SubscriptionQuerySet(ToggleQuerySet):
+    """QuerySet подписок."""
+
+    def delete(self):
+        """Удаляет подписки, обновляя счетчики авторов и ленты подписчиков.
+
+        Вызывается при удалении пользователя и для массового удаления в
+        админке. Записи лент удаляются одним DELETE, счетчики уменьшаются
+        одним UPDATE на каждое встречающееся число удаляемых подписок
+        автора, затем восстанавливаются ленты авторов, ставших обычными.
+        """
+        with transaction.atomic(using=self.db):
+            author_ids = defaultdict(list)
+            for row in self.order_by().values('author_recipe_id').annotate(
+                count=Count('pk')
+            ):
+                author_ids[row['count']].append(row['author_recipe_id'])
+            FeedEntry.objects.filter(Exists(self.filter(
+                user_id=OuterRef('user_id'),
+                author_recipe_id=OuterRef('recipe__author_id')
+            ))).delete()
+            deleted = super().delete()
+            for count, ids in author_ids.items():
+                User.objects.filter(pk__in=ids).update(
+                    followers_count=shift_counter('followers_count', -count)
+                )
+            for author_id in User.objects.filter(
+                pk__in=[pk for ids in author_ids.values() for pk in ids],
+                followers_count=settings.FEED_FANOUT_LIMIT - 1
+            ).values_list('id', flat=True):
+                FeedEntry.objects.restore(author_id)
+        return deleted
+
+
 class Subscription(AuthBaseModel):
     """Модель подписчиков."""
 
@@ -20,16 +60,63 @@ class Subscription(AuthBaseModel):
         verbose_name='Дата подписки'
     )
 
+    objects = SubscriptionQuerySet.as_manager()
+
     class Meta(AuthBaseModel.Meta):
         constraints = [
             models.UniqueConstraint(
                 fields=('author_recipe', 'user'),
                 name='unique_author_recipe_user'
+            ),
+            models.CheckConstraint(
+                condition=~models.Q(user=models.F('author_recipe')),
+                name='prevent_self_subscription'
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=('user', '-created_at'),
+                name='subscription_user_created_idx'
             )
         ]
         verbose_name = 'подписку'
         verbose_name_plural = 'Подписки'
 
+    def update_author_counter(self, delta: int) -> None:
+        """Изменяет счетчик подписчиков автора на delta."""
+        User.objects.filter(pk=self.author_recipe_id).update(
+            followers_count=shift_counter('followers_count', delta)
+        )
+
+    def update_related(self, delta: int) -> None:
+        """Переносит подписку (1) или отписку (-1) в счетчик и ленту.
+
+        При отписке вызывается после удаления записи: рецепты автора,
+        снова раскладываемого по лентам, не должны попасть отписавшемуся.
+        """
+        if delta > 0:
+            FeedEntry.objects.follow(self.user_id, self.author_recipe_id)
+            self.update_author_counter(1)
+        else:
+            FeedEntry.objects.unfollow(self.user_id, self.author_recipe_id)
+            self.update_author_counter(-1)
+            FeedEntry.objects.restore(self.author_recipe_id)
+
+    def save(self, *args, **kwargs) -> None:
+        """Сохраняет подписку, обновляя счетчик автора и ленту подписчика."""
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding:
+                self.update_related(1)
+
+    def delete(self, *args, **kwargs):
+        """Удаляет подписку, обновляя счетчик автора и ленту подписчика."""
+        with transaction.atomic():
+            deleted = super().delete(*args, **kwargs)
+            self.update_related(-1)
+            return deleted
+
     def __str__(self):
         return (
             f'{self.user.__str__()} подписан на {self.author_recipe.__str__()}'
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Iterable, List, Optional
 
 from django.contrib.auth.base_user import BaseUserManager
 from django.contrib.auth.models import AbstractUser
@@ -14,6 +14,7 @@ from core.constants import (
     USER_EMAIL_ERROR,
     USER_USERNAME_ERROR
 )
+from core.models import CounterFieldsMixin
 from users.models.abstract_models import AuthBaseModel
 
 
@@ -90,7 +91,7 @@ class UserManager(BaseUserManager):
         )
 
 
-class User(AuthBaseModel, AbstractUser):
+class User(CounterFieldsMixin, AuthBaseModel, AbstractUser):
     """Основная модель пользователя системы.
 
     Наследует:
@@ -168,18 +169,61 @@ class User(AuthBaseModel, AbstractUser):
         blank=True,
         null=True
     )
+    recipes_count = models.PositiveIntegerField(
+        verbose_name='Рецептов', default=0, editable=False
+    )
+    followers_count = models.PositiveIntegerField(
+        verbose_name='Подписчиков', default=0, editable=False
+    )
     subscribers = models.ManyToManyField(
         'self', through='Subscription', related_name='subscribers'
     )
 
     objects = UserManager()
 
+    counter_fields = ('recipes_count', 'followers_count')
+
+    # Поля, которые отображаются в карточках рецептов автора
+    RECIPE_AUTHOR_FIELDS = frozenset(
+        ('email', 'username', 'first_name', 'last_name', 'avatar')
+    )
+
     class Meta(AuthBaseModel.Meta):
         """Мета-настройки модели пользователя."""
         verbose_name = 'пользователя'
         verbose_name_plural = 'Пользователи'
         ordering = ['date_joined']
 
+    def save(self, *args, **kwargs) -> None:
+        """Сохраняет пользователя и сбрасывает кеш карточек его рецептов.
+
+        Кеш сбрасывается, только если изменилось поле, которое
+        отображается в карточках: значения сравниваются с сохраненными.
+        """
+        changed = self.get_changed_author_fields(kwargs.get('update_fields'))
+        super().save(*args, **kwargs)
+        if changed:
+            self.recipes.touch()
+
+    def get_changed_author_fields(
+            self, update_fields: Optional[Iterable[str]] = None
+    ) -> List[str]:
+        """Поля карточек рецептов, значения которых отличаются от БД."""
+        fields = self.RECIPE_AUTHOR_FIELDS
+        if update_fields is not None:
+            fields = fields.intersection(update_fields)
+        if self._state.adding or not fields:
+            return []
+        stored = type(self).objects.filter(pk=self.pk).values(*fields).first()
+        if stored is None:
+            return []
+        return [
+            name for name in fields
+            if self._meta.get_field(name).get_prep_value(
+                getattr(self, name)
+            ) != stored[name]
+        ]
+
     def get_full_name(self) -> str:
         """Возвращает полное имя пользователя (имя + фамилия)."""
         full_name = '%s %s' % (self.first_name, self.last_name)
@@ -0,0 +1,13 @@
+from django.db.models import Model
+
+from users.models import Subscription
+
+
+def delete_subscriptions(sender: type, instance: Model, **kwargs) -> None:
+    """Удаляет подписки удаляемого пользователя на авторов.
+
+    QuerySet.delete уменьшает счетчики подписчиков авторов, которые при
+    каскадном удалении не меняются. Подписки на самого пользователя
+    удаляются каскадом: его счетчик удаляется вместе с ним.
+    """
+    Subscription.objects.filter(user=instance).delete()
@@ -1,5 +1,6 @@
 pytest_plugins = [
     'django',
+    'tests.fixtures.fixture_cache',
     'tests.fixtures.fixture_favorite',
     'tests.fixtures.fixture_ingredient',
     'tests.fixtures.fixture_recipe',